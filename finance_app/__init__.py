@@ -1,5 +1,22 @@
 # Importing classes and modules
-from .utils import center_window, filter_func, is_date, is_number
+from .utils import (
+    center_window,
+    filter_func,
+    is_date,
+    is_number,
+    is_amount,
+    new_operation_id,
+    parse_amount,
+    parse_date,
+    format_amount,
+    format_date,
+    parse_operation,
+    operations_to_frame,
+    format_operation,
+    format_operations,
+    recurrence_dates,
+    book_occurrence,
+)
 from .modules.sign_in import SignInWindow
 from .modules.status_windows import ChooseBox, ErrorBox
 from .modules.main_section import MainSection
@@ -9,9 +26,24 @@ from .modules.upcoming_section import UpcomingSection
 from .modules.analysis_section import AnalysisSection
 from .modules.account_settings import AccountSettings
 from .widgets.table_widget import TableWidget
+from .widgets.table_model import TableModel
+from .widgets.table_proxy_model import TableProxyModel
+from .widgets.column_index import ColumnIndex
+from .widgets.filter_list_model import FilterListModel
+from .widgets.search_worker import SearchWorker
 from .widgets.checkbox_widget import CheckBoxWidget
+from .widgets.line_plot_widget import LineChart
 from .modules.add_windows import AddTransaction
 from .modules.app_settings import AppSettings
+from .modules.transaction_journal import TransactionJournal
+from .modules.sqlite_storage import SqliteStorage
+from .modules.transaction_store import TransactionStore
+from .modules.balance_index import BalanceIndex
+from .modules.monthly_summary import MonthlySummary
+from .modules.analysis_cache import AnalysisCache
+from .modules.analysis_worker import AnalysisWorker
+from .modules.spending_forecast import SpendingForecast
+from .modules.recurring_detector import RecurringDetector
 
 
 __all__ = [
@@ -26,10 +58,37 @@ __all__ = [
     "ChooseBox",
     "ErrorBox",
     "TableWidget",
+    "TableModel",
+    "TableProxyModel",
+    "ColumnIndex",
+    "FilterListModel",
+    "SearchWorker",
     "CheckBoxWidget",
+    "LineChart",
     "AddTransaction",
+    "TransactionJournal",
+    "SqliteStorage",
+    "TransactionStore",
+    "BalanceIndex",
+    "MonthlySummary",
+    "AnalysisCache",
+    "AnalysisWorker",
+    "SpendingForecast",
+    "RecurringDetector",
     "center_window",
     "filter_func",
     "is_date",
     "is_number",
+    "is_amount",
+    "new_operation_id",
+    "parse_amount",
+    "parse_date",
+    "format_amount",
+    "format_date",
+    "parse_operation",
+    "operations_to_frame",
+    "format_operation",
+    "format_operations",
+    "recurrence_dates",
+    "book_occurrence",
 ]
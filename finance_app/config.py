@@ -9,6 +9,9 @@ AUTHOR = "Maciej Stasiłowicz"
 WINDOW_WIDTH = 900
 WINDOW_HEIGHT = 600
 
+# Milliseconds after last typed character before table search is started
+SEARCH_DELAY = 250
+
 import os
 
 # Paths to data directories
@@ -23,6 +26,16 @@ USER_CATEGORIES = "categories.json"
 USER_TRANSACTIONS = "transactions.json"
 USER_UPCOMING_OPER = "upcomings.json"
 
+# User database file name (SQLite storage)
+USER_DATABASE = "finanlist.db"
+
+# Available storage backends
+STORAGE_BACKENDS = ["JSON", "SQLite"]
+
+# User data journal settings
+JOURNAL_EXT = ".journal"
+JOURNAL_COMPACT_SIZE = 1024 * 1024  # Journal size in bytes after which it is compacted
+
 # Paths to images
 LOGO_PATH = os.path.join(IMAGES_DIR, "app_logo.png")
 ADD_ICON = os.path.join(IMAGES_DIR, "plus_circle.png")
@@ -233,6 +246,17 @@ PLANNED_OPERATIONS_HEADERS = [
     "Amount",
 ]
 
+# Upcoming operations headers
+UPCOMING_OPERATIONS_HEADERS = PLANNED_OPERATIONS_HEADERS + ["Repeats"]
+
+# Operation fields shown in tables
+OPERATION_FIELDS = ["1_name", "2_date", "3_vendor", "4_type", "5_category", "6_amount"]
+PLANNED_OPERATIONS_FIELDS = ["1_name", "2_date", "5_category", "6_amount"]
+UPCOMING_OPERATIONS_FIELDS = PLANNED_OPERATIONS_FIELDS + ["7_recurrence"]
+
+# Units of upcoming operations recurrence rule ("7_recurrence")
+RECURRENCE_UNITS = ["days", "weeks", "months"]
+
 
 CATEGORIES_HEADERS = [
     "Main category",
@@ -243,12 +267,49 @@ CATEGORIES_HEADERS = [
 
 TRANSACTION_TYPES = ["Expense", "Income", "Upcoming"]
 
-ANALYSIS_TYPES = ["Categorical", "Aggregate", "Prognosis"]
+ANALYSIS_TYPES = ["Categorical", "Aggregate", "Prognosis", "Balance"]
+
+# Category of categorical analysis with sums of all main categories
+ALL_CATEGORIES = "All categories"
+
+# Periods of prognosis table
+PROGNOSIS_GRANULARITIES = ["Monthly", "Daily"]
+
+# Prognosis spendings: average spendings, seasonal forecast of spendings
+# or spendings drawn from history of spendings
+PROGNOSIS_MODELS = ["Average", "Forecast", "Monte Carlo"]
+
+# Number of simulated paths in Monte Carlo prognosis
+PROGNOSIS_PATHS = 10000
+
+# Colors of Monte Carlo prognosis percentiles
+PROGNOSIS_COLORS = {"P10": "#b3dbff", "P50": "#0085FC", "P90": "#66b8ff"}
+
+# Number of analysis results kept in cache
+ANALYSIS_CACHE_SIZE = 32
+
+# Periods of recurring operations: period length and tolerance in days
+RECURRING_PERIODS = {"Weekly": (7, 1), "Monthly": (30.44, 3), "Yearly": (365.25, 5)}
+
+# Recurrence rules of recurring operations periods: every N units
+RECURRING_RULES = {"Weekly": (1, "weeks"), "Monthly": (1, "months"), "Yearly": (12, "months")}
+
+# Recurring operations table headers
+RECURRING_HEADERS = [
+    "Name",
+    "Next date",
+    "Vendor",
+    "Category",
+    "Amount",
+    "Period",
+    "Occurrences",
+]
 
 CHART_TOOLTIPS = {
     "Categorical": None,
     "Aggregate": None,
     "Prognosis": "The projected account balance is the balance\nafter you receive your salary\nand pay all expenses and projected payments.",
+    "Balance": "Account balance at the end of every day.\nDays after the latest transaction include\nonly planned operations.",
 }
 
 # Categorical analysis table headers
@@ -276,6 +337,14 @@ PROGNOSIS_HEADERS = [
     "Planned expenses",
 ]
 
+# Balance analysis table headers
+BALANCE_HEADERS = [
+    "Date",
+    "Income",
+    "Expenses",
+    "Account balance",
+]
+
 # Sample categories created on login
 SAMPLE_CATEGORIES = {
     "0": {
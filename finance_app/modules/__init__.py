@@ -2,11 +2,14 @@
 from finance_app.utils import filter_func
 from finance_app.widgets.table_widget import TableWidget
 from finance_app.widgets.bar_plot_widget import BarChart
+from finance_app.widgets.line_plot_widget import LineChart
 from finance_app.widgets.line_edit import LineEdit
 from finance_app.modules.analysis_calculation import Analysis
 from finance_app.modules.status_windows import ErrorBox
+from finance_app.modules.recurring_detector import RecurringDetector
 from finance_app.modules.add_windows import (
     AddCategory,
+    AddRecurring,
     AddTransaction,
     EditCategory,
     EditTransaction,
@@ -16,10 +19,13 @@ __all__ = [
     "filter_func",
     "TableWidget",
     "BarChart",
+    "LineChart",
     "LineEdit",
     "Analysis",
     "ErrorBox",
+    "RecurringDetector",
     "AddCategory",
+    "AddRecurring",
     "AddTransaction",
     "EditCategory",
     "EditTransaction",
@@ -346,6 +346,7 @@ class AccountSettings(QWidget):
                 "DEFAULT_VIEW": self.user_settings.get("DEFAULT_VIEW"),
                 "DEFAULT_ANALYSIS": self.user_settings.get("DEFAULT_ANALYSIS"),
                 "ANALYSIS_AUTO_RUN": self.user_settings.get("ANALYSIS_AUTO_RUN"),
+                "STORAGE_BACKEND": self.user_settings.get("STORAGE_BACKEND", "JSON"),
             }
 
             with open(self.user_settings_path, "w") as file:
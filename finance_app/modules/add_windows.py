@@ -1,10 +1,20 @@
 from PySide6.QtCore import *
 from PySide6.QtGui import *
 from PySide6.QtWidgets import *
+import pandas as pd
 from datetime import datetime
 
 from finance_app.config import *
-from finance_app.modules import LineEdit
+from finance_app.modules import LineEdit, TableWidget, ErrorBox
+from finance_app.modules.recurring_detector import RECURRING_COLUMNS
+from finance_app.utils import (
+    format_date,
+    format_operation,
+    is_amount,
+    is_date,
+    parse_amount,
+    parse_date,
+)
 
 
 class AddCategory(QWidget):
@@ -350,7 +360,7 @@ class AddTransaction(QWidget):
         self.setLayout(main_layout)
         self.setContentsMargins(15, 5, 15, 5)
         self.resize(QSize(550, 375))
-        self.setFixedSize(QSize(455, 425))
+        self.setFixedSize(QSize(455, 525))
         main_layout.setSpacing(10)
 
         # Title label
@@ -438,6 +448,36 @@ class AddTransaction(QWidget):
         self.tr_amount_edit = LineEdit(self, validator=True)
         self.tr_amount_edit.setContentsMargins(0, 0, 0, 10)
 
+        # Recurrence - label
+        self.tr_repeat_label = QLabel(self)
+        self.tr_repeat_label.setText("Repeat every")
+        self.tr_repeat_label.setStyleSheet("color: black; font-size: 12pt;")
+        self.tr_repeat_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+
+        # Recurrence - spinbox (0 - operation is not repeated) and unit combobox
+        repeat_layout = QHBoxLayout()
+        self.tr_repeat_edit = QSpinBox(self)
+        self.tr_repeat_edit.setRange(0, 999)
+        self.tr_repeat_edit.setSpecialValueText("Never")
+        self.tr_repeat_unit_edit = QComboBox(self)
+        self.tr_repeat_unit_edit.addItems(RECURRENCE_UNITS)
+        repeat_layout.addWidget(self.tr_repeat_edit, 0)
+        repeat_layout.addWidget(self.tr_repeat_unit_edit, 0)
+
+        # Recurrence end - label
+        self.tr_until_label = QLabel(self)
+        self.tr_until_label.setText("Repeat until")
+        self.tr_until_label.setStyleSheet("color: black; font-size: 12pt;")
+        self.tr_until_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+
+        # Recurrence end - lineedit (empty - no end date)
+        self.tr_until_edit = LineEdit(self)
+        self.tr_until_edit.setPlaceholderText("dd.mm.yyyy")
+
+        # Only upcoming operations are repeated
+        self.tr_type_edit.currentTextChanged.connect(self.on_type_change)
+        self.on_type_change()
+
         btn_layout = QHBoxLayout()
 
         # Add button
@@ -499,8 +539,14 @@ class AddTransaction(QWidget):
         main_layout.addWidget(self.tr_amount_label, 6, 0, Qt.AlignmentFlag.AlignLeft)
         main_layout.addWidget(self.tr_amount_edit, 6, 1)
 
-        main_layout.addLayout(btn_layout, 7, 0, 1, 2)
-        main_layout.addWidget(self.close_btn, 8, 0, Qt.AlignmentFlag.AlignLeft)
+        main_layout.addWidget(self.tr_repeat_label, 7, 0, Qt.AlignmentFlag.AlignLeft)
+        main_layout.addLayout(repeat_layout, 7, 1)
+
+        main_layout.addWidget(self.tr_until_label, 8, 0, Qt.AlignmentFlag.AlignLeft)
+        main_layout.addWidget(self.tr_until_edit, 8, 1)
+
+        main_layout.addLayout(btn_layout, 9, 0, 1, 2)
+        main_layout.addWidget(self.close_btn, 10, 0, Qt.AlignmentFlag.AlignLeft)
 
         main_layout.addItem(self.spacer)
 
@@ -526,19 +572,91 @@ class AddTransaction(QWidget):
         if current_date > datetime.now():
             self.tr_type_edit.setCurrentText("Upcoming")
 
+    def on_type_change(self):
+        """
+        Enable recurrence widgets only for upcoming operations.
+
+        Triggered on every type change.
+        """
+        enabled = self.tr_type_edit.currentText() == "Upcoming"
+
+        self.tr_repeat_edit.setEnabled(enabled)
+        self.tr_repeat_unit_edit.setEnabled(enabled)
+        self.tr_until_edit.setEnabled(enabled)
+
+    def is_recurrence_valid(self):
+        """
+        Check recurrence end date entered by the user (shows error box if it is not valid)
+
+        Returns:
+            bool: end date is empty or valid date
+        """
+        until = self.tr_until_edit.text().strip()
+        if until == "" or is_date(until, "%d.%m.%Y"):
+            return True
+
+        msg = "Repeat until date must be in format dd.mm.yyyy!"
+        ErrorBox(self, title="Wrong date!", msg=msg)
+
+        return False
+
+    def is_amount_valid(self):
+        """
+        Check amount entered by the user (shows error box if it is not valid)
+
+        Returns:
+            bool: amount is valid number
+        """
+        if is_amount(self.tr_amount_edit.text()):
+            return True
+
+        msg = "Amount must be a number!"
+        ErrorBox(self, title="Wrong amount!", msg=msg)
+
+        return False
+
+    def get_recurrence(self):
+        """
+        Get recurrence rule based on user choices
+
+        Returns:
+            dict: recurrence rule or None if operation is not repeated
+        """
+        if (
+            self.tr_type_edit.currentText() != "Upcoming"
+            or self.tr_repeat_edit.value() == 0
+        ):
+            return None
+
+        until = self.tr_until_edit.text().strip()
+
+        return {
+            "every": self.tr_repeat_edit.value(),
+            "unit": self.tr_repeat_unit_edit.currentText(),
+            "until": parse_date(until) if until != "" else None,
+        }
+
     def create_transaction(self):
         """
         Send transaction dict based on user choices to database
         """
+        if not self.is_amount_valid() or not self.is_recurrence_valid():
+            return
+
         transaction = {
             "1_name": self.tr_name_edit.text(),
-            "2_date": self.tr_date_edit.text(),
+            "2_date": parse_date(self.tr_date_edit.text()),
             "3_vendor": self.tr_vendor_edit.text(),
             "4_type": self.tr_type_edit.currentText(),
             "5_category": self.tr_category_edit.currentText(),
-            "6_amount": self.tr_amount_edit.text().replace(" ", ""),
+            "6_amount": parse_amount(self.tr_amount_edit.text()),
         }
 
+        # Recurring upcoming operation is stored once with its rule
+        recurrence = self.get_recurrence()
+        if not recurrence is None:
+            transaction["7_recurrence"] = recurrence
+
         self.send_transaction.emit(transaction, self.tr_type_edit.currentText())
 
         self.destroy()
@@ -554,18 +672,28 @@ class EditTransaction(AddTransaction):
     send_transaction = Signal(dict, str, str)
 
     def __init__(
-        self, number, name, date, seller, type, category, amount, user_categories=None
+        self,
+        operation_id,
+        name,
+        date,
+        seller,
+        type,
+        category,
+        amount,
+        user_categories=None,
+        recurrence=None,
     ):
         super().__init__(user_categories)
 
         # Transaction data
-        self.number = number
+        self.operation_id = operation_id
         self.name = name
         self.date = date
         self.seller = seller
         self.type = type
         self.category = category
         self.amount = amount
+        self.recurrence = recurrence
 
         # Variables
         self.active = False
@@ -581,7 +709,7 @@ class EditTransaction(AddTransaction):
         self.secondary_btn.clicked.connect(self.delete_transaction)
         self.close_btn.setVisible(True)
         self.close_btn.clicked.connect(self.close_event)
-        self.setFixedSize(QSize(455, 455))
+        self.setFixedSize(QSize(455, 555))
         if self.type == "Upcoming":
             self.tr_category_edit.currentIndexChanged.disconnect()
 
@@ -592,13 +720,18 @@ class EditTransaction(AddTransaction):
         Method used for filling widget with choosen operation
         """
         # Filling widgets
-        self.title_label.setText("Transaction #{0}".format(int(self.number) + 1))
+        self.title_label.setText("Transaction")
         self.tr_name_edit.setText(self.name)
         self.tr_date_edit.setDate(self.date_qdate)
         self.tr_vendor_edit.setText(self.seller)
         self.tr_type_edit.setCurrentText(self.type)
         self.tr_category_edit.setCurrentText(self.category)
         self.tr_amount_edit.setText(self.amount)
+        if not self.recurrence is None:
+            self.tr_repeat_edit.setValue(self.recurrence.get("every"))
+            self.tr_repeat_unit_edit.setCurrentText(self.recurrence.get("unit"))
+            if not self.recurrence.get("until") is None:
+                self.tr_until_edit.setText(format_date(self.recurrence.get("until")))
 
         # Disable widgets
         self.title_label.setEnabled(False)
@@ -608,6 +741,7 @@ class EditTransaction(AddTransaction):
         self.tr_type_edit.setEnabled(False)
         self.tr_category_edit.setEnabled(False)
         self.tr_amount_edit.setEnabled(False)
+        self.set_recurrence_enabled(False)
 
         # Setting button text
         self.primary_btn.setText("Edit")
@@ -626,6 +760,7 @@ class EditTransaction(AddTransaction):
             self.tr_type_edit.setEnabled(False)
             self.tr_category_edit.setEnabled(False)
             self.tr_amount_edit.setEnabled(False)
+            self.set_recurrence_enabled(False)
             self.primary_btn.setText("Edit")
 
             self.active = False
@@ -636,10 +771,48 @@ class EditTransaction(AddTransaction):
             self.tr_type_edit.setEnabled(True)
             self.tr_category_edit.setEnabled(True)
             self.tr_amount_edit.setEnabled(True)
+            self.on_type_change()
             self.primary_btn.setText("Save")
 
             self.active = True
 
+    def on_type_change(self):
+        """
+        Enable recurrence widgets only for upcoming operations in edit mode.
+
+        Triggered on every type change.
+        """
+        if getattr(self, "active", False):
+            super().on_type_change()
+        else:
+            self.set_recurrence_enabled(False)
+
+    def set_recurrence_enabled(self, enabled):
+        """
+        Enable or disable recurrence widgets
+
+        Args:
+            enabled (bool): widgets state
+        """
+        self.tr_repeat_edit.setEnabled(enabled)
+        self.tr_repeat_unit_edit.setEnabled(enabled)
+        self.tr_until_edit.setEnabled(enabled)
+
+    def get_recurrence(self):
+        """
+        Get recurrence rule based on user choices (booked occurrences stay booked)
+
+        Returns:
+            dict: recurrence rule or None if operation is not repeated
+        """
+        recurrence = super().get_recurrence()
+
+        if not recurrence is None and not self.recurrence is None:
+            if not self.recurrence.get("from") is None:
+                recurrence["from"] = self.recurrence.get("from")
+
+        return recurrence
+
     def delete_transaction(self):
         """
         Method used for deleting currently viewed transaction from databse
@@ -653,14 +826,19 @@ class EditTransaction(AddTransaction):
         )
 
         if confirmation == QMessageBox.StandardButton.Yes:
+            # Deleted operation is sent with its stored amount if entered one is not valid
+            amount = self.tr_amount_edit.text()
+            if not is_amount(amount):
+                amount = self.amount
+
             transaction = {
-                str(self.number): {
+                str(self.operation_id): {
                     "1_name": self.tr_name_edit.text(),
-                    "2_date": self.tr_date_edit.text(),
+                    "2_date": parse_date(self.tr_date_edit.text()),
                     "3_vendor": self.tr_vendor_edit.text(),
                     "4_type": self.tr_type_edit.currentText(),
                     "5_category": self.tr_category_edit.currentText(),
-                    "6_amount": self.tr_amount_edit.text().replace(" ", ""),
+                    "6_amount": parse_amount(amount),
                 }
             }
 
@@ -673,6 +851,10 @@ class EditTransaction(AddTransaction):
         """
         Sending transaction data to save if any widget was edited on close
         """
+        # Not valid amount or recurrence end keeps window open
+        if not self.is_amount_valid() or not self.is_recurrence_valid():
+            return
+
         send_signal = False
 
         if self.tr_name_edit.text() != self.name:
@@ -690,23 +872,156 @@ class EditTransaction(AddTransaction):
         if self.tr_category_edit.currentText() != self.category:
             send_signal = True
 
-        if self.tr_amount_edit.text().replace(" ", "") != self.amount:
+        if parse_amount(self.tr_amount_edit.text()) != parse_amount(self.amount):
+            send_signal = True
+
+        recurrence = self.get_recurrence()
+        if recurrence != self.recurrence:
             send_signal = True
 
         if send_signal and not self.active:
             transaction = {
-                str(self.number): {
+                str(self.operation_id): {
                     "1_name": self.tr_name_edit.text(),
-                    "2_date": self.tr_date_edit.text(),
+                    "2_date": parse_date(self.tr_date_edit.text()),
                     "3_vendor": self.tr_vendor_edit.text(),
                     "4_type": self.tr_type_edit.currentText(),
                     "5_category": self.tr_category_edit.currentText(),
-                    "6_amount": self.tr_amount_edit.text().replace(" ", ""),
+                    "6_amount": parse_amount(self.tr_amount_edit.text()),
                 }
             }
+            if not recurrence is None:
+                transaction[str(self.operation_id)]["7_recurrence"] = recurrence
 
             self.send_transaction.emit(
                 transaction, self.type, self.tr_type_edit.currentText()
             )
 
         self.destroy()
+
+
+class AddRecurring(QWidget):
+    """
+    AddRecurring creates new window with recurring operations found in transactions.
+    Selected operations are added as recurring upcoming operations starting on their next date.
+    """
+
+    # Signals
+    send_transaction = Signal(dict, str)
+
+    def __init__(self, recurring_operations):
+        """
+        Args:
+            recurring_operations (pandas.DataFrame): recurring operations (RecurringDetector result)
+        """
+        super().__init__()
+
+        self.recurring_operations = recurring_operations
+
+        self.init_window()
+
+    def init_window(self):
+        """
+        Initialize AddRecurring window
+        """
+        main_layout = QVBoxLayout()
+        self.setLayout(main_layout)
+        self.setContentsMargins(15, 5, 15, 5)
+        self.resize(QSize(900, 500))
+        main_layout.setSpacing(10)
+
+        # Title label
+        self.title_label = QLabel(self)
+        self.title_label.setText("Recurring operations")
+        self.title_label.setStyleSheet(
+            "color: black; font-size: 16pt; padding:5px; font-weight:bold;"
+        )
+        self.title_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+
+        # Table with recurring operations
+        data = pd.DataFrame(
+            [
+                format_operation(record, RECURRING_COLUMNS)
+                for record in self.recurring_operations.to_dict("records")
+            ],
+            index=self.recurring_operations.index,
+            columns=RECURRING_COLUMNS,
+        ).drop(columns="4_type")
+        data["Occurrences"] = data["Occurrences"].astype(str)
+        data.columns = RECURRING_HEADERS
+
+        self.recurring_table = TableWidget(
+            parent=self,
+            row_num=len(data.index),
+            col_num=len(RECURRING_HEADERS),
+            header_names=RECURRING_HEADERS,
+            font=QFont(
+                "Notosans",
+                10,
+            ),
+            data=data,
+            editable=False,
+            sorting=False,
+            filtering=False,
+            id_column=True,
+        )
+        self.recurring_table.show_column(0)
+
+        # Add button
+        btn_layout = QHBoxLayout()
+        btn_layout.setContentsMargins(0, 20, 0, 0)
+
+        self.primary_btn = QPushButton("Add selected")
+        self.primary_btn.setStyleSheet(
+            "QPushButton {background-color: #0085FC; border-style: solid; border-color: #0085FC; border-width: 2px; border-radius: 10px; font-size: 10pt; color:white;} "
+            + "QPushButton::pressed {background-color: #4dacff; border-style: solid; border-color: #4dacff; border-width: 2px; border-radius: 10px; font-size: 10pt; color:white;}"
+        )
+        self.primary_btn.setMinimumHeight(40)
+        self.primary_btn.setMinimumWidth(130)
+        self.primary_btn.clicked.connect(self.add_recurring)
+
+        # Cancel button
+        self.secondary_btn = QPushButton("Cancel")
+        self.secondary_btn.setStyleSheet(
+            "QPushButton {background-color: #ff0000; border-style: solid; border-color: #ff0000; border-width: 2px; border-radius: 10px; font-size: 10pt; color:white;} "
+            + "QPushButton::pressed {background-color: #ff8080; border-style: solid; border-color: #ff8080; border-width: 2px; border-radius: 10px; font-size: 10pt; color:white;}"
+        )
+        self.secondary_btn.setMinimumHeight(40)
+        self.secondary_btn.setMinimumWidth(130)
+        self.secondary_btn.clicked.connect(self.destroy)
+
+        btn_layout.addWidget(self.primary_btn, 0)
+        btn_layout.addWidget(self.secondary_btn, 0)
+
+        main_layout.addWidget(self.title_label, 0)
+        main_layout.addWidget(self.recurring_table, 0)
+        main_layout.addLayout(btn_layout, 0)
+
+    def add_recurring(self):
+        """
+        Send selected recurring operations as upcoming operations
+        """
+        selected_rows = self.recurring_table.get_selected_rows()
+
+        if len(selected_rows) == 0:
+            msg = "No operations where selected!\nSelect at least one operation!"
+            ErrorBox(self, title="Nothing to add!", msg=msg)
+            return
+
+        for row_id in selected_rows:
+            operation = self.recurring_operations.loc[str(row_id)]
+            every, unit = RECURRING_RULES.get(operation.get("Period"))
+
+            transaction = {
+                "1_name": operation.get("1_name"),
+                "2_date": int(operation.get("2_date")),
+                "3_vendor": operation.get("3_vendor"),
+                "4_type": "Upcoming",
+                "5_category": operation.get("5_category"),
+                "6_amount": int(operation.get("6_amount")),
+                "7_recurrence": {"every": every, "unit": unit, "until": None},
+            }
+
+            self.send_transaction.emit(transaction, "Upcoming")
+
+        self.destroy()
@@ -0,0 +1,94 @@
+from collections import OrderedDict
+
+
+class AnalysisCache:
+    """
+    LRU cache of analysis results keyed by analysis parameters.
+
+    Every entry remembers versions of stores it was calculated for and ranges of days it depends on.
+    Change in store drops only entries which depend on changed days, rest of entries is moved to new versions.
+    """
+
+    def __init__(self, max_size):
+        self.max_size = max_size
+
+        # Analysis parameters -> {"analysis", "versions", "ranges"}
+        self.entries = OrderedDict()
+
+        # Store versions known by cache
+        self.versions = None
+
+    def get(self, key, versions):
+        """
+        Get analysis calculated for current data
+
+        Args:
+            key (tuple): analysis parameters
+            versions (tuple): current versions of stores
+
+        Returns:
+            Analysis: cached analysis or None
+        """
+        entry = self.entries.get(key)
+        if entry is None or entry.get("versions") != versions:
+            return None
+
+        self.entries.move_to_end(key)
+
+        return entry.get("analysis")
+
+    def put(self, key, versions, analysis, ranges):
+        """
+        Add analysis to cache (least recently used analysis is removed if cache is full)
+
+        Args:
+            key (tuple): analysis parameters
+            versions (tuple): versions of stores analysis was calculated for
+            analysis (Analysis): analysis result
+            ranges (dict): store name and range of day ordinals (first, last) analysis depends on,
+                None as range limit means no limit
+        """
+        self.entries[key] = {
+            "analysis": analysis,
+            "versions": versions,
+            "ranges": ranges,
+        }
+        self.entries.move_to_end(key)
+        self.versions = versions
+
+        while len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+
+    def invalidate(self, store_name, days, versions):
+        """
+        Drop analyses which depend on changed days of store
+
+        Args:
+            store_name (str): name of changed store
+            days (list): day ordinals of changed operations
+            versions (tuple): versions of stores after change
+        """
+        for key, entry in list(self.entries.items()):
+            # Entry calculated before previous change is already outdated
+            if entry.get("versions") != self.versions:
+                self.entries.pop(key)
+                continue
+
+            day_range = entry.get("ranges").get(store_name)
+            if day_range is not None and any(
+                (day_range[0] is None or day >= day_range[0])
+                and (day_range[1] is None or day <= day_range[1])
+                for day in days
+            ):
+                self.entries.pop(key)
+                continue
+
+            entry["versions"] = versions
+
+        self.versions = versions
+
+    def clear(self):
+        """
+        Drop all analyses
+        """
+        self.entries.clear()
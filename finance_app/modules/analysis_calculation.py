@@ -3,6 +3,8 @@ import numpy as np
 from datetime import datetime
 from dateutil.relativedelta import relativedelta
 
+from finance_app.config import ALL_CATEGORIES
+
 
 class Analysis:
     """
@@ -18,9 +20,15 @@ class Analysis:
         transactions,
         upcomings=None,
         category=None,
+        main_categories=None,
         account_balance=None,
         average_revenue=None,
         average_spendings=None,
+        monthly_summary=None,
+        granularity="Monthly",
+        prognosis_model="Average",
+        paths=10000,
+        forecast_spendings=None,
     ):
 
         # User inputs
@@ -30,12 +38,19 @@ class Analysis:
         self.transactions = transactions
         self.upcomings = upcomings
         self.category = category
+        self.main_categories = main_categories
         self.account_balance = account_balance
         self.average_revenue = average_revenue
         self.average_spendings = average_spendings
+        self.monthly_summary = monthly_summary
+        self.granularity = granularity
+        self.prognosis_model = prognosis_model
+        self.paths = paths
+        self.forecast_spendings = forecast_spendings
 
         # Data
         self.result_table = None
+        self.category_pivot = None
 
         match self.analysis_type:
             case "Categorical":
@@ -44,91 +59,116 @@ class Analysis:
                 self.result_table = self.calculate_aggregate()
             case "Prognosis":
                 self.result_table = self.calculate_prognosis()
-
-        print(self.result_table)
+            case "Balance":
+                self.result_table = self.calculate_balance()
 
     def calculate_categorical(self):
         """
         Make calculation for categorical analysis type.
         Categorical analysis is analysis based on choosen user category.
+        Pivot of all categories is calculated once, result table is its slice for choosen category.
 
         Returns:
             pandas.DataFrame: Table with results
         """
-        transactions = self.transactions.copy()
-        transactions = transactions[
-            (transactions["2_date"] >= self.date_from)
-            & (transactions["2_date"] <= self.date_to)
-        ]
+        self.category_pivot = self.calculate_category_pivot()
 
-        transactions["Year-month"] = transactions["2_date"].apply(
-            lambda x: x.strftime("%Y-%m")
-        )
-        transactions = transactions[
-            (transactions["4_type"] == "Expense")
-            & (transactions["5_category"].str.contains(self.category))
-        ].drop("4_type", axis=1)
+        return self.category_table(self.category)
 
-        transactions = (
-            transactions.groupby(["Year-month", "5_category"])["6_amount"]
-            .sum()
-            .reset_index(drop=False)
-        )
+    def calculate_category_pivot(self):
+        """
+        Monthly sums of expenses for every main category and subcategory in one grouped pass.
+        It is calculated from monthly summary of transactions.
 
-        transactions["5_category"] = transactions["5_category"].apply(
-            lambda x: x.split(" - ")[-1]
-        )
+        Returns:
+            pandas.DataFrame: months x (main category, subcategory) table, NaN for months without expenses
+        """
+        # Monthly sums of expenses with exact category names of user categories
+        summary = self.monthly_summary
+        expenses = summary[
+            (summary["4_type"] == "Expense")
+            & summary["5_category"].isin(self.main_categories.keys())
+        ]
 
-        result_table = pd.pivot_table(
-            transactions,
+        # Subcategory is the last part of category name
+        return pd.pivot_table(
+            expenses,
             values="6_amount",
             index="Year-month",
-            columns="5_category",
+            columns=[
+                expenses["5_category"]
+                .map(self.main_categories)
+                .rename("1_Main Category"),
+                expenses["5_category"].str.rsplit(" - ", n=1).str[-1],
+            ],
             aggfunc="sum",
-            fill_value=0,
-        ).reset_index(drop=False)
+        )
+
+    def category_table(self, category):
+        """
+        Get result table for main category (or sums of all main categories) from category pivot
+
+        Args:
+            category (str): main category or ALL_CATEGORIES
+
+        Returns:
+            pandas.DataFrame: Table with results
+        """
+        pivot = self.category_pivot
+        if category == ALL_CATEGORIES:
+            # Main categories sums
+            result_table = pivot.T.groupby(level=0).sum(min_count=1).T
+            result_table.columns.name = "5_category"
+        elif category in pivot.columns.get_level_values(0):
+            # Only months with expenses in main category
+            result_table = pivot[category].dropna(how="all")
+        else:
+            result_table = pd.DataFrame(
+                index=pd.Index([], name="Year-month"),
+                columns=pd.Index([], name="5_category"),
+            )
+
+        result_table = result_table.fillna(0).reset_index(drop=False)
         result_table["Summary"] = result_table.iloc[:, 1:].sum(axis=1)
 
         return result_table.round(2)
 
+    def set_category(self, category):
+        """
+        Change category of categorical analysis without calculation
+
+        Args:
+            category (str): main category or ALL_CATEGORIES
+        """
+        if self.category_pivot is None or category == self.category:
+            return
+
+        self.category = category
+        self.result_table = self.category_table(category)
+
     def calculate_aggregate(self):
         """
         Make calculation for aggregate analysis type.
         Aggregate analysis if summary monthly cashflow analysis.
+        It is calculated from monthly summary of transactions.
 
         Returns:
             pandas.DataFrame: Table with results
         """
-        transactions = self.transactions.copy()
-        transactions = transactions[
-            (transactions["2_date"] >= self.date_from)
-            & (transactions["2_date"] <= self.date_to)
-        ]
-
-        transactions["Year-month"] = transactions["2_date"].apply(
-            lambda x: x.strftime("%Y-%m")
-        )
-
-        transactions = (
-            transactions.groupby(["Year-month", "4_type"])["6_amount"]
-            .sum()
+        # Monthly sums of transactions by type (months are sorted in summary)
+        result_table = (
+            pd.pivot_table(
+                self.monthly_summary,
+                values="6_amount",
+                index="Year-month",
+                columns="4_type",
+                aggfunc="sum",
+            )
+            .reindex(columns=["Income", "Expense"])
+            .fillna(0)
             .reset_index(drop=False)
         )
-
-        expense = transactions[transactions["4_type"] == "Expense"].drop(
-            "4_type", axis=1
-        )
-        expense.columns = ["Year-month", "Expense"]
-        income = transactions[transactions["4_type"] == "Income"].drop("4_type", axis=1)
-        income.columns = ["Year-month", "Income"]
-
-        result_table = transactions["Year-month"].drop_duplicates()
-        result_table = pd.merge(
-            left=result_table, right=income, how="left", on="Year-month"
-        )
-        result_table = pd.merge(
-            left=result_table, right=expense, how="left", on="Year-month"
-        ).fillna(0)
+        result_table.columns.name = None
 
         result_table["Difference"] = result_table["Income"] - result_table["Expense"]
 
@@ -149,149 +189,368 @@ class Analysis:
         Returns:
             pandas.DataFrame: Table with results
         """
-        last_month_spendings = self.average_spendings
+        last_month_spent = 0
         last_month_revenue = self.average_revenue
         transactions = self.transactions
         last_transaction_date = datetime.today()
 
         if not transactions.empty:
 
-            last_transaction_date = transactions["2_date"].iloc[-1]
+            last_transaction_date = transactions["2_date"].max()
 
-            # Calculate current account balance
-            transactions = transactions.copy()
-            transactions = transactions[
-                (transactions["2_date"] >= last_transaction_date + relativedelta(day=1))
-                & (transactions["2_date"] <= last_transaction_date)
-                & (transactions["4_type"] == "Expense")
+            # Operations from month of last transaction
+            month_start = last_transaction_date + relativedelta(day=1)
+            month_end = last_transaction_date + relativedelta(day=31)
+            last_month = transactions[
+                (transactions["2_date"] >= month_start)
+                & (transactions["2_date"] <= month_end)
             ]
 
-            transactions["Year-month"] = transactions["2_date"].apply(
-                lambda x: x.strftime("%Y-%m")
+            # Spendings already made in last month (subtracted from its spendings)
+            last_month_spent = last_month.loc[
+                (last_month["2_date"] <= last_transaction_date)
+                & (last_month["4_type"] == "Expense"),
+                "6_amount",
+            ].sum()
+
+            # Set value for first revenue value in result table (first month)
+            last_month_revenue = (
+                0
+                if (last_month["4_type"] == "Income").any()
+                else self.average_revenue
             )
 
-            # Calculate average spendings - last month summary spendings
-            last_month_spendings = (
-                transactions.groupby(["Year-month"])["6_amount"].sum().values[0]
+        # Account balance is cumulative sum of balance changes of every period
+        if self.prognosis_model == "Monte Carlo":
+            result_table = self.monte_carlo_prognosis(
+                last_transaction_date, last_month_revenue, last_month_spent
             )
-            last_month_spendings = self.average_spendings - last_month_spendings
-            last_month_spendings = (
-                0 if last_month_spendings <= 0 else last_month_spendings
+        elif self.granularity == "Daily":
+            result_table = self.daily_prognosis(
+                last_transaction_date, last_month_revenue, last_month_spent
             )
-
-            # Set value for first revenue value in result table (first month)
-            last_month_revenue = self.transactions.copy()
-            last_month_revenue = last_month_revenue[
-                (
-                    last_month_revenue["2_date"]
-                    >= last_transaction_date + relativedelta(day=1)
-                )
-                & (
-                    last_month_revenue["2_date"]
-                    <= last_transaction_date + relativedelta(day=31)
-                )
-                & (last_month_revenue["4_type"] == "Income")
-            ]
-            last_month_revenue = (
-                0 if not last_month_revenue.empty else self.average_revenue
+        else:
+            result_table = self.monthly_prognosis(
+                last_transaction_date, last_month_revenue, last_month_spent
             )
 
-        month_list = []
-        current = last_transaction_date
-        while current <= self.date_to:
-            month_list.append(current.strftime("%Y-%m"))
-            current += relativedelta(months=1)
+        return result_table
+
+    def planned_expenses(self, last_transaction_date, periods):
+        """
+        Sum planned expenses for every prognosis period
+
+        Args:
+            last_transaction_date (datetime): date of last transaction
+            periods (pandas.PeriodIndex | pandas.DatetimeIndex): prognosis months or days
+
+        Returns:
+            numpy.ndarray: sums of planned expenses (zeros for periods without them)
+        """
+        if self.upcomings is None or len(periods) == 0:
+            return np.zeros(len(periods))
+
+        upcomings = self.upcomings[
+            (self.upcomings["2_date"] >= last_transaction_date + relativedelta(day=1))
+            & (self.upcomings["2_date"] <= self.date_to)
+        ]
+
+        if isinstance(periods, pd.PeriodIndex):
+            upcoming_periods = upcomings["2_date"].dt.to_period("M")
+        else:
+            # Planned operations from days before prognosis start are added to first day
+            upcoming_periods = upcomings["2_date"].dt.normalize().clip(lower=periods[0])
+
+        return (
+            upcomings.groupby(upcoming_periods)["6_amount"]
+            .sum()
+            .reindex(periods, fill_value=0)
+            .to_numpy(dtype=float)
+        )
+
+    def prognosis_months(self, last_transaction_date):
+        """
+        Get months from month of last transaction to date to
+
+        Args:
+            last_transaction_date (datetime): date of last transaction
+
+        Returns:
+            pandas.PeriodIndex: prognosis months
+        """
+        months = pd.period_range(
+            pd.Period(last_transaction_date, "M"), pd.Period(self.date_to, "M")
+        )
+        if last_transaction_date > self.date_to:
+            months = months[:0]
+
+        return months
+
+    def monthly_spendings(self, months, last_month_spent):
+        """
+        Spendings of every prognosis month: forecast of spendings or average spendings.
+        Spendings already made in month of last transaction are subtracted from first month.
+
+        Args:
+            months (pandas.PeriodIndex): prognosis months
+            last_month_spent (float): spendings already made in month of last transaction
+
+        Returns:
+            numpy.ndarray: spendings of every month
+        """
+        spendings = np.full(len(months), self.average_spendings, dtype=float)
+        if self.forecast_spendings is not None:
+            forecast = np.asarray(self.forecast_spendings[: len(months)], dtype=float)
+            spendings[: len(forecast)] = forecast
+
+        if len(months) > 0:
+            spendings[0] = max(spendings[0] - last_month_spent, 0)
+
+        return spendings
+
+    def monthly_prognosis(
+        self, last_transaction_date, last_month_revenue, last_month_spent
+    ):
+        """
+        Prognosis for every month from month of last transaction to date to
+
+        Args:
+            last_transaction_date (datetime): date of last transaction
+            last_month_revenue (float): revenue left in month of last transaction
+            last_month_spent (float): spendings already made in month of last transaction
+
+        Returns:
+            pandas.DataFrame: Table with results
+        """
+        months = self.prognosis_months(last_transaction_date)
+
+        revenue = np.full(len(months), self.average_revenue, dtype=float)
+        spendings = self.monthly_spendings(months, last_month_spent)
+        if len(months) > 0:
+            revenue[0] = last_month_revenue
+
+        planned_expenses = self.planned_expenses(last_transaction_date, months)
 
         result_table = pd.DataFrame(
             {
-                "Year-month": month_list,
-                "Account balance": [self.account_balance] * len(month_list),
-                "Average revenue": [self.average_revenue] * len(month_list),
-                "Average spendings": [self.average_spendings] * len(month_list),
+                "Year-month": months.strftime("%Y-%m"),
+                "Account balance": self.cumulative_balance(
+                    revenue - spendings - planned_expenses
+                ),
+                "Average revenue": self.average_revenue,
+                "Average spendings": spendings,
+                "Planned expenses": planned_expenses,
             }
         )
 
-        planned_expenses = None
-        if not self.upcomings is None:
-            planned_expenses = self.upcomings.copy()
-            planned_expenses = planned_expenses[
-                (
-                    planned_expenses["2_date"]
-                    >= last_transaction_date + relativedelta(day=1)
-                )
-                & (planned_expenses["2_date"] <= self.date_to)
-            ]
+        return (
+            result_table[months >= pd.Period(self.date_from, "M")]
+            .reset_index(drop=True)
+            .round(2)
+        )
 
-            planned_expenses["Year-month"] = planned_expenses["2_date"].apply(
-                lambda x: x.strftime("%Y-%m")
-            )
+    def daily_prognosis(
+        self, last_transaction_date, last_month_revenue, last_month_spent
+    ):
+        """
+        Prognosis for every day from date of last transaction to date to.
+        Monthly revenue and spendings are spread evenly over days of month,
+        so balance at the end of every month is the same as in monthly prognosis.
 
-            planned_expenses = (
-                planned_expenses.groupby(["Year-month"])["6_amount"]
-                .sum()
-                .reset_index(drop=False)
-            )
-            planned_expenses.columns = ["Year-month", "Planned expenses"]
+        Args:
+            last_transaction_date (datetime): date of last transaction
+            last_month_revenue (float): revenue left in month of last transaction
+            last_month_spent (float): spendings already made in month of last transaction
+
+        Returns:
+            pandas.DataFrame: Table with results
+        """
+        months = self.prognosis_months(last_transaction_date)
+        days = pd.date_range(
+            pd.Timestamp(last_transaction_date).normalize(), self.date_to, freq="D"
+        )
+
+        monthly_revenue = np.full(len(months), self.average_revenue, dtype=float)
+        monthly_spendings = self.monthly_spendings(months, last_month_spent)
+        if len(months) > 0:
+            monthly_revenue[0] = last_month_revenue
+
+        # Month of every day (position in prognosis months)
+        month_index = (days.year - last_transaction_date.year) * 12 + (
+            days.month - last_transaction_date.month
+        )
+
+        # Values left in first month are spread over its remaining days
+        first_month = month_index == 0
+        days_in_month = np.where(
+            first_month, max(first_month.sum(), 1), days.days_in_month
+        )
+
+        revenue = monthly_revenue[month_index] / days_in_month
+        spendings = monthly_spendings[month_index] / days_in_month
+
+        planned_expenses = self.planned_expenses(last_transaction_date, days)
+
+        result_table = pd.DataFrame(
+            {
+                # ISO dates (YYYY-MM-DD) like year-months in monthly prognosis
+                "Date": np.datetime_as_string(days.to_numpy(), unit="D"),
+                "Account balance": self.cumulative_balance(
+                    revenue - spendings - planned_expenses
+                ),
+                "Average revenue": revenue,
+                "Average spendings": spendings,
+                "Planned expenses": planned_expenses,
+            }
+        )
+
+        return result_table[days >= self.date_from].reset_index(drop=True).round(2)
+
+    def monte_carlo_prognosis(
+        self, last_transaction_date, last_month_revenue, last_month_spent
+    ):
+        """
+        Prognosis for every month with spendings drawn from history of monthly spendings.
+        Spendings of every category are drawn independently from its past months for all simulated paths at once,
+        balance of every path is cumulative sum of its months and table shows percentiles of paths.
+
+        Args:
+            last_transaction_date (datetime): date of last transaction
+            last_month_revenue (float): revenue left in month of last transaction
+            last_month_spent (float): spendings already made in month of last transaction
+
+        Returns:
+            pandas.DataFrame: Table with results
+        """
+        months = self.prognosis_months(last_transaction_date)
+        history = self.spendings_history(last_transaction_date)
+
+        # Same draws for the same data, so results can be cached and compared
+        random = np.random.default_rng(0)
+        spendings = np.zeros((self.paths, len(months)))
+        if history.size > 0:
+            for category_history in history.T:
+                spendings += category_history[
+                    random.integers(0, len(category_history), size=spendings.shape)
+                ]
         else:
-            planned_expenses = pd.DataFrame(
-                {
-                    "Year-month": month_list,
-                    "Planned expenses": [np.nan] * len(month_list),
-                }
-            )
+            spendings += self.average_spendings
 
-        result_table = pd.merge(
-            left=result_table, right=planned_expenses, how="left", on="Year-month"
-        ).fillna(0)
-
-        for index in result_table.index:
-            temp_revenue = 0
-            temp_spendings = 0
-            temp_balance = 0
-            # First month values
-            if index == 0:
-                temp_revenue = last_month_revenue
-                temp_spendings = last_month_spendings
-                temp_balance = result_table.iloc[index, 1]
-
-                result_table.at[index, "Average spendings"] = temp_spendings
-
-            # Rest month values
-            else:
-                temp_revenue = self.average_revenue
-                temp_spendings = self.average_spendings
-                temp_balance = result_table.iloc[index - 1, 1]
-
-            # Get planned expenses
-            temp_planned_expenses = result_table.iloc[index, -1]
-
-            # Calculate balance
-            temp_balance = temp_balance + (
-                temp_revenue - temp_spendings - temp_planned_expenses
-            )
+        revenue = np.full(len(months), self.average_revenue, dtype=float)
+        if len(months) > 0:
+            revenue[0] = last_month_revenue
+            spendings[:, 0] = np.maximum(spendings[:, 0] - last_month_spent, 0)
 
-            # Add value to result
-            result_table.at[index, "Account balance"] = temp_balance
+        planned_expenses = self.planned_expenses(last_transaction_date, months)
 
-        result_table = result_table[
-            result_table["Year-month"].apply(lambda x: self.get_date(x))
-            >= self.date_from
-        ].reset_index(drop=True)
-        return result_table
+        balances = self.account_balance + np.cumsum(
+            revenue - spendings - planned_expenses, axis=1
+        )
+        p10, p50, p90 = np.percentile(balances, [10, 50, 90], axis=0)
 
-    def get_date(self, year_month):
+        result_table = pd.DataFrame(
+            {
+                "Year-month": months.strftime("%Y-%m"),
+                "Account balance": p50,
+                "Balance P10": p10,
+                "Balance P90": p90,
+                "Average revenue": self.average_revenue,
+                "Average spendings": spendings.mean(axis=0),
+                "Planned expenses": planned_expenses,
+            }
+        )
+
+        return (
+            result_table[months >= pd.Period(self.date_from, "M")]
+            .reset_index(drop=True)
+            .round(2)
+        )
+
+    def spendings_history(self, last_transaction_date):
         """
-        Get date based on provided string in format YYYY-MM.
+        Monthly spendings of every category in months before month of last transaction
 
         Args:
-            year_month (string): Year and month
+            last_transaction_date (datetime): date of last transaction
 
         Returns:
-            Datetime: first day of month
+            numpy.ndarray: months x categories spendings (months without spendings are zeros)
         """
-        date = datetime.strptime(f"{year_month}-01", "%Y-%m-%d") + relativedelta(day=31)
+        summary = self.monthly_summary
+        if summary is None:
+            return np.zeros((0, 0))
+
+        last_month = pd.Period(last_transaction_date, "M")
+        expenses = summary[
+            (summary["4_type"] == "Expense")
+            & (summary["Year-month"] < last_month.strftime("%Y-%m"))
+        ]
+        if expenses.empty:
+            return np.zeros((0, 0))
+
+        history = pd.pivot_table(
+            expenses,
+            values="6_amount",
+            index="Year-month",
+            columns="5_category",
+            aggfunc="sum",
+        )
+        history.index = pd.PeriodIndex(history.index, freq="M")
 
-        return date
+        return (
+            history.reindex(pd.period_range(history.index.min(), last_month - 1))
+            .fillna(0)
+            .to_numpy()
+        )
+
+    def calculate_balance(self):
+        """
+        Make calculation for daily account balance timeline.
+        Income and expenses of every day are summed from transactions and planned operations
+        (upcomings after the latest transaction), balance is cumulative sum of daily changes.
+
+        Returns:
+            pandas.DataFrame: Table with results
+        """
+        days = pd.date_range(self.date_from, self.date_to, freq="D")
+
+        operations = self.transactions
+        if self.upcomings is not None:
+            operations = pd.concat([operations, self.upcomings], ignore_index=True)
+
+        # Day of every operation counted from first day (operations are already in range)
+        offsets = (operations["2_date"] - days[0]).dt.days.to_numpy()
+        amounts = operations["6_amount"].to_numpy(dtype=float)
+        is_income = (operations["4_type"] == "Income").to_numpy()
+
+        income = np.bincount(
+            offsets[is_income], weights=amounts[is_income], minlength=len(days)
+        )
+        expenses = np.bincount(
+            offsets[~is_income], weights=amounts[~is_income], minlength=len(days)
+        )
+
+        return pd.DataFrame(
+            {
+                "Date": np.datetime_as_string(days.to_numpy(), unit="D"),
+                "Income": income,
+                "Expenses": expenses,
+                "Account balance": self.cumulative_balance(income - expenses),
+            }
+        ).round(2)
+
+    def cumulative_balance(self, balance_changes):
+        """
+        Account balance after every period
+
+        Args:
+            balance_changes (numpy.ndarray): balance change of every period
+
+        Returns:
+            numpy.ndarray: account balance at the end of every period
+        """
+        # Starting balance is summed first, as if periods were added one by one
+        return np.cumsum(np.concatenate(([self.account_balance], balance_changes)))[1:]
 
     def get_data_to_table(self):
         """
@@ -300,11 +559,11 @@ class Analysis:
         Returns:
             pandas.DataFrame: data to table
         """
-        data_to_table = self.result_table.copy()
+        # Cells are formatted column by column
+        data_to_table = self.result_table.astype(str)
         for col in data_to_table.columns:
-            data_to_table[col] = data_to_table[col].apply(
-                lambda x: str(x).replace(".", ",")
-            )
+            data_to_table[col] = data_to_table[col].str.replace(".", ",", regex=False)
+
         return data_to_table
 
     def get_data_to_plot(self):
@@ -314,10 +573,7 @@ class Analysis:
         Returns:
             pandas.DataFrame: data to plot
         """
-        data_to_plot = self.result_table.copy()
-
-        data_to_plot.index = data_to_plot["Year-month"]
-        data_to_plot = data_to_plot.drop("Year-month", axis=1)
+        data_to_plot = self.result_table.set_index(self.result_table.columns[0])
 
         match self.analysis_type:
             case "Categorical":
@@ -325,8 +581,23 @@ class Analysis:
                 data_to_plot = pd.DataFrame(data_to_plot.sum(axis=1), columns=["Sum"])
             case "Aggregate":
                 data_to_plot = pd.DataFrame(data_to_plot.iloc[:, :2])
+            case "Prognosis" if self.prognosis_model == "Monte Carlo":
+                # Balance percentiles of simulated paths over whole horizon
+                data_to_plot = data_to_plot[
+                    ["Balance P10", "Account balance", "Balance P90"]
+                ]
+                data_to_plot.columns = ["P10", "P50", "P90"]
             case "Prognosis":
-                data_to_plot = pd.DataFrame(data_to_plot["Account balance"]).iloc[:14]
+                data_to_plot = pd.DataFrame(data_to_plot["Account balance"])
+                if self.granularity == "Daily":
+                    # Balance at the end of every month
+                    data_to_plot = data_to_plot.groupby(
+                        data_to_plot.index.str[:7]
+                    ).last()
+                data_to_plot = data_to_plot.iloc[:14]
+            case "Balance":
+                # Whole daily series, chart draws it downsampled
+                data_to_plot = pd.DataFrame(data_to_plot["Account balance"])
 
         return data_to_plot
 
@@ -338,11 +609,6 @@ class Analysis:
         Returns:
             pandas.DataFrame: data to plot with only last 3 months
         """
-        data_to_plot = self.result_table.copy()
-
-        data_to_plot.index = data_to_plot["Year-month"]
-        data_to_plot = data_to_plot.drop("Year-month", axis=1)
-
-        data_to_plot = data_to_plot.iloc[:4]
+        data_to_plot = self.result_table.set_index("Year-month").iloc[:4]
 
         return pd.DataFrame(data_to_plot.sum(axis=1), columns=["Sum"])
@@ -8,8 +8,12 @@ from dateutil.relativedelta import relativedelta
 
 import json
 
-from finance_app.modules import TableWidget, BarChart, Analysis, ErrorBox
+from finance_app.modules import TableWidget, BarChart, LineChart, ErrorBox
+from finance_app.modules.analysis_cache import AnalysisCache
+from finance_app.modules.analysis_worker import AnalysisWorker
+from finance_app.modules.spending_forecast import SpendingForecast
 from finance_app.config import *
+from finance_app.utils import format_date
 
 
 class AnalysisSection(QWidget):
@@ -19,14 +23,15 @@ class AnalysisSection(QWidget):
         - Analyse categories
         - Analyse monthly cashflow
         - Make prognosis for future months
+        - Analyse daily account balance with planned operations
     """
 
     def __init__(
         self,
         user_settings,
-        user_transactions,
+        transactions_store,
         user_transactions_path,
-        user_upcomings,
+        upcomings_store,
         user_upcomings_path,
         user_categories,
     ) -> None:
@@ -34,9 +39,9 @@ class AnalysisSection(QWidget):
 
         # User data
         self.user_settings = user_settings
-        self.user_transactions = user_transactions
+        self.transactions_store = transactions_store
         self.user_transactions_path = user_transactions_path
-        self.user_upcomings = user_upcomings
+        self.upcomings_store = upcomings_store
         self.user_upcomings_path = user_upcomings_path
         self.user_categories = user_categories
 
@@ -50,12 +55,6 @@ class AnalysisSection(QWidget):
         self.data_path = self.user_settings.get("USER_FOLDER")
         self.user_def_analysis = self.user_settings.get("DEFAULT_ANALYSIS")
 
-        self.last_operation_date = datetime.today().strftime("%d.%m.%Y")
-        if not self.user_transactions is None and len(self.user_transactions) > 0:
-            self.last_operation_date = self.user_transactions.get(
-                list(self.user_transactions.keys())[-1]
-            ).get("2_date")
-
         self.prognosis_date_to = (
             datetime.strptime(self.last_operation_date, "%d.%m.%Y")
             + relativedelta(months=24)
@@ -65,16 +64,54 @@ class AnalysisSection(QWidget):
         self.current_date_to = None
 
         self.recent_oper_num = (
-            7 if self.user_transactions is None else len(self.user_transactions.keys())
+            7
+            if self.transactions_store.operations is None
+            else len(self.transactions_store)
         )
         self.upcoming_oper_num = (
-            7 if self.user_upcomings is None else len(self.user_upcomings.keys())
+            7 if self.upcomings_store.operations is None else len(self.upcomings_store)
         )
 
         self.analysis_result = None
 
+        # Analyses calculated for current data
+        self.analysis_cache = AnalysisCache(ANALYSIS_CACHE_SIZE)
+        self.transactions_store.row_inserted.connect(self.transaction_inserted)
+        self.transactions_store.row_updated.connect(self.transaction_updated)
+        self.transactions_store.row_deleted.connect(self.transaction_deleted)
+        self.upcomings_store.row_inserted.connect(self.upcoming_inserted)
+        self.upcomings_store.row_updated.connect(self.upcoming_updated)
+        self.upcomings_store.row_deleted.connect(self.upcoming_deleted)
+
+        # Models of spendings for forecast prognosis (updated when needed)
+        self.spending_forecast = SpendingForecast()
+
+        # Analyses calculated in background, newest request of every type
+        self.thread_pool = QThreadPool.globalInstance()
+        self.analysis_requests = {}
+        self.last_request_id = 0
+
+        # Analysis types to update when their page is shown
+        self.dirty_analyses = set()
+
+        # Analysis shown on page of every type
+        self.shown_analyses = {}
+
         self.init_section()
 
+    @property
+    def last_operation_date(self):
+        """
+        Date of the latest transaction (today if there are no transactions)
+
+        Returns:
+            str: date in format dd.mm.YYYY
+        """
+        if self.transactions_store.is_empty():
+            return datetime.today().strftime("%d.%m.%Y")
+
+        return format_date(self.transactions_store.last_date())
+
     def init_section(self):
         """
         Section initialization
@@ -115,18 +152,32 @@ class AnalysisSection(QWidget):
         self.category_type_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
 
         self.category_type_combo = QComboBox(self)
-        self.category_type_combo.addItems(
-            list(
-                dict.fromkeys(
-                    [
-                        category.get("1_Main Category")
-                        for category in self.user_categories.values()
-                    ]
-                )
-            )
-            if not self.user_categories is None
-            else []
+        self.category_type_combo.addItems(self.category_items())
+        self.category_type_combo.currentIndexChanged.connect(self.on_category_change)
+
+        # Prognosis granularity
+        self.granularity_label = QLabel(self)
+        self.granularity_label.setText("Granularity")
+        self.granularity_label.setStyleSheet(
+            "color: black; font-size: 12pt; padding:5px; border: 0px"
+        )
+        self.granularity_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+
+        self.granularity_combo = QComboBox(self)
+        self.granularity_combo.addItems(PROGNOSIS_GRANULARITIES)
+        self.granularity_combo.currentIndexChanged.connect(self.on_prognosis_change)
+
+        # Prognosis model
+        self.model_label = QLabel(self)
+        self.model_label.setText("Model")
+        self.model_label.setStyleSheet(
+            "color: black; font-size: 12pt; padding:5px; border: 0px"
         )
+        self.model_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+
+        self.model_combo = QComboBox(self)
+        self.model_combo.addItems(PROGNOSIS_MODELS)
+        self.model_combo.currentIndexChanged.connect(self.on_model_change)
 
         # Date from
         self.date_from_label = QLabel(self)
@@ -187,6 +238,20 @@ class AnalysisSection(QWidget):
             self.category_type_combo, 1, 1, alignment=Qt.AlignmentFlag.AlignVCenter
         )
 
+        # Granularity is in place of category (only one of them is visible)
+        self.input_layout.addWidget(
+            self.granularity_label, 1, 0, alignment=Qt.AlignmentFlag.AlignLeft
+        )
+        self.input_layout.addWidget(
+            self.granularity_combo, 1, 1, alignment=Qt.AlignmentFlag.AlignVCenter
+        )
+        self.input_layout.addWidget(
+            self.model_label, 2, 0, alignment=Qt.AlignmentFlag.AlignLeft
+        )
+        self.input_layout.addWidget(
+            self.model_combo, 2, 1, alignment=Qt.AlignmentFlag.AlignVCenter
+        )
+
         self.input_layout.addWidget(
             self.date_from_label, 0, 2, alignment=Qt.AlignmentFlag.AlignRight
         )
@@ -214,11 +279,13 @@ class AnalysisSection(QWidget):
         self.init_categorical()
         self.init_aggregate()
         self.init_prognosis()
+        self.init_balance()
 
         self.result_stack = QStackedWidget()
         self.result_stack.addWidget(self.categorical_widget)
         self.result_stack.addWidget(self.aggregate_widget)
         self.result_stack.addWidget(self.prognosis_widget)
+        self.result_stack.addWidget(self.balance_widget)
 
         bottom_layout.addWidget(self.result_stack)
 
@@ -294,6 +361,28 @@ class AnalysisSection(QWidget):
 
         self.prognosis_layout.addWidget(self.prognosis_table, 0)
 
+    def init_balance(self):
+        """
+        Create daily account balance view
+        """
+        self.balance_widget = QWidget()
+        self.balance_layout = QVBoxLayout(self.balance_widget)
+        self.balance_layout.setSpacing(15)
+
+        self.balance_table = TableWidget(
+            parent=self,
+            row_num=7,
+            col_num=len(BALANCE_HEADERS),
+            header_names=BALANCE_HEADERS,
+            font=QFont(
+                "Notosans",
+                10,
+            ),
+            editable=False,
+        )
+
+        self.balance_layout.addWidget(self.balance_table, 0)
+
     def on_date_from_change(self):
         """
         Set date to according to choosen analysis type.
@@ -329,6 +418,27 @@ class AnalysisSection(QWidget):
             self.date_to_edit.setDate(
                 QDate().fromString(date_from.strftime("%d.%m.%Y"), "dd.MM.yyyy")
             )
+            return
+
+        self.on_prognosis_change()
+
+    def on_model_change(self):
+        """
+        Recalculate prognosis for choosen model.
+        Monte Carlo prognosis is made only for months.
+        """
+        monte_carlo = self.model_combo.currentText() == "Monte Carlo"
+        self.granularity_combo.setEnabled(not monte_carlo)
+
+        self.on_prognosis_change()
+
+    def on_prognosis_change(self):
+        """
+        Recalculate prognosis when its date to, granularity or model is changed.
+        Prognosis is cumulative sum over periods, so it is recalculated at once.
+        """
+        if self.analysis_type_combo.currentText() == "Prognosis":
+            self.create_analysis()
 
     def on_analysis_type_change(self):
         """
@@ -338,6 +448,10 @@ class AnalysisSection(QWidget):
         """
         self.category_type_label.setVisible(False)
         self.category_type_combo.setVisible(False)
+        self.granularity_label.setVisible(False)
+        self.granularity_combo.setVisible(False)
+        self.model_label.setVisible(False)
+        self.model_combo.setVisible(False)
 
         # Get date from
         date_from = datetime.strptime(f"01.{self.date_from_edit.text()}", "%d.%m.%Y")
@@ -371,7 +485,10 @@ class AnalysisSection(QWidget):
                     QDate().fromString(self.last_operation_date, "dd.MM.yyyy")
                 )
             case "Prognosis":
-
+                self.granularity_label.setVisible(True)
+                self.granularity_combo.setVisible(True)
+                self.model_label.setVisible(True)
+                self.model_combo.setVisible(True)
                 self.result_stack.setCurrentIndex(2)
 
                 self.date_from_edit.setDate(
@@ -380,68 +497,226 @@ class AnalysisSection(QWidget):
                 self.date_to_edit.setDate(
                     QDate().fromString(self.prognosis_date_to, "dd.MM.yyyy")
                 )
+            case "Balance":
+                self.result_stack.setCurrentIndex(3)
+
+                self.date_from_edit.setDate(
+                    QDate().fromString(self.current_date_from, "dd.MM.yyyy")
+                )
+                self.date_to_edit.setDate(
+                    QDate().fromString(self.prognosis_date_to, "dd.MM.yyyy")
+                )
+
+        # Page is shown, so its analysis is calculated if outdated
+        self.update_visible_analysis()
+
+    @Slot(str)
+    def transaction_inserted(self, key):
+        """
+        Drop cached analyses which depend on date of new transaction
+
+        Args:
+            key (str): transaction id
+        """
+        self.invalidate_analyses("transactions", [self.transactions_store.get(key)])
+
+    @Slot(str, dict)
+    def transaction_updated(self, key, old_record):
+        """
+        Drop cached analyses which depend on old or new date of transaction
+
+        Args:
+            key (str): transaction id
+            old_record (dict): transaction values before update
+        """
+        self.invalidate_analyses(
+            "transactions", [old_record, self.transactions_store.get(key)]
+        )
+
+    @Slot(str, dict)
+    def transaction_deleted(self, key, old_record):
+        """
+        Drop cached analyses which depend on date of deleted transaction
+
+        Args:
+            key (str): transaction id
+            old_record (dict): deleted transaction values
+        """
+        self.invalidate_analyses("transactions", [old_record])
+
+    @Slot(str)
+    def upcoming_inserted(self, key):
+        """
+        Drop cached analyses which depend on date of new planned operation
+
+        Args:
+            key (str): upcoming operation id
+        """
+        self.invalidate_analyses("upcomings", [self.upcomings_store.get(key)])
+
+    @Slot(str, dict)
+    def upcoming_updated(self, key, old_record):
+        """
+        Drop cached analyses which depend on old or new date of planned operation
+
+        Args:
+            key (str): upcoming operation id
+            old_record (dict): operation values before update
+        """
+        self.invalidate_analyses(
+            "upcomings", [old_record, self.upcomings_store.get(key)]
+        )
 
-    def update_operations(self, data, type):
+    @Slot(str, dict)
+    def upcoming_deleted(self, key, old_record):
         """
-        Update data in table and on on the plot
+        Drop cached analyses which depend on date of deleted planned operation
 
+        Args:
+            key (str): upcoming operation id
+            old_record (dict): deleted operation values
+        """
+        self.invalidate_analyses("upcomings", [old_record])
+
+    def store_versions(self):
+        """
+        Versions of transactions and upcomings data
+
+        Returns:
+            tuple: transactions store version and upcomings store version
+        """
+        return (self.transactions_store.version, self.upcomings_store.version)
+
+    def invalidate_analyses(self, store_name, records):
+        """
+        Drop cached analyses which depend on dates of changed operations
 
         Args:
-            data (dict): transaction
-            type (str): type of operations
+            store_name (str): "transactions" or "upcomings"
+            records (list): changed operations values
         """
-        match type:
-            case "Upcoming":
-                self.user_upcomings = data
-            case _:
-                self.user_transactions = data
+        days = [record.get("2_date") for record in records]
+        self.analysis_cache.invalidate(store_name, days, self.store_versions())
+
+        if store_name == "transactions":
+            for day in days:
+                self.spending_forecast.invalidate(day)
 
     def update_categories(self, new_categories):
         self.user_categories = new_categories
 
+        # Categorical analyses depend on names of categories
+        self.analysis_cache.clear()
+
         self.category_type_combo.clear()
-        self.category_type_combo.addItems(
-            list(
-                dict.fromkeys(
-                    [
-                        category.get("1_Main Category")
-                        for category in self.user_categories.values()
-                    ]
-                )
+        self.category_type_combo.addItems(self.category_items())
+
+    def category_items(self):
+        """
+        Get items of category combo: main categories and all categories
+
+        Returns:
+            list: main categories and ALL_CATEGORIES
+        """
+        if self.user_categories is None:
+            return []
+
+        return list(
+            dict.fromkeys(
+                [
+                    category.get("1_Main Category")
+                    for category in self.user_categories.values()
+                ]
             )
-            if not self.user_categories is None
-            else []
-        )
+        ) + [ALL_CATEGORIES]
+
+    def main_categories(self):
+        """
+        Get main category of every category name
+
+        Returns:
+            dict: category name and its main category
+        """
+        return {
+            category.get("Name"): category.get("1_Main Category")
+            for category in (self.user_categories or {}).values()
+        }
+
+    def on_category_change(self):
+        """
+        Show shown categorical analysis for choosen category.
+        Analysis has pivot of all categories, so it is only sliced (without calculation).
+        """
+        analysis = self.shown_analyses.get("Categorical")
+        if analysis is None or not self.category_type_combo.currentText():
+            return
+
+        self.analysis_result = analysis
+        self.show_analysis("Categorical")
+
+    def showEvent(self, event):
+        """
+        Calculate shown analysis (if outdated) when section is shown
+        """
+        super().showEvent(event)
+        self.update_visible_analysis()
 
     def update_analysis(self):
         """
         Method used for updating all analysis types at once based on default dates.
+        Analysis types are only marked as outdated, each of them is calculated when its page is shown.
         """
-        if not self.user_transactions is None and len(self.user_transactions) > 0:
+        if not self.transactions_store.is_empty():
+            self.dirty_analyses = set(ANALYSIS_TYPES)
+            self.update_visible_analysis()
 
-            # Create default analysis charts for all types
-            for analysis_type in ANALYSIS_TYPES:
+    def update_visible_analysis(self):
+        """
+        Calculate analysis of current page with default dates if it is outdated
+        """
+        analysis_type = self.analysis_type_combo.currentText()
+        if not self.isVisible() or not analysis_type in self.dirty_analyses:
+            return
 
-                date_from = datetime.strptime(
-                    f"01.{self.date_from_edit.text()}", "%d.%m.%Y"
-                )
-                if self.current_date_from is not None:
-                    date_from = datetime.strptime(self.current_date_from, "%d.%m.%Y")
+        date_from, date_to = self.default_dates(analysis_type)
+        self.create_analysis(
+            analysis_type=analysis_type, date_from=date_from, date_to=date_to
+        )
 
-                date_to = datetime.strptime(
-                    self.last_operation_date, "%d.%m.%Y"
-                ) + relativedelta(day=31)
+    def default_dates(self, analysis_type):
+        """
+        Get default dates of analysis type
 
-                if analysis_type == "Prognosis":
-                    date_from = datetime.strptime(self.last_operation_date, "%d.%m.%Y")
+        Args:
+            analysis_type (str): type of analysis
 
-                    date_to = datetime.strptime(
-                        self.prognosis_date_to, "%d.%m.%Y"
-                    ) + relativedelta(day=31)
+        Returns:
+            tuple: date from and date to
+        """
+        if analysis_type == "Prognosis":
+            date_from = datetime.strptime(self.last_operation_date, "%d.%m.%Y")
 
-                self.create_analysis(
-                    analysis_type=analysis_type, date_from=date_from, date_to=date_to
-                )
+            date_to = datetime.strptime(
+                self.prognosis_date_to, "%d.%m.%Y"
+            ) + relativedelta(day=31)
+
+            return date_from, date_to
+
+        date_from = datetime.strptime(f"01.{self.date_from_edit.text()}", "%d.%m.%Y")
+        if self.current_date_from is not None:
+            date_from = datetime.strptime(self.current_date_from, "%d.%m.%Y")
+
+        # Balance is shown also for planned operations
+        date_to = datetime.strptime(
+            (
+                self.prognosis_date_to
+                if analysis_type == "Balance"
+                else self.last_operation_date
+            ),
+            "%d.%m.%Y",
+        ) + relativedelta(day=31)
+
+        return date_from, date_to
 
     def create_analysis(self, analysis_type=None, date_to=None, date_from=None):
         """
@@ -456,91 +731,365 @@ class AnalysisSection(QWidget):
             analysis_type = self.analysis_type_combo.currentText()
 
         if analysis_type in ["Categorical", "Aggregate"] and (
-            self.user_transactions is None or len(self.user_transactions) == 0
+            self.transactions_store.is_empty()
         ):
             msg = "Please add at least one transaction to analize date!"
             ErrorBox(self, title="No categories!", msg=msg)
             return
 
-        # Columns to get from databases
-        columns_to_get = ["1_name", "2_date", "4_type", "5_category", "6_amount"]
+        self.dirty_analyses.discard(analysis_type)
 
-        if not self.user_transactions is None and len(self.user_transactions) > 0:
-            # Prepare transactions database
-            transactions = (
-                pd.DataFrame(self.user_transactions)
-                .T.reset_index(drop=True)
-                .copy()[columns_to_get]
+        if date_from is None:
+            date_from = datetime.strptime(
+                f"01.{self.date_from_edit.text()}", "%d.%m.%Y"
             )
 
-            transactions["2_date"] = transactions["2_date"].apply(
-                lambda x: datetime.strptime(x, "%d.%m.%Y")
+        if date_to is None:
+            date_to = datetime.strptime(
+                f"01.{self.date_to_edit.text()}", "%d.%m.%Y"
+            ) + relativedelta(day=31)
+
+        # Analysis calculated before for the same parameters and data
+        # (categorical analysis has all categories, so category is not a parameter)
+        category = self.category_type_combo.currentText()
+        granularity = self.granularity_combo.currentText()
+        model = self.model_combo.currentText()
+        if model == "Monte Carlo":
+            granularity = "Monthly"
+
+        cache_key = (
+            analysis_type,
+            date_from,
+            date_to,
+            granularity if analysis_type == "Prognosis" else None,
+            model if analysis_type == "Prognosis" else None,
+        )
+        analysis = self.analysis_cache.get(cache_key, self.store_versions())
+
+        # Newer request supersedes calculation in progress
+        self.cancel_analysis(analysis_type)
+
+        if analysis is not None:
+            self.analysis_result = analysis
+            self.show_analysis(analysis_type)
+            return
+
+        # Data for analysis is taken from stores here and calculated in thread pool
+        self.last_request_id += 1
+        worker = AnalysisWorker(
+            self.last_request_id,
+            self.analysis_parameters(
+                analysis_type, date_from, date_to, category, granularity, model
+            ),
+            self.forecast_parameters(analysis_type, date_to, model),
+        )
+        worker.signals.finished.connect(self.analysis_finished)
+        worker.signals.failed.connect(self.analysis_failed)
+
+        self.analysis_requests[analysis_type] = {
+            "id": self.last_request_id,
+            "worker": worker,
+            "key": cache_key,
+            "versions": self.store_versions(),
+            "ranges": self.analysis_ranges(analysis_type, date_from, date_to),
+        }
+        self.thread_pool.start(worker)
+
+        self.update_busy_state()
+
+    def cancel_analysis(self, analysis_type):
+        """
+        Cancel calculation of analysis type in progress
+
+        Args:
+            analysis_type (str): type of analysis
+        """
+        request = self.analysis_requests.pop(analysis_type, None)
+        if request is None:
+            return
+
+        # Worker waiting in queue is removed, running worker will not emit result
+        worker = request.get("worker")
+        worker.cancel()
+        self.thread_pool.tryTake(worker)
+
+        self.update_busy_state()
+
+    def find_request(self, request_id):
+        """
+        Find analysis type of request in progress
+
+        Args:
+            request_id (int): number of analysis request
+
+        Returns:
+            str: analysis type or None if request was superseded
+        """
+        for analysis_type, request in self.analysis_requests.items():
+            if request.get("id") == request_id:
+                return analysis_type
+
+        return None
+
+    @Slot(int, object)
+    def analysis_finished(self, request_id, analysis):
+        """
+        Show analysis calculated in background (results of superseded requests are skipped)
+
+        Args:
+            request_id (int): number of analysis request
+            analysis (Analysis): analysis result
+        """
+        analysis_type = self.find_request(request_id)
+        if analysis_type is None:
+            return
+
+        request = self.analysis_requests.pop(analysis_type)
+
+        # Result is cached only if data was not changed during calculation
+        if request.get("versions") == self.store_versions():
+            # Forecast models updated in worker are kept for next prognosis
+            spending_forecast = request.get("worker").spending_forecast
+            if not spending_forecast is None:
+                self.spending_forecast = spending_forecast
+
+            self.analysis_cache.put(
+                request.get("key"),
+                request.get("versions"),
+                analysis,
+                request.get("ranges"),
             )
-            transactions["6_amount"] = transactions["6_amount"].apply(
-                lambda x: float(x.replace(",", ".").replace(" ", ""))
+
+        self.analysis_result = analysis
+        self.show_analysis(analysis_type)
+
+        self.update_busy_state()
+
+    @Slot(int, str)
+    def analysis_failed(self, request_id, msg):
+        """
+        Show error of analysis calculated in background
+
+        Args:
+            request_id (int): number of analysis request
+            msg (str): error message
+        """
+        analysis_type = self.find_request(request_id)
+        if analysis_type is None:
+            return
+
+        self.analysis_requests.pop(analysis_type)
+        self.update_busy_state()
+
+        ErrorBox(self, title="Analysis error!", msg=msg)
+
+    def update_busy_state(self):
+        """
+        Show if analyses are calculated
+        """
+        if self.analysis_requests:
+            self.calculate_btn.setText("Calculating...")
+            self.result_stack.setCursor(Qt.CursorShape.BusyCursor)
+        else:
+            self.calculate_btn.setText("Calculate")
+            self.result_stack.unsetCursor()
+
+    def analysis_ranges(self, analysis_type, date_from, date_to):
+        """
+        Ranges of days in stores which analysis depends on
+
+        Args:
+            analysis_type (str): type of analysis
+            date_from (datetime): analysis date from
+            date_to (datetime): analysis date to
+
+        Returns:
+            dict: store name and range of day ordinals (None as limit means no limit)
+        """
+        if analysis_type == "Prognosis":
+            # Account balance depends on all transactions
+            # and planned operations from start of prognosis
+            return {
+                "transactions": (None, None),
+                "upcomings": (None, date_to.toordinal()),
+            }
+
+        if analysis_type == "Balance":
+            # Starting balance depends on all transactions before date to,
+            # recurring planned operations can start before date from
+            return {
+                "transactions": (None, date_to.toordinal()),
+                "upcomings": (None, date_to.toordinal()),
+            }
+
+        # Monthly summary is read for whole months
+        return {
+            "transactions": (
+                (date_from + relativedelta(day=1)).toordinal(),
+                (date_to + relativedelta(day=31)).toordinal(),
+            ),
+            "upcomings": None,
+        }
+
+    def analysis_parameters(
+        self, analysis_type, date_from, date_to, category, granularity, model
+    ):
+        """
+        Get data for analysis of choosen type and dates.
+
+        Args:
+            analysis_type (str): type of analysis
+            date_from (datetime): analysis date from
+            date_to (datetime): analysis date to
+            category (str): main category for categorical analysis
+            granularity (str): prognosis periods
+            model (str): prognosis model
+
+        Returns:
+            dict: Analysis arguments
+        """
+        # Columns to get from databases
+        columns_to_get = ["1_name", "2_date", "4_type", "5_category", "6_amount"]
+
+        monthly_summary = None
+        if analysis_type in ["Categorical", "Aggregate"]:
+            # Monthly summary kept by store for analysis months
+            transactions = None
+            monthly_summary = self.transactions_store.monthly_summary.frame(
+                date_from.strftime("%Y-%m"), date_to.strftime("%Y-%m")
             )
+        elif analysis_type == "Balance":
+            # Transactions of every day in range
+            transactions = self.transactions_store.frame_between(
+                date_from, date_to, columns_to_get
+            ).reset_index(drop=True)
+        elif not self.transactions_store.is_empty():
+            # Prognosis needs only transactions from month of the latest transaction
+            last_date = datetime.fromordinal(self.transactions_store.last_date())
+            transactions = self.transactions_store.frame_between(
+                last_date + relativedelta(day=1),
+                last_date + relativedelta(day=31),
+                columns_to_get,
+            ).reset_index(drop=True)
         else:
             transactions = pd.DataFrame(columns=columns_to_get)
 
-        transaction_summary = transactions.copy().groupby(["4_type"])["6_amount"].sum()
+        if analysis_type == "Prognosis" and model == "Monte Carlo":
+            # Spendings are drawn from all months of monthly summary
+            monthly_summary = self.transactions_store.monthly_summary.frame()
+
+        # Account balance from running balance kept by store
+        balance_change = self.transactions_store.balance_change
+        if analysis_type == "Prognosis" and not self.transactions_store.is_empty():
+            # Prognosis starts from the latest transaction, so balance is taken as of its date
+            balance_change = self.transactions_store.balance_as_of(
+                self.transactions_store.last_date()
+            )
+        elif analysis_type == "Balance":
+            # Balance timeline starts from balance at the end of day before date from
+            balance_change = self.transactions_store.balance_as_of(
+                date_from.toordinal() - 1
+            )
 
-        income = (
-            0
-            if "Income" not in transaction_summary.index.values
-            else transaction_summary.loc["Income"]
-        )
-        expense = (
-            0
-            if "Expense" not in transaction_summary.index.values
-            else transaction_summary.loc["Expense"]
-        )
         curr_acc_bal = round(
-            self.current_acc_balance + (income - expense),
+            self.current_acc_balance + balance_change / 100,
             2,
         )
 
-        # Prepare upcomings database
+        # Prepare upcomings database (planned operations from prognosis start)
         upcomings = None
-        if not self.user_upcomings is None and len(self.user_upcomings) > 0:
-            upcomings = (
-                pd.DataFrame(self.user_upcomings)
-                .T.reset_index(drop=True)
-                .copy()[columns_to_get]
-            )
-
-            upcomings["2_date"] = upcomings["2_date"].apply(
-                lambda x: datetime.strptime(x, "%d.%m.%Y")
-            )
-            upcomings["6_amount"] = upcomings["6_amount"].apply(
-                lambda x: float(x.replace(",", ".").replace(" ", ""))
+        if analysis_type == "Prognosis" and not self.upcomings_store.is_empty():
+            prognosis_start = datetime.strptime(
+                self.last_operation_date, "%d.%m.%Y"
+            ) + relativedelta(day=1)
+            upcomings = self.upcomings_store.frame_between(
+                prognosis_start, date_to, columns_to_get
+            ).reset_index(drop=True)
+
+            if upcomings.empty:
+                upcomings = None
+        elif analysis_type == "Balance" and not self.upcomings_store.is_empty():
+            # Planned operations after the latest transaction
+            upcomings_from = max(
+                date_from,
+                datetime.strptime(self.last_operation_date, "%d.%m.%Y")
+                + relativedelta(days=1),
             )
+            if upcomings_from <= date_to:
+                upcomings = self.upcomings_store.frame_between(
+                    upcomings_from, date_to, columns_to_get
+                ).reset_index(drop=True)
+
+            if upcomings is not None and upcomings.empty:
+                upcomings = None
+
+        # Data to analyse
+        return {
+            "analysis_type": analysis_type,
+            "date_from": date_from,
+            "date_to": date_to,
+            "transactions": transactions,
+            "upcomings": upcomings,
+            "category": category,
+            "main_categories": self.main_categories(),
+            "account_balance": curr_acc_bal,
+            "average_revenue": self.monthly_net_salary,
+            "average_spendings": self.avg_monthly_expense,
+            "monthly_summary": monthly_summary,
+            "granularity": granularity,
+            "prognosis_model": model,
+            "paths": PROGNOSIS_PATHS,
+            "forecast_spendings": None,
+        }
+
+    def forecast_parameters(self, analysis_type, date_to, model):
+        """
+        Get data for update of spending forecast models in analysis worker
 
-        if date_from is None:
-            date_from = datetime.strptime(
-                f"01.{self.date_from_edit.text()}", "%d.%m.%Y"
-            )
+        Args:
+            analysis_type (str): type of analysis
+            date_to (datetime): analysis date to
+            model (str): prognosis model
 
-        if date_to is None:
-            date_to = datetime.strptime(
-                f"01.{self.date_to_edit.text()}", "%d.%m.%Y"
-            ) + relativedelta(day=31)
+        Returns:
+            dict: AnalysisWorker forecast arguments or None if forecast is not needed
+        """
+        if (
+            analysis_type != "Prognosis"
+            or model != "Forecast"
+            or self.transactions_store.is_empty()
+        ):
+            return None
 
-        # Analyse data
-        self.analysis_result = Analysis(
-            analysis_type=analysis_type,
-            date_from=date_from,
-            date_to=date_to,
-            transactions=transactions,
-            upcomings=upcomings,
-            category=self.category_type_combo.currentText(),
-            account_balance=curr_acc_bal,
-            average_revenue=self.monthly_net_salary,
-            average_spendings=self.avg_monthly_expense,
+        # Models are updated with months closed before month of last transaction
+        last_month = pd.Period(
+            datetime.fromordinal(self.transactions_store.last_date()), "M"
         )
 
+        return {
+            "model": self.spending_forecast.copy(),
+            "monthly_summary": self.transactions_store.monthly_summary.frame(
+                None, (last_month - 1).strftime("%Y-%m")
+            ),
+            "last_month": last_month - 1,
+            "months": len(pd.period_range(last_month, pd.Period(date_to, "M"))),
+        }
+
+    def show_analysis(self, analysis_type):
+        """
+        Show current analysis result in table and plot of its type
+
+        Args:
+            analysis_type (str): type of analysis
+        """
+        self.shown_analyses[analysis_type] = self.analysis_result
+
         # Set plot and table data to widgets
         match analysis_type:
             case "Categorical":
+                self.analysis_result.set_category(
+                    self.category_type_combo.currentText()
+                )
                 self.categorical_table.update_table(
                     self.analysis_result.get_data_to_table()
                 )
@@ -553,7 +1102,7 @@ class AnalysisSection(QWidget):
                     parent=self,
                     data=self.analysis_result.get_data_to_plot(),
                     title="Monthly expenses for category: {0}".format(
-                        self.category_type_combo.currentText()
+                        self.analysis_result.category
                     ),
                     legend=False,
                     x_label="Year - Month",
@@ -597,20 +1146,57 @@ class AnalysisSection(QWidget):
                 except AttributeError:
                     pass
 
-                self.prognosis_plot = BarChart(
+                data_to_plot = self.analysis_result.get_data_to_plot()
+                if self.analysis_result.prognosis_model == "Monte Carlo":
+                    # P10 - P90 band with median line over whole horizon
+                    self.prognosis_plot = LineChart(
+                        parent=self,
+                        data=data_to_plot,
+                        title="Projected account balance percentiles<sup>*</sup",
+                        legend=True,
+                        y_label="[{0}]".format(self.currency),
+                        colors=PROGNOSIS_COLORS,
+                        tootltip=CHART_TOOLTIPS.get(analysis_type),
+                        band=("P10", "P90"),
+                    )
+                else:
+                    self.prognosis_plot = BarChart(
+                        parent=self,
+                        data=data_to_plot,
+                        title="Projected account balance for the next 14 months<sup>*</sup",
+                        legend=False,
+                        x_label="Year - Month",
+                        y_label="[{0}]".format(self.currency),
+                        y_axis_visible=False,
+                        gridlines=False,
+                        colors={
+                            column: PROGNOSIS_COLORS.get(column, "#66b8ff")
+                            for column in data_to_plot.columns
+                        },
+                        tootltip=CHART_TOOLTIPS.get(analysis_type),
+                    )
+
+                self.prognosis_layout.addWidget(self.prognosis_plot, 2)
+                self.prognosis_layout.addWidget(self.prognosis_table, 1)
+
+            case "Balance":
+                self.balance_table.update_table(
+                    self.analysis_result.get_data_to_table()
+                )
+                try:
+                    self.balance_plot.deleteLater()
+                except AttributeError:
+                    pass
+
+                self.balance_plot = LineChart(
                     parent=self,
                     data=self.analysis_result.get_data_to_plot(),
-                    title="Projected account balance for the next 14 months<sup>*</sup",
+                    title="Daily account balance",
                     legend=False,
-                    x_label="Year - Month",
                     y_label="[{0}]".format(self.currency),
-                    y_axis_visible=False,
-                    gridlines=False,
-                    colors={
-                        self.analysis_result.get_data_to_plot().columns[0]: "#66b8ff"
-                    },
+                    colors={"Account balance": "#0085FC"},
                     tootltip=CHART_TOOLTIPS.get(analysis_type),
                 )
 
-                self.prognosis_layout.addWidget(self.prognosis_plot, 2)
-                self.prognosis_layout.addWidget(self.prognosis_table, 1)
+                self.balance_layout.addWidget(self.balance_plot, 2)
+                self.balance_layout.addWidget(self.balance_table, 1)
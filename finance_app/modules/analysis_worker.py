@@ -0,0 +1,76 @@
+from PySide6.QtCore import QObject, QRunnable, Signal, Slot
+
+from finance_app.modules.analysis_calculation import Analysis
+
+
+class AnalysisWorkerSignals(QObject):
+    """
+    Signals of analysis worker (QRunnable is not QObject, so it can not emit signals itself)
+    """
+
+    finished = Signal(int, object)  # request id, analysis result
+    failed = Signal(int, str)  # request id, error message
+
+
+class AnalysisWorker(QRunnable):
+    """
+    Analysis calculated in thread pool, so GUI thread is not blocked by pandas calculations.
+
+    Worker gets ready data (frames copied from stores), so it never reads stores changed by GUI thread.
+    Spending forecast models (copy) are updated by worker too and kept in it for section.
+    Request superseded by newer one is cancelled: it is not started or its result is not emitted.
+    """
+
+    def __init__(self, request_id, parameters, forecast=None):
+        """
+        Args:
+            request_id (int): number of analysis request
+            parameters (dict): Analysis arguments
+            forecast (dict, optional): SpendingForecast copy, monthly summary frame, last closed month
+                and number of months to forecast. Defaults to None (no forecast).
+        """
+        super().__init__()
+
+        self.request_id = request_id
+        self.parameters = parameters
+        self.forecast = forecast
+        self.spending_forecast = None  # updated models
+        self.cancelled = False
+
+        # Worker is kept by section until its result comes
+        self.setAutoDelete(False)
+
+        self.signals = AnalysisWorkerSignals()
+
+    def cancel(self):
+        """
+        Mark request as superseded
+        """
+        self.cancelled = True
+
+    @Slot()
+    def run(self):
+        """
+        Calculate analysis and emit its result
+        """
+        if self.cancelled:
+            return
+
+        try:
+            if not self.forecast is None:
+                self.spending_forecast = self.forecast.get("model")
+                self.spending_forecast.update(
+                    self.forecast.get("monthly_summary"), self.forecast.get("last_month")
+                )
+                self.parameters["forecast_spendings"] = self.spending_forecast.forecast(
+                    self.forecast.get("months")
+                )
+
+            analysis = Analysis(**self.parameters)
+        except Exception as error:
+            if not self.cancelled:
+                self.signals.failed.emit(self.request_id, str(error))
+            return
+
+        if not self.cancelled:
+            self.signals.finished.emit(self.request_id, analysis)
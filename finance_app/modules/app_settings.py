@@ -27,6 +27,7 @@ class AppSettings(QWidget):
         self.user_def_view = self.user_settings.get("DEFAULT_VIEW")
         self.user_def_analysis = self.user_settings.get("DEFAULT_ANALYSIS")
         self.user_auto_analysis = self.user_settings.get("ANALYSIS_AUTO_RUN")
+        self.user_storage_backend = self.user_settings.get("STORAGE_BACKEND", "JSON")
 
         # Variables
         self.validator = QDoubleValidator(bottom=0, decimals=2)
@@ -82,6 +83,24 @@ class AppSettings(QWidget):
             self.user_settings.get("DEFAULT_ANALYSIS")
         )
 
+        # Storage backend label
+        self.storage_backend_label = QLabel(self)
+        self.storage_backend_label.setText("Storage backend")
+        self.storage_backend_label.setContentsMargins(15, 0, 15, 0)
+        self.storage_backend_label.setStyleSheet("color: black; font-size: 10pt;")
+
+        # Storage backend entry
+        self.storage_backend_entry = QComboBox(self)
+        self.storage_backend_entry.setStyleSheet("padding: 5px;")
+        self.storage_backend_entry.addItems(STORAGE_BACKENDS)
+        self.storage_backend_entry.view().setVerticalScrollBarPolicy(
+            Qt.ScrollBarAsNeeded
+        )
+        self.storage_backend_entry.setCurrentText(self.user_storage_backend)
+        self.storage_backend_entry.setToolTip(
+            "Data is moved to choosen storage on next app start"
+        )
+
         # Auto analysis check
         self.auto_analysis_check = QCheckBox(self)
         self.auto_analysis_check.setText(
@@ -138,12 +157,17 @@ class AppSettings(QWidget):
         main_layout.addWidget(self.def_analysis_entry, 1, 1)
 
         main_layout.addWidget(
-            self.auto_analysis_check, 2, 0, 1, 2, alignment=Qt.AlignmentFlag.AlignCenter
+            self.storage_backend_label, 2, 0, alignment=Qt.AlignmentFlag.AlignCenter
         )
+        main_layout.addWidget(self.storage_backend_entry, 2, 1)
 
-        main_layout.addItem(self.spacer, 3, 0, 1, 2)
+        main_layout.addWidget(
+            self.auto_analysis_check, 3, 0, 1, 2, alignment=Qt.AlignmentFlag.AlignCenter
+        )
 
-        main_layout.addLayout(btn_layout, 4, 0, 1, 2)
+        main_layout.addItem(self.spacer, 4, 0, 1, 2)
+
+        main_layout.addLayout(btn_layout, 5, 0, 1, 2)
 
     def save_event(self):
         """
@@ -160,6 +184,9 @@ class AppSettings(QWidget):
         if int(self.auto_analysis_check.isChecked()) != self.user_auto_analysis:
             send_signal = True
 
+        if self.storage_backend_entry.currentText() != self.user_storage_backend:
+            send_signal = True
+
         if send_signal and not self.active:
             user_settings_dict = self.user_settings
 
@@ -174,6 +201,10 @@ class AppSettings(QWidget):
                 self.auto_analysis_check.isChecked()
             )
 
+            user_settings_dict["STORAGE_BACKEND"] = (
+                self.storage_backend_entry.currentText()
+            )
+
             with open(self.user_settings_path, "w") as file:
                 json.dump(user_settings_dict, file)
 
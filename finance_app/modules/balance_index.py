@@ -0,0 +1,96 @@
+class BalanceIndex:
+    """
+    Fenwick tree (binary indexed tree) with daily sums of transactions amounts in minor units.
+
+    Tree covers continuous range of day ordinals, so account balance change as of any date is a prefix sum
+    counted in O(log n). Adding amount is O(log n) too, only date out of range rebuilds the tree with margin.
+    """
+
+    # Days added on both sides of range when tree is rebuilt
+    DAYS_MARGIN = 366
+
+    def __init__(self):
+        self.first_day = 0
+        self.tree = [0]  # Fenwick tree is indexed from 1
+        self.day_sums = {}
+
+    def load(self, day_sums):
+        """
+        Replace all amounts in tree
+
+        Args:
+            day_sums (dict): day ordinal and sum of amounts
+        """
+        self.day_sums = {day: amount for day, amount in day_sums.items() if amount}
+        self.rebuild()
+
+    def add(self, day, amount):
+        """
+        Add amount to day (negative amount to subtract it)
+
+        Args:
+            day (int): day ordinal
+            amount (int): amount in minor units
+        """
+        day_sum = self.day_sums.get(day, 0) + amount
+        if day_sum == 0:
+            self.day_sums.pop(day, None)
+        else:
+            self.day_sums[day] = day_sum
+
+        position = day - self.first_day + 1
+        if position < 1 or position >= len(self.tree):
+            self.rebuild(day)
+            return
+
+        while position < len(self.tree):
+            self.tree[position] += amount
+            position += position & -position
+
+    def rebuild(self, day=None):
+        """
+        Build tree from day sums in O(n) with range covering all days
+
+        Args:
+            day (int, optional): day which also has to be in range. Defaults to None.
+        """
+        days = list(self.day_sums.keys())
+        if day is not None:
+            days.append(day)
+
+        if len(days) == 0:
+            self.first_day = 0
+            self.tree = [0]
+            return
+
+        self.first_day = min(days) - self.DAYS_MARGIN
+        size = max(days) - self.first_day + 1 + self.DAYS_MARGIN
+
+        self.tree = [0] * (size + 1)
+        for day, amount in self.day_sums.items():
+            self.tree[day - self.first_day + 1] += amount
+
+        # Every node adds its sum to parent
+        for position in range(1, len(self.tree)):
+            parent = position + (position & -position)
+            if parent < len(self.tree):
+                self.tree[parent] += self.tree[position]
+
+    def balance_as_of(self, day):
+        """
+        Sum of amounts from all days before and on day
+
+        Args:
+            day (int): day ordinal
+
+        Returns:
+            int: sum of amounts in minor units
+        """
+        position = min(day - self.first_day + 1, len(self.tree) - 1)
+
+        result = 0
+        while position > 0:
+            result += self.tree[position]
+            position -= position & -position
+
+        return result
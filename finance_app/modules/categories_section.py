@@ -205,15 +205,11 @@ class CategoriesSection(QWidget):
             row (int): row of category in table
             columns (int): column of ctaegory in table
         """
-        tr_number = (
-            self.user_categories_table.cellWidget(row, 0)
-            .findChild(QCheckBox)
-            .get_hidden_property()
-        )
-        name = self.user_categories_table.item(row, 4).text()
-        main_category = self.user_categories_table.item(row, 1).text()
-        subcategory = self.user_categories_table.item(row, 2).text()
-        def_oper_type = self.user_categories_table.item(row, 3).text()
+        tr_number = self.user_categories_table.get_row_id(row)
+        name = self.user_categories_table.get_value(row, 4)
+        main_category = self.user_categories_table.get_value(row, 1)
+        subcategory = self.user_categories_table.get_value(row, 2)
+        def_oper_type = self.user_categories_table.get_value(row, 3)
 
         self.category_edit = EditCategory(
             number=tr_number,
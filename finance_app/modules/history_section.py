@@ -6,6 +6,7 @@ import pandas as pd
 from datetime import datetime
 
 from finance_app.config import *
+from finance_app.utils import format_operation, parse_amount, parse_date
 from finance_app.modules import TableWidget, EditTransaction, ErrorBox, LineEdit
 
 
@@ -22,21 +23,25 @@ class HistorySection(QWidget):
         self,
         current_acc_balance,
         currency,
-        user_transactions,
+        transactions_store,
         user_transactions_path,
         user_categories,
+        database=None,
     ):
         super().__init__()
 
         # User data
+        self.database = database
         self.current_acc_balance = current_acc_balance
         self.currency = currency
-        self.user_transactions = user_transactions
+        self.transactions_store = transactions_store
         self.user_transactions_path = user_transactions_path
         self.user_categories = user_categories
 
         self.recent_oper_num = (
-            7 if self.user_transactions is None else len(self.user_transactions.keys())
+            7
+            if self.transactions_store.operations is None
+            else len(self.transactions_store)
         )
 
         self.row_nums = 12
@@ -46,6 +51,11 @@ class HistorySection(QWidget):
 
         self.init_section()
 
+        # Patch table rows on every change in store
+        self.transactions_store.row_inserted.connect(self.operation_inserted)
+        self.transactions_store.row_updated.connect(self.operation_updated)
+        self.transactions_store.row_deleted.connect(self.operation_deleted)
+
     def init_section(self):
         """
         Initialize section
@@ -126,11 +136,12 @@ class HistorySection(QWidget):
                 "Notosans",
                 10,
             ),
-            data=pd.DataFrame(self.user_transactions).T.reset_index(drop=True),
+            data=self.transactions_store.display(OPERATION_FIELDS),
             sorting=False,
             filtering=True,
             editable=False,
             id_column=True,
+            query_filter=None if self.database is None else self.query_filter,
         )
         self.user_operations_table.cellDoubleClicked.connect(self.show_transaction)
 
@@ -150,7 +161,7 @@ class HistorySection(QWidget):
         self.search_box.setMinimumHeight(40)
         self.search_box.setMinimumWidth(200)
         self.search_box.setVisible(self.search_box_visible)
-        self.search_box.textChanged.connect(self.user_operations_table.filter)
+        self.search_box.textChanged.connect(self.user_operations_table.search)
 
         # Spacer for button layout
         self.spacer = QSpacerItem(2, 2, QSizePolicy.Expanding, QSizePolicy.Fixed)
@@ -180,22 +191,95 @@ class HistorySection(QWidget):
 
         self.search_box.setVisible(self.search_box_visible)
 
-    def update_operations(self, data):
+    def update_operations(self):
         """
         Update dara in table
-
-        Args:
-            data (dict): data to update in table
         """
-        self.user_transactions = data
-
-        updated_df = pd.DataFrame(data).T.reset_index(drop=True)
+        updated_df = self.transactions_store.display(OPERATION_FIELDS)
         self.user_operations_table.clear_table()
 
-        if len(self.user_transactions) > 0:
+        if not self.transactions_store.is_empty():
             updated_df.columns = RECENT_OPERATIONS_HEADERS
             self.user_operations_table.update_table(updated_df)
 
+    @Slot(str)
+    def operation_inserted(self, key):
+        """
+        Add row with new operation at the end of table
+
+        Args:
+            key (str): operation id
+        """
+        # Table of empty store has no operation rows
+        if len(self.transactions_store) == 1:
+            self.update_operations()
+            return
+
+        self.user_operations_table.insert_row(
+            self.user_operations_table.rowCount(),
+            format_operation(self.transactions_store.get(key), OPERATION_FIELDS),
+            key,
+        )
+
+    @Slot(str, dict)
+    def operation_updated(self, key, old_record):
+        """
+        Update row of changed operation
+
+        Args:
+            key (str): operation id
+            old_record (dict): operation values before update
+        """
+        self.user_operations_table.update_row(
+            key, format_operation(self.transactions_store.get(key), OPERATION_FIELDS)
+        )
+
+    @Slot(str, dict)
+    def operation_deleted(self, key, old_record):
+        """
+        Remove row of deleted operation
+
+        Args:
+            key (str): operation id
+            old_record (dict): deleted operation values
+        """
+        if self.transactions_store.is_empty():
+            self.update_operations()
+            return
+
+        self.user_operations_table.remove_row(key)
+
+    def query_filter(self, keywords):
+        """
+        Get table rows matching header filters with indexed query in database.
+
+        Args:
+            keywords (dict): table column and list of checked values
+
+        Returns:
+            set: ids of transactions to show
+        """
+        # Table columns (first one is id column) and database columns
+        db_columns = {
+            1: "name",
+            2: "date",
+            3: "vendor",
+            4: "type",
+            5: "category",
+            6: "amount",
+        }
+
+        filters = {}
+        for column, values in keywords.items():
+            match db_columns.get(column):
+                case "date":
+                    values = [parse_date(value) for value in values]
+                case "amount":
+                    values = [parse_amount(value) for value in values]
+            filters[db_columns.get(column)] = values
+
+        return self.database.filter_keys("transactions", filters)
+
     def show_transaction(self, row, columns):
         """
         Showing choosen transaction for user.
@@ -205,24 +289,22 @@ class HistorySection(QWidget):
             columns (int): _description_
         """
         # Get transaction data from table
-        tr_number = (
-            self.user_operations_table.cellWidget(row, 0)
-            .findChild(QCheckBox)
-            .get_hidden_property()
-        )
-        name = self.user_operations_table.item(row, 1).text()
-        date = self.user_operations_table.item(row, 2).text().split("-")
-        date = "{0}.{1}.{2}".format(date[2], date[1], date[0])
-        seller = self.user_operations_table.item(row, 3).text()
-        type = self.user_operations_table.item(row, 4).text()
-        category = self.user_operations_table.item(row, 5).text()
-        amount = self.user_operations_table.item(row, 6).data(
-            Qt.ItemDataRole.UserRole + 1
+        tr_number = self.user_operations_table.get_row_id(row)
+        name = self.user_operations_table.get_value(row, 1)
+        date = self.user_operations_table.get_value(row, 2)
+        seller = self.user_operations_table.get_value(row, 3)
+        type = self.user_operations_table.get_value(row, 4)
+        category = self.user_operations_table.get_value(row, 5)
+        amount = (
+            self.user_operations_table
+            .model()
+            .index(row, 6)
+            .data(Qt.ItemDataRole.UserRole + 1)
         )
 
         # Choosen transaction window
         self.transaction_edit = EditTransaction(
-            number=tr_number,
+            operation_id=tr_number,
             name=name,
             date=date,
             seller=seller,
@@ -277,7 +359,7 @@ class HistorySection(QWidget):
         """
         Method for exporting data to csv or excel to user choosen path.
         """
-        oper_to_export = self.user_transactions
+        oper_to_export = self.transactions_store.operations
 
         # Check if there are any selected operations
         if self.delete_btn.isVisible():
@@ -297,7 +379,7 @@ class HistorySection(QWidget):
                     oper_to_export = {}
 
                     for tr_num in selected_rows:
-                        temp_transaction = self.user_transactions.get(str(tr_num))
+                        temp_transaction = self.transactions_store.get(str(tr_num))
 
                         oper_to_export[str(tr_num)] = temp_transaction
 
@@ -319,7 +401,11 @@ class HistorySection(QWidget):
                 file_path += "." + extension
 
             # Data prep (to dataframe)
-            data_to_save = pd.DataFrame(oper_to_export).T.reset_index(drop=False)
+            data_to_save = (
+                self.transactions_store.display(OPERATION_FIELDS)
+                .loc[list(oper_to_export.keys())]
+                .reset_index(drop=False)
+            )
             data_to_save.columns = ["Operation number"] + [
                 col.replace("\n", " ") for col in RECENT_OPERATIONS_HEADERS
             ]
@@ -373,7 +459,7 @@ class HistorySection(QWidget):
             # Create transation dicts
             selected_tr_dict = {}
             for tr_num in selected_rows:
-                temp_transaction = self.user_transactions.get(str(tr_num))
+                temp_transaction = self.transactions_store.get(str(tr_num))
 
                 selected_tr_dict[str(tr_num)] = temp_transaction
 
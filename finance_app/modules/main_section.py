@@ -4,10 +4,12 @@ from PySide6.QtWidgets import *
 import json
 import pandas as pd
 from datetime import datetime
+from itertools import islice
 
 
 from finance_app.config import *
 from finance_app.modules import BarChart, TableWidget
+from finance_app.utils import format_operation
 
 
 class MainSection(QWidget):
@@ -22,31 +24,20 @@ class MainSection(QWidget):
     def __init__(
         self,
         user_settings,
-        user_transactions,
+        transactions_store,
         user_transactions_path,
-        user_upcomings,
+        upcomings_store,
         user_upcomings_path,
     ) -> None:
         super().__init__()
 
         # User data
         self.user_settings = user_settings
-        self.user_transactions = user_transactions
+        self.transactions_store = transactions_store
         self.user_transactions_path = user_transactions_path
-        self.user_upcomings = user_upcomings
+        self.upcomings_store = upcomings_store
         self.user_upcomings_path = user_upcomings_path
 
-        self.user_upcomings_df = pd.DataFrame(self.user_upcomings).T.reset_index(
-            drop=True
-        )
-        self.user_upcomings_df = self.user_upcomings_df[
-            [
-                col
-                for col in self.user_upcomings_df.columns
-                if not "vendor" in col and not "type" in col
-            ]
-        ]
-
         # User information
         self.user_name = self.user_settings.get("USER_NAME")
         self.current_acc_balance = self.user_settings.get("CURRENT_ACCOUNT_BALANCE")
@@ -58,27 +49,27 @@ class MainSection(QWidget):
 
         self.recent_oper_num = (
             7
-            if self.user_transactions is None
-            else (
-                len(self.user_transactions.keys())
-                if len(self.user_transactions.keys()) < 30
-                else 30
-            )
+            if self.transactions_store.operations is None
+            else min(len(self.transactions_store), 30)
         )
         self.upcoming_oper_num = (
             7
-            if self.user_upcomings is None
-            else (
-                len(self.user_upcomings.keys())
-                if len(self.user_upcomings.keys()) < 30
-                else 30
-            )
+            if self.upcomings_store.operations is None
+            else min(len(self.upcomings_store), 30)
         )
 
         self.plot_check = False
 
         self.init_section()
 
+        # Patch tables and plot on every change in stores
+        self.transactions_store.row_inserted.connect(self.transaction_inserted)
+        self.transactions_store.row_updated.connect(self.transaction_updated)
+        self.transactions_store.row_deleted.connect(self.transaction_deleted)
+        self.upcomings_store.row_inserted.connect(self.upcoming_inserted)
+        self.upcomings_store.row_updated.connect(self.upcoming_updated)
+        self.upcomings_store.row_deleted.connect(self.upcoming_deleted)
+
     def init_section(self):
         """
         Initialize section
@@ -112,7 +103,7 @@ class MainSection(QWidget):
         self.summary_layout.addWidget(
             self.curr_acc_label, 0  # , alignment=Qt.AlignmentFlag.AlignCenter
         )
-        if not self.user_transactions is None:
+        if not self.transactions_store.operations is None:
             self.calculate_plot_data()
 
         # Table layout
@@ -144,11 +135,9 @@ class MainSection(QWidget):
                 "Notosans",
                 10,
             ),
-            data=pd.DataFrame(self.user_transactions)
-            .T.reset_index(drop=True)
-            .sort_index(ascending=False)
-            .reset_index(drop=True)
-            .iloc[: self.recent_oper_num],
+            data=self.transactions_store.display(OPERATION_FIELDS).iloc[
+                : -self.recent_oper_num - 1 : -1
+            ],
             editable=False,
             sorting=True,
         )
@@ -184,7 +173,9 @@ class MainSection(QWidget):
                 "Notosans",
                 10,
             ),
-            data=self.user_upcomings_df.iloc[: self.upcoming_oper_num],
+            data=self.upcomings_store.display(PLANNED_OPERATIONS_FIELDS).iloc[
+                : self.upcoming_oper_num
+            ],
             editable=False,
             sorting=True,
         )
@@ -201,106 +192,176 @@ class MainSection(QWidget):
         main_layout.addLayout(self.summary_layout, 1)
         main_layout.addLayout(table_layout, 2)
 
-    def update_operations(self, data, type):
+    def update_operations(self, type):
         """
-        Update data in table and on on the plot
-
+        Update data in table and on on the plot.
+        Only the last operations shown in table are formatted.
 
         Args:
-            data (dict): transaction
             type (str): type of operations
         """
-        data_frame = (
-            pd.DataFrame(data)
-            .T.reset_index(drop=True)
-            .sort_index(ascending=False)
-            .reset_index(drop=True)
-        )
-
         match type:
             case "Upcoming":
-                self.user_upcomings = data
-                data_frame = data_frame[
-                    [
-                        col
-                        for col in data_frame.columns
-                        if not "vendor" in col and not "type" in col
-                    ]
-                ]
-
                 self.planned_oper_table.clear_table()
-                if len(self.user_upcomings) > 0:
-                    data_frame.columns = PLANNED_OPERATIONS_HEADERS
+                if not self.upcomings_store.is_empty():
                     self.planned_oper_table.update_table(
-                        data_frame.iloc[:7],
+                        self.last_operations(
+                            self.upcomings_store,
+                            PLANNED_OPERATIONS_FIELDS,
+                            PLANNED_OPERATIONS_HEADERS,
+                            7,
+                        )
                     )
             case _:
-                self.user_transactions = data
                 self.recent_oper_table.clear_table()
-
-                if len(self.user_transactions) > 0:
-                    data_frame.columns = RECENT_OPERATIONS_HEADERS
+                if not self.transactions_store.is_empty():
                     self.recent_oper_table.update_table(
-                        data_frame.iloc[:30],
+                        self.last_operations(
+                            self.transactions_store,
+                            OPERATION_FIELDS,
+                            RECENT_OPERATIONS_HEADERS,
+                            30,
+                        )
                     )
 
-        self.calculate_plot_data()
+                self.calculate_plot_data()
 
-    def calculate_plot_data(self):
+    def last_operations(self, store, fields, headers, number):
         """
-        Method for calculating data for plot and then displaying it on the screen
+        Get last operations from store formatted for table (newest first)
+
+        Args:
+            store (TransactionStore): operations store
+            fields (list): operation fields to show
+            headers (list): table headers
+            number (int): number of operations
+
+        Returns:
+            pandas.DataFrame: formatted operations indexed by operation id
         """
-        if not self.user_transactions is None and len(self.user_transactions) > 0:
-            # Columns to get from databases
-            columns_to_get = ["1_name", "2_date", "4_type", "5_category", "6_amount"]
-
-            # Prepare transactions database
-            transactions = (
-                pd.DataFrame(self.user_transactions)
-                .T.reset_index(drop=True)
-                .copy()[columns_to_get]
-            )
+        keys = list(islice(reversed(store.operations), number))
 
-            transactions["2_date"] = transactions["2_date"].apply(
-                lambda x: datetime.strptime(x, "%d.%m.%Y")
-            )
-            transactions["6_amount"] = transactions["6_amount"].apply(
-                lambda x: float(x.replace(",", ".").replace(" ", ""))
-            )
+        return pd.DataFrame(
+            [format_operation(store.get(key), fields) for key in keys],
+            index=keys,
+            columns=headers,
+        )
 
-            transactions["Year-month"] = transactions["2_date"].apply(
-                lambda x: x.strftime("%Y-%m")
-            )
+    @Slot(str)
+    def transaction_inserted(self, key):
+        """
+        Add new transaction to recent operations and plot
 
-            transactions = (
-                transactions.groupby(["Year-month", "4_type"])["6_amount"]
-                .sum()
-                .reset_index(drop=False)
-            )
+        Args:
+            key (str): transaction id
+        """
+        self.update_operations("Transaction")
 
-            # Prepare expenses
-            expense = transactions[transactions["4_type"] == "Expense"].drop(
-                "4_type", axis=1
-            )
-            expense.columns = ["Year-month", "Expense"]
+    @Slot(str, dict)
+    def transaction_updated(self, key, old_record):
+        """
+        Update transaction row (if shown) and plot
+
+        Args:
+            key (str): transaction id
+            old_record (dict): transaction values before update
+        """
+        record = self.transactions_store.get(key)
+        self.recent_oper_table.update_row(
+            key, format_operation(record, OPERATION_FIELDS)
+        )
 
-            # Prepare Income
-            income = transactions[transactions["4_type"] == "Income"].drop(
-                "4_type", axis=1
+        # Plot changes only with date, type or amount
+        if any(
+            record.get(field) != old_record.get(field)
+            for field in ["2_date", "4_type", "6_amount"]
+        ):
+            self.calculate_plot_data()
+
+    @Slot(str, dict)
+    def transaction_deleted(self, key, old_record):
+        """
+        Remove transaction from recent operations (if shown) and plot
+
+        Args:
+            key (str): transaction id
+            old_record (dict): deleted transaction values
+        """
+        if (
+            self.recent_oper_table.find_row(key) != -1
+            or self.transactions_store.is_empty()
+        ):
+            self.update_operations("Transaction")
+        else:
+            self.calculate_plot_data()
+
+    @Slot(str)
+    def upcoming_inserted(self, key):
+        """
+        Add new upcoming to planned operations
+
+        Args:
+            key (str): upcoming id
+        """
+        self.update_operations("Upcoming")
+
+    @Slot(str, dict)
+    def upcoming_updated(self, key, old_record):
+        """
+        Update upcoming row (if shown)
+
+        Args:
+            key (str): upcoming id
+            old_record (dict): upcoming values before update
+        """
+        self.planned_oper_table.update_row(
+            key,
+            format_operation(
+                self.upcomings_store.get(key), PLANNED_OPERATIONS_FIELDS
+            ),
+        )
+
+    @Slot(str, dict)
+    def upcoming_deleted(self, key, old_record):
+        """
+        Remove upcoming from planned operations (if shown)
+
+        Args:
+            key (str): upcoming id
+            old_record (dict): deleted upcoming values
+        """
+        if (
+            self.planned_oper_table.find_row(key) != -1
+            or self.upcomings_store.is_empty()
+        ):
+            self.update_operations("Upcoming")
+
+    def calculate_plot_data(self):
+        """
+        Method for calculating data for plot and then displaying it on the screen
+        """
+        months = self.transactions_store.monthly_summary.months()
+
+        if len(months) > 0:
+            # Last 3 months with transactions from monthly summary
+            months = months[-3:]
+            summary = self.transactions_store.monthly_summary.frame(
+                months[0], months[-1]
             )
-            income.columns = ["Year-month", "Income"]
 
             # Prepare result table
-            result_table = transactions["Year-month"].drop_duplicates()
-            result_table = pd.merge(
-                left=result_table, right=income, how="left", on="Year-month"
+            result_table = (
+                summary.groupby(["Year-month", "4_type"])["6_amount"]
+                .sum()
+                .unstack()
+                .reindex(index=months, columns=["Income", "Expense"])
+                .fillna(0)
             )
-            result_table = pd.merge(
-                left=result_table, right=expense, how="left", on="Year-month"
-            ).fillna(0)
+            result_table.columns.name = None
 
-            result_table.index = result_table["Year-month"]
-            result_table = result_table.iloc[-3:].drop("Year-month", axis=1)
+            # Update values of present plot
+            if self.plot_check and self.aggregate_plot.update_data(result_table):
+                return
 
             # Deleting plot widget
             if self.plot_check:
@@ -0,0 +1,212 @@
+import numpy as np
+import pandas as pd
+from datetime import date, datetime
+from dateutil.relativedelta import relativedelta
+
+from finance_app.config import RECURRING_PERIODS
+
+# Columns of detected recurring operations
+RECURRING_COLUMNS = [
+    "1_name",
+    "2_date",
+    "3_vendor",
+    "4_type",
+    "5_category",
+    "6_amount",
+    "Period",
+    "Occurrences",
+]
+
+
+class RecurringDetector:
+    """
+    Detector of operations repeated every week, month or year.
+
+    Operations are grouped by name, vendor and type and split into groups of similar amounts,
+    then intervals between dates are counted in one pass over operations sorted by group and date.
+    Group is recurring if most of its intervals are close to the same period and it is still active.
+    """
+
+    # Relative difference of amounts in one group
+    AMOUNT_TOLERANCE = 0.1
+
+    # Minimal number of operations in recurring group
+    MIN_OCCURRENCES = 3
+
+    # Minimal share of intervals close to period
+    REGULAR_SHARE = 0.8
+
+    def detect(self, operations, planned=None):
+        """
+        Find recurring operations and their next dates
+
+        Args:
+            operations (dict): operations
+            planned (dict, optional): planned operations, recurring operations which are already planned
+                after their last occurrence are skipped. Defaults to None.
+
+        Returns:
+            pandas.DataFrame: recurring operations (RECURRING_COLUMNS) with next date as day ordinal
+        """
+        if not operations:
+            return pd.DataFrame(columns=RECURRING_COLUMNS)
+
+        records = list(operations.values())
+        frame = pd.DataFrame(
+            {
+                "name_key": [record.get("1_name").strip().lower() for record in records],
+                "vendor_key": [
+                    record.get("3_vendor").strip().lower() for record in records
+                ],
+                "4_type": [record.get("4_type") for record in records],
+                "day": np.array([record.get("2_date") for record in records]),
+                "amount": np.array([record.get("6_amount") for record in records]),
+                "position": np.arange(len(records)),
+            }
+        )
+        group = frame.groupby(
+            ["name_key", "vendor_key", "4_type"], sort=False
+        ).ngroup().to_numpy()
+
+        # Similar amounts of group: sorted amounts without jump bigger than tolerance
+        order = np.lexsort((frame["amount"].to_numpy(), group))
+        amounts = frame["amount"].to_numpy()[order]
+        new_cluster = np.ones(len(order), dtype=bool)
+        new_cluster[1:] = (group[order][1:] != group[order][:-1]) | (
+            np.abs(amounts[1:]) > np.abs(amounts[:-1]) * (1 + self.AMOUNT_TOLERANCE)
+        )
+        cluster = np.empty(len(order), dtype=np.int64)
+        cluster[order] = np.cumsum(new_cluster)
+
+        # Intervals between dates of cluster
+        order = np.lexsort((frame["day"].to_numpy(), cluster))
+        frame = frame.iloc[order].reset_index(drop=True)
+        frame["cluster"] = cluster[order]
+        same_cluster = frame["cluster"].eq(frame["cluster"].shift())
+        frame["interval"] = frame["day"].diff().where(same_cluster)
+
+        clusters = frame.groupby("cluster").agg(
+            count=("day", "size"),
+            median_interval=("interval", "median"),
+            last_day=("day", "max"),
+            amount=("amount", "median"),
+            position=("position", "last"),
+        )
+        clusters = clusters[clusters["count"] >= self.MIN_OCCURRENCES]
+
+        # Period of cluster by median interval
+        clusters["Period"] = None
+        clusters["period_days"] = np.nan
+        for period, (days, tolerance) in RECURRING_PERIODS.items():
+            matches = (clusters["median_interval"] - days).abs() <= tolerance
+            clusters.loc[matches, "Period"] = period
+            clusters.loc[matches, "period_days"] = days
+        clusters = clusters[clusters["Period"].notna()]
+
+        # Share of intervals close to period of their cluster
+        tolerances = {days: tolerance for days, tolerance in RECURRING_PERIODS.values()}
+        intervals = frame[frame["cluster"].isin(clusters.index)].join(
+            clusters["period_days"], on="cluster"
+        )
+        intervals["regular"] = (
+            intervals["interval"] - intervals["period_days"]
+        ).abs() <= intervals["period_days"].map(tolerances)
+        regular_share = (
+            intervals[intervals["interval"].notna()]
+            .groupby("cluster")["regular"]
+            .mean()
+        )
+        clusters = clusters[regular_share.reindex(clusters.index) >= self.REGULAR_SHARE]
+
+        # Only clusters with occurrence in last two periods are active
+        last_day = frame["day"].max()
+        clusters = clusters[
+            clusters["last_day"] >= last_day - 2 * clusters["period_days"]
+        ]
+
+        return self.proposals(records, clusters, last_day, planned)
+
+    def proposals(self, records, clusters, last_day, planned):
+        """
+        Create recurring operations with next date after the latest operation
+
+        Args:
+            records (list): operations values
+            clusters (pandas.DataFrame): recurring clusters
+            last_day (int): day ordinal of the latest operation
+            planned (dict): planned operations or None
+
+        Returns:
+            pandas.DataFrame: recurring operations
+        """
+        # Last planned dates of every name and vendor
+        planned_days = {}
+        for record in (planned or {}).values():
+            key = (
+                record.get("1_name").strip().lower(),
+                record.get("3_vendor").strip().lower(),
+            )
+            planned_day = record.get("2_date")
+
+            # Recurring operation is planned until its end
+            recurrence = record.get("7_recurrence")
+            if recurrence:
+                planned_day = recurrence.get("until") or date.max.toordinal()
+
+            planned_days[key] = max(planned_days.get(key, 0), planned_day)
+
+        rows = []
+        for cluster in clusters.itertuples():
+            # The latest operation of cluster gives name, vendor and category
+            record = records[cluster.position]
+
+            next_date = self.next_date(cluster.last_day, cluster.Period)
+            while next_date.toordinal() <= last_day:
+                next_date = self.next_date(next_date.toordinal(), cluster.Period)
+
+            key = (
+                record.get("1_name").strip().lower(),
+                record.get("3_vendor").strip().lower(),
+            )
+            if planned_days.get(key, 0) > cluster.last_day:
+                continue
+
+            rows.append(
+                [
+                    record.get("1_name"),
+                    next_date.toordinal(),
+                    record.get("3_vendor"),
+                    record.get("4_type"),
+                    record.get("5_category"),
+                    int(round(cluster.amount)),
+                    cluster.Period,
+                    cluster.count,
+                ]
+            )
+
+        result = pd.DataFrame(rows, columns=RECURRING_COLUMNS)
+        result = result.sort_values("2_date", kind="stable").reset_index(drop=True)
+        result.index = result.index.astype(str)
+
+        return result
+
+    def next_date(self, day, period):
+        """
+        Get next date of period
+
+        Args:
+            day (int): day ordinal
+            period (str): name of period from RECURRING_PERIODS
+
+        Returns:
+            datetime: next date
+        """
+        current = datetime.fromordinal(int(day))
+
+        match period:
+            case "Weekly":
+                return current + relativedelta(weeks=1)
+            case "Monthly":
+                return current + relativedelta(months=1)
+            case _:
+                return current + relativedelta(years=1)
@@ -320,6 +320,7 @@ class SignInWindow(QWidget):
             "DEFAULT_VIEW": "Home",
             "DEFAULT_ANALYSIS": "Categorical",
             "ANALYSIS_AUTO_RUN": 0,
+            "STORAGE_BACKEND": "JSON",
         }
 
         # Save user information to settings folder
@@ -0,0 +1,211 @@
+import copy
+import numpy as np
+import pandas as pd
+from datetime import date
+
+
+class SpendingForecast:
+    """
+    Seasonal exponential smoothing (additive Holt-Winters with damped trend) of monthly spendings of every category.
+
+    Models are fitted once from monthly summary of closed months (months before month of last transaction).
+    When next months close, only smoothing steps of new months are made. Initial level and seasonal
+    values come from first season, so models are fitted again until first season is complete.
+    Change in already smoothed month marks models as outdated, so they are fitted again on next update.
+    Models are updated on copy in analysis worker (from summary frame), so fitting does not block GUI.
+    """
+
+    # Smoothing parameters
+    LEVEL_SMOOTHING = 0.3
+    TREND_SMOOTHING = 0.05
+    SEASONAL_SMOOTHING = 0.2
+    TREND_DAMPING = 0.9
+
+    # Months in season
+    SEASON_LENGTH = 12
+
+    def __init__(self):
+        self.categories = []
+        self.last_month = None  # Last smoothed month (pandas.Period)
+        self.months = 0  # Number of smoothed months
+        self.outdated = True
+
+        # Model state of every category
+        self.level = None
+        self.trend = None
+        self.seasonal = None  # Month of year x category
+
+    def copy(self):
+        """
+        Copy of models (updated in analysis worker while GUI can invalidate original)
+
+        Returns:
+            SpendingForecast: copied models
+        """
+        return copy.deepcopy(self)
+
+    def invalidate(self, day):
+        """
+        Mark models as outdated if operation from smoothed month was changed
+
+        Args:
+            day (int): day ordinal of changed operation
+        """
+        month = pd.Period(date.fromordinal(day), "M")
+        if self.last_month is not None and month <= self.last_month:
+            self.outdated = True
+
+    def update(self, monthly_summary, last_month):
+        """
+        Bring models up to last closed month
+
+        Args:
+            monthly_summary (pandas.DataFrame): monthly summary of transactions (MonthlySummary.frame)
+            last_month (pandas.Period): last closed month
+        """
+        if not self.outdated and last_month == self.last_month:
+            return
+
+        if (
+            self.outdated
+            or self.last_month is None
+            or last_month < self.last_month
+            or self.months < self.SEASON_LENGTH
+        ):
+            # Initial state needs whole first season
+            self.fit(monthly_summary, last_month)
+            return
+
+        # Only months closed since last update are smoothed
+        history = self.history(monthly_summary, self.last_month + 1, last_month)
+        if not set(history.columns) <= set(self.categories):
+            # New category needs its model from whole history
+            self.fit(monthly_summary, last_month)
+            return
+
+        history = history.reindex(columns=self.categories, fill_value=0)
+        for month, spendings in zip(history.index, history.to_numpy()):
+            self.smooth(month, spendings)
+
+        self.last_month = last_month
+        self.months += len(history)
+
+    def fit(self, monthly_summary, last_month):
+        """
+        Fit models from all closed months
+
+        Args:
+            monthly_summary (pandas.DataFrame): monthly summary of transactions (MonthlySummary.frame)
+            last_month (pandas.Period): last closed month
+        """
+        history = self.history(monthly_summary, None, last_month)
+
+        self.categories = list(history.columns)
+        self.last_month = last_month
+        self.months = len(history)
+        self.outdated = False
+
+        self.level = np.zeros(len(self.categories))
+        self.trend = np.zeros(len(self.categories))
+        self.seasonal = np.zeros((self.SEASON_LENGTH, len(self.categories)))
+
+        if history.empty:
+            return
+
+        # Initial level is mean of first season, seasonal values are deviations from it
+        spendings = history.to_numpy()
+        first_season = spendings[: self.SEASON_LENGTH]
+        self.level = first_season.mean(axis=0)
+        if len(first_season) == self.SEASON_LENGTH:
+            for month, month_spendings in zip(history.index, first_season):
+                self.seasonal[month.month - 1] = month_spendings - self.level
+
+        for month, month_spendings in zip(history.index, spendings):
+            self.smooth(month, month_spendings)
+
+    def smooth(self, month, spendings):
+        """
+        Smoothing step of all categories with spendings of month
+
+        Args:
+            month (pandas.Period): month
+            spendings (numpy.ndarray): spendings of every category
+        """
+        season = month.month - 1
+        previous_level = self.level
+
+        self.level = self.LEVEL_SMOOTHING * (spendings - self.seasonal[season]) + (
+            1 - self.LEVEL_SMOOTHING
+        ) * (self.level + self.TREND_DAMPING * self.trend)
+        self.trend = (
+            self.TREND_SMOOTHING * (self.level - previous_level)
+            + (1 - self.TREND_SMOOTHING) * self.TREND_DAMPING * self.trend
+        )
+        self.seasonal[season] = self.SEASONAL_SMOOTHING * (
+            spendings - self.level
+        ) + (1 - self.SEASONAL_SMOOTHING) * self.seasonal[season]
+
+    def forecast(self, months):
+        """
+        Forecast of summary spendings for months after last closed month
+
+        Args:
+            months (int): number of months
+
+        Returns:
+            numpy.ndarray: spendings of every month or None if there is no history
+        """
+        if self.last_month is None or len(self.categories) == 0:
+            return None
+
+        steps = np.arange(1, months + 1)
+
+        # Damped trend: sum of damping powers up to step
+        damping = np.cumsum(self.TREND_DAMPING**steps)
+        seasons = (self.last_month.month - 1 + steps) % self.SEASON_LENGTH
+
+        forecast = (
+            self.level
+            + damping[:, np.newaxis] * self.trend
+            + self.seasonal[seasons]
+        )
+
+        # Category can not have negative spendings
+        return np.maximum(forecast, 0).sum(axis=1)
+
+    def history(self, monthly_summary, month_from, month_to):
+        """
+        Get monthly spendings of every category
+
+        Args:
+            monthly_summary (pandas.DataFrame): monthly summary of transactions (MonthlySummary.frame)
+            month_from (pandas.Period): first month or None (first month in summary)
+            month_to (pandas.Period): last month
+
+        Returns:
+            pandas.DataFrame: months x categories spendings (months without spendings are zeros)
+        """
+        months = monthly_summary["Year-month"]
+        in_range = months <= month_to.strftime("%Y-%m")
+        if month_from is not None:
+            in_range &= months >= month_from.strftime("%Y-%m")
+
+        summary = monthly_summary[in_range]
+        expenses = summary[summary["4_type"] == "Expense"]
+        if expenses.empty:
+            months = [] if month_from is None else pd.period_range(month_from, month_to)
+            return pd.DataFrame(index=months, columns=[], dtype=float)
+
+        history = pd.pivot_table(
+            expenses,
+            values="6_amount",
+            index="Year-month",
+            columns="5_category",
+            aggfunc="sum",
+        )
+        history.index = pd.PeriodIndex(history.index, freq="M")
+
+        if month_from is None:
+            month_from = history.index.min()
+
+        return history.reindex(pd.period_range(month_from, month_to)).fillna(0)
@@ -0,0 +1,363 @@
+import os
+import json
+import sqlite3
+
+from finance_app.config import (
+    USER_CATEGORIES,
+    USER_TRANSACTIONS,
+    USER_UPCOMING_OPER,
+)
+from finance_app.modules.transaction_journal import TransactionJournal
+from finance_app.utils import parse_amount, parse_date
+
+# Operation dict keys and their columns in database
+OPERATION_COLUMNS = {
+    "1_name": "name",
+    "2_date": "date",
+    "3_vendor": "vendor",
+    "4_type": "type",
+    "5_category": "category",
+    "6_amount": "amount",
+}
+
+# Upcoming operations have also recurrence rule (kept as JSON text)
+UPCOMING_COLUMNS = dict(OPERATION_COLUMNS, **{"7_recurrence": "recurrence"})
+
+# Dict values kept in database as JSON text
+JSON_FIELDS = ["7_recurrence"]
+
+# Category dict keys and their columns in database
+CATEGORY_COLUMNS = {
+    "1_Main Category": "main_category",
+    "2_Subcategory": "subcategory",
+    "3_Default Operation Type": "default_type",
+    "Name": "name",
+}
+
+# Tables in database and user files they are migrated from
+TABLES = {
+    "transactions": (USER_TRANSACTIONS, OPERATION_COLUMNS),
+    "upcomings": (USER_UPCOMING_OPER, UPCOMING_COLUMNS),
+    "categories": (USER_CATEGORIES, CATEGORY_COLUMNS),
+}
+
+SCHEMA_VERSION = 1
+
+
+class SqliteStorage:
+    """
+    SQLite database with user transactions, upcomings and categories.
+
+    Operation tables keep dates as day ordinals and amounts in minor units, indexed with type and category
+    so table filters are made by queries.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.connection = sqlite3.connect(path)
+
+        self.create_schema()
+
+    def create_schema(self):
+        """
+        Create tables and indexes if they do not exist
+        """
+        with self.connection:
+            for name in ["transactions", "upcomings"]:
+                self.connection.execute(
+                    f"CREATE TABLE IF NOT EXISTS {name} ("
+                    + "key TEXT PRIMARY KEY, name TEXT, date INTEGER, vendor TEXT, type TEXT, "
+                    + "category TEXT, amount INTEGER)"
+                )
+                for column in ["date", "type", "category"]:
+                    self.connection.execute(
+                        f"CREATE INDEX IF NOT EXISTS {name}_{column} ON {name} ({column})"
+                    )
+
+            # Recurrence column is added to databases created before recurring upcomings
+            columns = [
+                row[1]
+                for row in self.connection.execute("PRAGMA table_info(upcomings)")
+            ]
+            if not "recurrence" in columns:
+                self.connection.execute(
+                    "ALTER TABLE upcomings ADD COLUMN recurrence TEXT"
+                )
+
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS categories ("
+                + "key TEXT PRIMARY KEY, main_category TEXT, subcategory TEXT, "
+                + "default_type TEXT, name TEXT)"
+            )
+
+    def table(self, name):
+        """
+        Get table handle with the same interface as TransactionJournal
+
+        Args:
+            name (str): table name
+
+        Returns:
+            SqliteTable: table handle
+        """
+        return SqliteTable(self, name, TABLES.get(name)[1])
+
+    def is_migrated(self):
+        """
+        Check if data from JSON files was already imported to database.
+
+        Returns:
+            bool: migration status
+        """
+        return self.connection.execute("PRAGMA user_version").fetchone()[0] > 0
+
+    def migrate(self, user_folder):
+        """
+        One-shot import of JSON files (with their journals) from user folder.
+        JSON files are left as they are.
+
+        Args:
+            user_folder (str): user data folder
+        """
+        with self.connection:
+            for name, (file_name, _) in TABLES.items():
+                data = TransactionJournal(os.path.join(user_folder, file_name)).load()
+                if data is not None:
+                    self.table(name).rewrite(data, commit=False)
+
+            self.connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def export(self, user_folder):
+        """
+        Write database data back to JSON files in user folder.
+        Used when user goes back to JSON storage.
+
+        Args:
+            user_folder (str): user data folder
+        """
+        for name, (file_name, _) in TABLES.items():
+            data = self.table(name).load()
+            path = os.path.join(user_folder, file_name)
+            if data is not None or os.path.exists(path):
+                TransactionJournal(path).rewrite({} if data is None else data)
+
+    def close(self):
+        """
+        Close database connection
+        """
+        self.connection.close()
+
+    def filter_keys(self, table, filters):
+        """
+        Get keys of operations matching all filters.
+
+        Args:
+            table (str): table name
+            filters (dict): column name and list of allowed values
+
+        Returns:
+            set: keys of matching operations
+        """
+        conditions = []
+        params = []
+        for column, values in filters.items():
+            conditions.append(
+                "{0} IN ({1})".format(column, ", ".join(["?"] * len(values)))
+            )
+            params.extend(values)
+
+        query = f"SELECT key FROM {table}"
+        if len(conditions) > 0:
+            query += " WHERE " + " AND ".join(conditions)
+
+        return {row[0] for row in self.connection.execute(query, params)}
+
+
+class SqliteTable:
+    """
+    Handle for one database table with the same interface as TransactionJournal,
+    so MainWindow can save changes without knowing which storage is used.
+    """
+
+    def __init__(self, storage, name, columns):
+        self.storage = storage
+        self.connection = storage.connection
+        self.name = name
+        self.columns = columns
+
+    def to_row(self, key, record):
+        """
+        Convert record dict to database row values.
+
+        Args:
+            key (str): record key
+            record (dict): record values
+
+        Returns:
+            list: row values
+        """
+        # Operations from not migrated files can still have text date and amount
+        if self.name != "categories":
+            record = dict(record)
+            record["2_date"] = parse_date(record.get("2_date"))
+            record["6_amount"] = parse_amount(record.get("6_amount"))
+
+        return [key] + [
+            (
+                json.dumps(record.get(field))
+                if field in JSON_FIELDS and not record.get(field) is None
+                else record.get(field)
+            )
+            for field in self.columns.keys()
+        ]
+
+    def to_record(self, row):
+        """
+        Convert database row values (without key) to record dict.
+        Empty JSON fields are not added to record.
+
+        Args:
+            row (tuple): row values
+
+        Returns:
+            dict: record values
+        """
+        record = dict(zip(self.columns.keys(), row))
+
+        for field in JSON_FIELDS:
+            if field in record:
+                value = record.pop(field)
+                if not value is None:
+                    record[field] = json.loads(value)
+
+        return record
+
+    def insert_sql(self):
+        """
+        Insert statement for table
+        """
+        columns = ["key"] + list(self.columns.values())
+
+        return "INSERT INTO {0} ({1}) VALUES ({2})".format(
+            self.name, ", ".join(columns), ", ".join(["?"] * len(columns))
+        )
+
+    def load(self):
+        """
+        Load all records from table.
+
+        Returns:
+            dict: records or None if table is empty
+        """
+        rows = self.connection.execute(
+            "SELECT key, {0} FROM {1} ORDER BY rowid".format(
+                ", ".join(self.columns.values()), self.name
+            )
+        ).fetchall()
+
+        if len(rows) == 0:
+            return None
+
+        return {row[0]: self.to_record(row[1:]) for row in rows}
+
+    def insert(self, key, record):
+        """
+        Insert new record
+
+        Args:
+            key (str): record key
+            record (dict): record values
+        """
+        with self.connection:
+            self.connection.execute(self.insert_sql(), self.to_row(key, record))
+
+    def update(self, key, record):
+        """
+        Update record (row position is kept)
+
+        Args:
+            key (str): record key
+            record (dict): record values
+        """
+        row = self.to_row(key, record)
+        columns = list(self.columns.values())
+
+        with self.connection:
+            self.connection.execute(
+                "UPDATE {0} SET {1} WHERE key = ?".format(
+                    self.name, ", ".join([f"{column} = ?" for column in columns])
+                ),
+                row[1:] + [key],
+            )
+
+    def update_many(self, records):
+        """
+        Update many records in one transaction (e.g. after category rename)
+
+        Args:
+            records (dict): values of records by key
+        """
+        columns = list(self.columns.values())
+        rows = [self.to_row(key, record) for key, record in records.items()]
+
+        with self.connection:
+            self.connection.executemany(
+                "UPDATE {0} SET {1} WHERE key = ?".format(
+                    self.name, ", ".join([f"{column} = ?" for column in columns])
+                ),
+                [row[1:] + [row[0]] for row in rows],
+            )
+
+    def delete(self, keys, renumber=False):
+        """
+        Delete records by key.
+
+        Args:
+            keys (list): keys of deleted records
+            renumber (bool, optional): renumber keys of rest records (used for categories). Defaults to False.
+        """
+        with self.connection:
+            self.connection.executemany(
+                f"DELETE FROM {self.name} WHERE key = ?", [[key] for key in keys]
+            )
+
+            if not renumber:
+                return
+
+            # Keys are increasing with rowid, so every record gets key lower or equal to current one
+            rowids = self.connection.execute(
+                f"SELECT rowid FROM {self.name} ORDER BY rowid"
+            ).fetchall()
+            self.connection.executemany(
+                f"UPDATE {self.name} SET key = ? WHERE rowid = ?",
+                [[str(new_key), row[0]] for new_key, row in enumerate(rowids)],
+            )
+
+    def rewrite(self, data, commit=True):
+        """
+        Replace all records in table
+
+        Args:
+            data (dict): records
+            commit (bool, optional): commit changes. Defaults to True.
+        """
+        self.connection.execute(f"DELETE FROM {self.name}")
+        self.connection.executemany(
+            self.insert_sql(),
+            [self.to_row(key, record) for key, record in data.items()],
+        )
+
+        if commit:
+            self.connection.commit()
+
+    def checkpoint(self, data):
+        """
+        Nothing to compact, every change is already commited
+        """
+        pass
+
+    def wait(self):
+        """
+        Nothing runs in background
+        """
+        pass
@@ -0,0 +1,247 @@
+import os
+import json
+import threading
+
+from finance_app.config import JOURNAL_EXT, JOURNAL_COMPACT_SIZE
+
+
+class TransactionJournal:
+    """
+    Write-ahead journal for user operations file (transactions or upcomings).
+
+    Every change is appended to journal file as one small JSON line instead of rewriting whole data file.
+    On load data file (snapshot) is read and journal is replayed on top of it.
+    When journal grows over JOURNAL_COMPACT_SIZE it is compacted into new snapshot in background thread.
+    """
+
+    def __init__(self, path, compact_size=JOURNAL_COMPACT_SIZE):
+        # Paths
+        self.path = path
+        self.journal_path = path + JOURNAL_EXT
+        self.old_journal_path = self.journal_path + ".old"
+
+        self.compact_size = compact_size
+        self.compact_thread = None
+
+    def load(self):
+        """
+        Load snapshot file and replay journal records on top of it.
+
+        Returns:
+            dict: user operations or None if there is no data file and no journal
+        """
+        data = None
+        if os.path.exists(self.path):
+            with open(self.path, "r") as file:
+                data = json.load(file)
+
+        # Journal left by interrupted compaction is replayed only if snapshot was not replaced
+        interrupted = os.path.exists(self.old_journal_path)
+        if interrupted:
+            records = self.read_records(self.old_journal_path)
+            if records and records[-1].get("snapshot") == self.snapshot_stamp():
+                data = self.replay(data, records)
+
+        if os.path.exists(self.journal_path):
+            data = self.replay(data, self.read_records(self.journal_path))
+
+        # Finish interrupted compaction
+        if interrupted and data is not None:
+            self.rewrite(data)
+
+        return data
+
+    def read_records(self, path):
+        """
+        Read journal records from file.
+        Last line can be cut if app was closed during write, so it is skipped.
+
+        Args:
+            path (str): journal file path
+
+        Returns:
+            list: journal records
+        """
+        records = []
+        with open(path, "r") as file:
+            for line in file:
+                try:
+                    records.append(json.loads(line))
+                except json.JSONDecodeError:
+                    break
+
+        return records
+
+    def replay(self, data, records):
+        """
+        Apply journal records to data.
+
+        Args:
+            data (dict): user operations
+            records (list): journal records
+
+        Returns:
+            dict: user operations after changes
+        """
+        for record in records:
+            match record.get("op"):
+                case "insert" | "update":
+                    if data is None:
+                        data = {}
+                    data[record.get("key")] = record.get("record")
+                case "update_many":
+                    if data is None:
+                        data = {}
+                    data.update(record.get("records"))
+                case "delete":
+                    if data is None:
+                        data = {}
+                    for key in record.get("keys"):
+                        data.pop(key, None)
+
+                    # Update dict keys (records without flag were written before stable ids)
+                    if record.get("renumber", True):
+                        temp_list = list(data.values())
+                        data.clear()
+                        for new_key, value in enumerate(temp_list):
+                            data[str(new_key)] = value
+
+        return data
+
+    def append(self, record):
+        """
+        Append one record at the end of journal file.
+
+        Args:
+            record (dict): journal record
+        """
+        with open(self.journal_path, "a") as file:
+            file.write(json.dumps(record) + "\n")
+            file.flush()
+            os.fsync(file.fileno())
+
+    def insert(self, key, record):
+        """
+        Save new operation to journal
+
+        Args:
+            key (str): operation key
+            record (dict): operation values
+        """
+        self.append({"op": "insert", "key": key, "record": record})
+
+    def update(self, key, record):
+        """
+        Save updated operation to journal
+
+        Args:
+            key (str): operation key
+            record (dict): operation values
+        """
+        self.append({"op": "update", "key": key, "record": record})
+
+    def update_many(self, records):
+        """
+        Save many updated operations to journal as one record (one write and one sync)
+
+        Args:
+            records (dict): values of operations by key
+        """
+        self.append({"op": "update_many", "records": records})
+
+    def delete(self, keys, renumber=False):
+        """
+        Save deleted operations to journal as tombstone record.
+
+        Args:
+            keys (list): keys of deleted operations
+            renumber (bool, optional): renumber keys of rest records on replay (used for categories). Defaults to False.
+        """
+        self.append({"op": "delete", "keys": list(keys), "renumber": renumber})
+
+    def snapshot_stamp(self):
+        """
+        Get stamp of current snapshot file used to check if it was replaced.
+
+        Returns:
+            list: file size and modification time or None if file does not exist
+        """
+        if not os.path.exists(self.path):
+            return None
+
+        stat = os.stat(self.path)
+        return [stat.st_size, stat.st_mtime_ns]
+
+    def write_snapshot(self, data):
+        """
+        Write data to snapshot file.
+        Data is saved to temporary file first and then replaced, so snapshot is never half written.
+
+        Args:
+            data (dict): user operations
+        """
+        temp_path = self.path + ".tmp"
+        with open(temp_path, "w") as file:
+            json.dump(data, file)
+            file.flush()
+            os.fsync(file.fileno())
+
+        os.replace(temp_path, self.path)
+
+    def rewrite(self, data):
+        """
+        Write whole data to snapshot file and clear journal.
+
+        Args:
+            data (dict): user operations
+        """
+        self.wait()
+        self.write_snapshot(data)
+
+        for path in [self.journal_path, self.old_journal_path]:
+            if os.path.exists(path):
+                os.remove(path)
+
+    def checkpoint(self, data):
+        """
+        Start background compaction if journal passed size threshold.
+
+        Args:
+            data (dict): current user operations
+        """
+        if not os.path.exists(self.journal_path):
+            return
+
+        if os.path.getsize(self.journal_path) < self.compact_size:
+            return
+
+        # Compaction is already running
+        if self.compact_thread is not None and self.compact_thread.is_alive():
+            return
+
+        # Seal current journal with snapshot stamp and move it aside, new changes go to new journal
+        self.append({"op": "seal", "snapshot": self.snapshot_stamp()})
+        os.replace(self.journal_path, self.old_journal_path)
+
+        # Copy of data so GUI can change it during compaction
+        data = {key: dict(value) for key, value in data.items()}
+
+        self.compact_thread = threading.Thread(target=self.compact, args=(data,))
+        self.compact_thread.start()
+
+    def compact(self, data):
+        """
+        Write snapshot and remove sealed journal. Runs in background thread.
+
+        Args:
+            data (dict): copy of user operations
+        """
+        self.write_snapshot(data)
+        os.remove(self.old_journal_path)
+
+    def wait(self):
+        """
+        Wait for running compaction to finish
+        """
+        if self.compact_thread is not None:
+            self.compact_thread.join()
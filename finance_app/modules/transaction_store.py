@@ -0,0 +1,365 @@
+from bisect import bisect_left, insort
+from PySide6.QtCore import QObject, Signal
+
+from finance_app.config import OPERATION_FIELDS
+from finance_app.modules.balance_index import BalanceIndex
+from finance_app.modules.monthly_summary import MonthlySummary
+from finance_app.utils import (
+    expand_operations,
+    format_operations,
+    operations_to_frame,
+)
+
+# Sign of operation amount in account balance
+BALANCE_SIGNS = {"Income": 1, "Expense": -1}
+
+
+class TransactionStore(QObject):
+    """
+    In-memory store with user operations (transactions or upcomings) owned by MainWindow and shared by all sections.
+
+    Operations dict (id -> record) is changed only through the store. Typed frame for calculations
+    and formatted frame for tables are built once after a change and every section reads the same frames.
+
+    Every change emits signal with operation id, so sections patch only changed rows instead of rebuilding.
+
+    Account balance change (income - expense) is kept up to date on every change together with
+    balance index, which gives balance change as of any date, and monthly summary by type and category.
+    Date index keeps operations sorted by date for range queries and last operation date.
+    Recurring operations (with recurrence rule) are stored once and expanded only over queried range.
+    """
+
+    row_inserted = Signal(str)  # operation id
+    row_updated = Signal(str, dict)  # operation id, old values
+    row_deleted = Signal(str, dict)  # operation id, deleted values
+
+    def __init__(self, operations=None):
+        super().__init__()
+
+        # Operations dict (None if user has no operations yet)
+        self.operations = operations
+
+        # Running balance change in minor units and balance as of date index
+        self.balance_change = 0
+        self.balance_index = BalanceIndex()
+        self.count_balance()
+
+        # Month x type x category summary
+        self.monthly_summary = MonthlySummary()
+        self.monthly_summary.load(self.operations)
+
+        # Sorted list of (date, operation id) and ids of recurring operations
+        self.date_index = []
+        self.recurring_keys = set()
+        self.build_date_index()
+
+        # Data version, increased on every change
+        self.version = 0
+
+        # Frame built for current version
+        self.display_frame = None
+        self.display_version = -1
+
+    def __len__(self):
+        return 0 if self.operations is None else len(self.operations)
+
+    def is_empty(self):
+        """
+        Check if there are no operations in store
+
+        Returns:
+            bool: store is empty
+        """
+        return len(self) == 0
+
+    def get(self, key):
+        """
+        Get operation by id
+
+        Args:
+            key (str): operation id
+
+        Returns:
+            dict: operation values or None if there is no such operation
+        """
+        return None if self.operations is None else self.operations.get(key)
+
+    def load(self, operations):
+        """
+        Replace all operations in store (no signals, sections are built from loaded data)
+
+        Args:
+            operations (dict): operations
+        """
+        self.operations = operations
+        self.version += 1
+
+        self.count_balance()
+        self.monthly_summary.load(self.operations)
+        self.build_date_index()
+
+    def insert(self, key, record):
+        """
+        Add new operation
+
+        Args:
+            key (str): operation id
+            record (dict): operation values
+        """
+        if self.operations is None:
+            self.operations = {}
+
+        self.operations[key] = record
+        self.version += 1
+
+        self.add_balance(record, 1)
+        self.monthly_summary.add(record, 1)
+        insort(self.date_index, (record.get("2_date"), key))
+        self.index_recurrence(key, record)
+
+        self.row_inserted.emit(key)
+
+    def update(self, key, record):
+        """
+        Update operation values
+
+        Args:
+            key (str): operation id
+            record (dict): operation values
+        """
+        old_record = self.operations[key]
+        self.operations[key] = record
+        self.version += 1
+
+        self.add_balance(old_record, -1)
+        self.add_balance(record, 1)
+        self.monthly_summary.add(old_record, -1)
+        self.monthly_summary.add(record, 1)
+        if record.get("2_date") != old_record.get("2_date"):
+            self.remove_from_date_index(key, old_record)
+            insort(self.date_index, (record.get("2_date"), key))
+        self.index_recurrence(key, record)
+
+        self.row_updated.emit(key, old_record)
+
+    def delete(self, keys):
+        """
+        Delete operations
+
+        Args:
+            keys (list): operation ids
+        """
+        deleted = [(key, self.operations.pop(key)) for key in keys]
+        self.version += 1
+
+        for key, record in deleted:
+            self.add_balance(record, -1)
+            self.monthly_summary.add(record, -1)
+            self.remove_from_date_index(key, record)
+            self.recurring_keys.discard(key)
+
+        for key, record in deleted:
+            self.row_deleted.emit(key, record)
+
+    def count_balance(self):
+        """
+        Count balance change and build balance index from all operations
+        """
+        self.balance_change = 0
+        day_sums = {}
+
+        for record in (self.operations or {}).values():
+            amount = BALANCE_SIGNS.get(record.get("4_type"), 0) * record.get(
+                "6_amount"
+            )
+            if amount != 0:
+                self.balance_change += amount
+                day = record.get("2_date")
+                day_sums[day] = day_sums.get(day, 0) + amount
+
+        self.balance_index.load(day_sums)
+
+    def add_balance(self, record, sign):
+        """
+        Add (or subtract) operation amount from balance change and balance index
+
+        Args:
+            record (dict): operation values
+            sign (int): 1 for added operation, -1 for removed operation
+        """
+        amount = (
+            sign * BALANCE_SIGNS.get(record.get("4_type"), 0) * record.get("6_amount")
+        )
+        if amount == 0:
+            return
+
+        self.balance_change += amount
+        self.balance_index.add(record.get("2_date"), amount)
+
+    def balance_as_of(self, day):
+        """
+        Balance change (income - expense) from operations made before and on day
+
+        Args:
+            day (int): day ordinal
+
+        Returns:
+            int: balance change in minor units
+        """
+        return self.balance_index.balance_as_of(day)
+
+    def build_date_index(self):
+        """
+        Sort all operations by date
+        """
+        self.date_index = sorted(
+            (record.get("2_date"), key)
+            for key, record in (self.operations or {}).items()
+        )
+        self.recurring_keys = {
+            key
+            for key, record in (self.operations or {}).items()
+            if record.get("7_recurrence")
+        }
+
+    def index_recurrence(self, key, record):
+        """
+        Add operation to recurring operations if it has recurrence rule (or remove it if it has not)
+
+        Args:
+            key (str): operation id
+            record (dict): operation values
+        """
+        if record.get("7_recurrence"):
+            self.recurring_keys.add(key)
+        else:
+            self.recurring_keys.discard(key)
+
+    def remove_from_date_index(self, key, record):
+        """
+        Remove operation from date index
+
+        Args:
+            key (str): operation id
+            record (dict): operation values with indexed date
+        """
+        position = bisect_left(self.date_index, (record.get("2_date"), key))
+        del self.date_index[position]
+
+    def last_date(self):
+        """
+        Get date of the latest operation
+
+        Returns:
+            int: day ordinal or None if store is empty
+        """
+        return self.date_index[-1][0] if len(self.date_index) > 0 else None
+
+    def keys_between(self, date_from, date_to):
+        """
+        Get ids of operations with date in range (both ends included) sorted by date
+
+        Args:
+            date_from (int): first day ordinal
+            date_to (int): last day ordinal
+
+        Returns:
+            list: operation ids
+        """
+        start = bisect_left(self.date_index, (date_from,))
+        end = bisect_left(self.date_index, (date_to + 1,))
+
+        return [key for _, key in self.date_index[start:end]]
+
+    def occurrences_between(self, date_from, date_to):
+        """
+        Get occurrences of operations with date in range. Recurring operations which started
+        before range end are expanded over range (see expand_operations).
+
+        Args:
+            date_from (int): first day ordinal
+            date_to (int): last day ordinal
+
+        Returns:
+            dict: occurrences of operations
+        """
+        occurrences = {
+            key: self.operations[key]
+            for key in self.keys_between(date_from, date_to)
+            if not key in self.recurring_keys
+        }
+        occurrences.update(
+            expand_operations(
+                {
+                    key: self.operations[key]
+                    for key in self.recurring_keys
+                    if self.operations[key].get("2_date") <= date_to
+                },
+                date_from,
+                date_to,
+            )
+        )
+
+        return occurrences
+
+    def frame_between(self, date_from, date_to, columns=None):
+        """
+        Get operations frame (as in frame method) with date in range sorted by date.
+        Only operations in range are converted, recurring operations are expanded over range.
+
+        Args:
+            date_from (datetime): first day
+            date_to (datetime): last day
+            columns (list, optional): columns to get. Defaults to None (all columns).
+
+        Returns:
+            pandas.DataFrame: operations
+        """
+        occurrences = self.occurrences_between(
+            date_from.toordinal(), date_to.toordinal()
+        )
+        if len(self.recurring_keys) > 0:
+            occurrences = dict(
+                sorted(occurrences.items(), key=lambda item: item[1].get("2_date"))
+            )
+
+        return operations_to_frame(
+            occurrences, OPERATION_FIELDS if columns is None else columns
+        )
+
+    def display(self, columns=None):
+        """
+        Get operations formatted for tables. Frame is indexed by operation id.
+        Frame of all columns shares data with store, so its values must not be changed in place.
+
+        Args:
+            columns (list, optional): columns to get. Defaults to None (all columns).
+
+        Returns:
+            pandas.DataFrame: formatted operations
+        """
+        if self.display_version != self.version:
+            self.display_frame = format_operations(self.operations)
+            self.display_version = self.version
+
+        return self.view(self.display_frame, columns)
+
+    def view(self, frame, columns):
+        """
+        Shallow copy of frame or copy of choosen columns
+        (columns missing in frame, e.g. recurrence if no operation repeats, are empty)
+
+        Args:
+            frame (pandas.DataFrame): store frame
+            columns (list): columns to get or None for all columns
+
+        Returns:
+            pandas.DataFrame: frame with columns
+        """
+        if columns is None:
+            return frame.copy(deep=False)
+
+        if set(columns).issubset(frame.columns):
+            return frame[columns]
+
+        return frame.reindex(columns=columns)
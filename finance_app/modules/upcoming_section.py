@@ -6,7 +6,15 @@ import pandas as pd
 from datetime import datetime
 
 from finance_app.config import *
-from finance_app.modules import TableWidget, EditTransaction, ErrorBox, LineEdit
+from finance_app.utils import format_operation
+from finance_app.modules import (
+    TableWidget,
+    EditTransaction,
+    ErrorBox,
+    LineEdit,
+    AddRecurring,
+    RecurringDetector,
+)
 
 
 class UpcomingSection(QWidget):
@@ -20,35 +28,27 @@ class UpcomingSection(QWidget):
         self,
         current_acc_balance,
         currency,
-        user_upcomings,
+        upcomings_store,
         user_upcomings_path,
         user_categories,
+        transactions_store=None,
     ):
         super().__init__()
 
         # User data
         self.current_acc_balance = current_acc_balance
         self.currency = currency
-        self.user_upcomings = user_upcomings
+        self.upcomings_store = upcomings_store
+        self.transactions_store = transactions_store
         self.user_upcomings_path = user_upcomings_path
         self.user_categories = user_categories
 
-        self.user_upcomings_to_table = pd.DataFrame(self.user_upcomings).T.reset_index(
-            drop=True
-        )
-        self.user_upcomings_to_table = self.user_upcomings_to_table[
-            [
-                col
-                for col in self.user_upcomings_to_table.columns
-                if not "vendor" in col and not "type" in col
-            ]
-        ]
+        # Operations without recurrence rule have empty "Repeats" column
+        self.user_upcomings_to_table = self.upcomings_store.display(
+            UPCOMING_OPERATIONS_FIELDS
+        ).fillna("")
 
-        self.upcoming_oper_num = (
-            7
-            if self.user_upcomings_to_table is None
-            else len(self.user_upcomings_to_table.index)
-        )
+        self.upcoming_oper_num = len(self.user_upcomings_to_table.index)
 
         self.row_nums = 12
 
@@ -57,6 +57,11 @@ class UpcomingSection(QWidget):
 
         self.init_section()
 
+        # Patch table rows on every change in store
+        self.upcomings_store.row_inserted.connect(self.operation_inserted)
+        self.upcomings_store.row_updated.connect(self.operation_updated)
+        self.upcomings_store.row_deleted.connect(self.operation_deleted)
+
     def init_section(self):
         """
         Section initialization
@@ -117,17 +122,28 @@ class UpcomingSection(QWidget):
         self.export_btn.setMinimumWidth(130)
         self.export_btn.clicked.connect(self.export_data)
 
+        # Recurring operations btn
+        self.recurring_btn = QPushButton("Recurring")
+        self.recurring_btn.setStyleSheet(
+            "QPushButton {background-color: #0085FC; border-style: solid; border-color: #0085FC; border-width: 2px; border-radius: 10px; font-size: 10pt; color:white;} "
+            + "QPushButton::pressed {background-color: #4dacff; border-style: solid; border-color: #4dacff; border-width: 2px; border-radius: 10px; font-size: 10pt; color:white;}"
+        )
+        self.recurring_btn.setMinimumHeight(40)
+        self.recurring_btn.setMinimumWidth(130)
+        self.recurring_btn.setVisible(self.transactions_store is not None)
+        self.recurring_btn.clicked.connect(self.show_recurring)
+
         # Table with categories
         self.upcoming_operations_table = TableWidget(
             parent=self,
             row_num=self.upcoming_oper_num,
-            col_num=len(PLANNED_OPERATIONS_HEADERS),
-            header_names=PLANNED_OPERATIONS_HEADERS,
+            col_num=len(UPCOMING_OPERATIONS_HEADERS),
+            header_names=UPCOMING_OPERATIONS_HEADERS,
             font=QFont(
                 "Notosans",
                 10,
             ),
-            data=pd.DataFrame(self.user_upcomings_to_table).reset_index(drop=True),
+            data=pd.DataFrame(self.user_upcomings_to_table),
             editable=False,
             sorting=False,
             filtering=True,
@@ -151,7 +167,7 @@ class UpcomingSection(QWidget):
         self.search_box.setMinimumHeight(40)
         self.search_box.setMinimumWidth(200)
         self.search_box.setVisible(self.search_box_visible)
-        self.search_box.textChanged.connect(self.upcoming_operations_table.filter)
+        self.search_box.textChanged.connect(self.upcoming_operations_table.search)
 
         # Spacer for button layout
         self.spacer = QSpacerItem(2, 2, QSizePolicy.Expanding, QSizePolicy.Fixed)
@@ -159,6 +175,9 @@ class UpcomingSection(QWidget):
         btn_layout.addWidget(self.select_btn, 0, alignment=Qt.AlignmentFlag.AlignLeft)
         btn_layout.addWidget(self.delete_btn, 0, alignment=Qt.AlignmentFlag.AlignLeft)
         btn_layout.addWidget(self.export_btn, 0, alignment=Qt.AlignmentFlag.AlignLeft)
+        btn_layout.addWidget(
+            self.recurring_btn, 0, alignment=Qt.AlignmentFlag.AlignLeft
+        )
         btn_layout.addItem(self.spacer)
         btn_layout.addWidget(self.search_box, 0, alignment=Qt.AlignmentFlag.AlignLeft)
         btn_layout.addWidget(self.search_btn, 0, alignment=Qt.AlignmentFlag.AlignLeft)
@@ -181,31 +200,72 @@ class UpcomingSection(QWidget):
 
         self.search_box.setVisible(self.search_box_visible)
 
-    def update_upcoming_oper(self, data):
+    def update_upcoming_oper(self):
         """
         Method for updating operations table
-
-        Args:
-            data (dict): data to display on table
         """
-        self.user_upcomings = data
         # Data prep
-        data = pd.DataFrame(data).T.reset_index(drop=True)
+        data = self.upcomings_store.display(UPCOMING_OPERATIONS_FIELDS).fillna("")
         self.upcoming_operations_table.clear_table()
 
-        if len(self.user_upcomings) > 0:
-            data = data[
-                [
-                    col
-                    for col in data.columns
-                    if not "vendor" in col and not "type" in col
-                ]
-            ]
-            data.columns = PLANNED_OPERATIONS_HEADERS
+        if not self.upcomings_store.is_empty():
+            data.columns = UPCOMING_OPERATIONS_HEADERS
 
             # Update table data
             self.upcoming_operations_table.update_table(data)
 
+    @Slot(str)
+    def operation_inserted(self, key):
+        """
+        Add row with new operation at the end of table
+
+        Args:
+            key (str): operation id
+        """
+        # Table of empty store has no operation rows
+        if len(self.upcomings_store) == 1:
+            self.update_upcoming_oper()
+            return
+
+        self.upcoming_operations_table.insert_row(
+            self.upcoming_operations_table.rowCount(),
+            format_operation(
+                self.upcomings_store.get(key), UPCOMING_OPERATIONS_FIELDS
+            ),
+            key,
+        )
+
+    @Slot(str, dict)
+    def operation_updated(self, key, old_record):
+        """
+        Update row of changed operation
+
+        Args:
+            key (str): operation id
+            old_record (dict): operation values before update
+        """
+        self.upcoming_operations_table.update_row(
+            key,
+            format_operation(
+                self.upcomings_store.get(key), UPCOMING_OPERATIONS_FIELDS
+            ),
+        )
+
+    @Slot(str, dict)
+    def operation_deleted(self, key, old_record):
+        """
+        Remove row of deleted operation
+
+        Args:
+            key (str): operation id
+            old_record (dict): deleted operation values
+        """
+        if self.upcomings_store.is_empty():
+            self.update_upcoming_oper()
+            return
+
+        self.upcoming_operations_table.remove_row(key)
+
     def show_transaction(self, row, columns):
         """
         Showing choosen transaction for user.
@@ -215,28 +275,26 @@ class UpcomingSection(QWidget):
             columns (int): _description_
         """
         # Get transaction data from table
-        tr_number = (
-            self.upcoming_operations_table.cellWidget(row, 0)
-            .findChild(QCheckBox)
-            .get_hidden_property()
-        )
-        selected_transaction = self.user_upcomings.get(str(tr_number))
+        tr_number = self.upcoming_operations_table.get_row_id(row)
+        selected_transaction = self.upcomings_store.get(str(tr_number))
 
-        name = self.upcoming_operations_table.item(row, 1).text()
-        date = self.upcoming_operations_table.item(row, 2).text().split("-")
+        name = self.upcoming_operations_table.get_value(row, 1)
+        date = self.upcoming_operations_table.get_value(row, 2)
 
         seller = selected_transaction.get("3_vendor")
         type = selected_transaction.get("4_type")
 
-        date = "{0}.{1}.{2}".format(date[2], date[1], date[0])
-        category = self.upcoming_operations_table.item(row, 3).text()
-        amount = self.upcoming_operations_table.item(row, 4).data(
-            Qt.ItemDataRole.UserRole + 1
+        category = self.upcoming_operations_table.get_value(row, 3)
+        amount = (
+            self.upcoming_operations_table
+            .model()
+            .index(row, 4)
+            .data(Qt.ItemDataRole.UserRole + 1)
         )
 
         # Choosen transaction window
         self.transaction_edit = EditTransaction(
-            number=tr_number,
+            operation_id=tr_number,
             name=name,
             date=date,
             seller=seller,
@@ -244,6 +302,7 @@ class UpcomingSection(QWidget):
             category=category,
             amount=amount,
             user_categories=self.user_categories,
+            recurrence=selected_transaction.get("7_recurrence"),
         )
         self.transaction_edit.show()  # show window
 
@@ -287,11 +346,34 @@ class UpcomingSection(QWidget):
 
         self.update_transaction.emit(transaction, type)  # emit signal
 
+    def show_recurring(self):
+        """
+        Show expenses repeated every week, month or year, which are not planned yet.
+        Operations selected by user are added as upcoming operations.
+        """
+        recurring_operations = RecurringDetector().detect(
+            self.transactions_store.operations, self.upcomings_store.operations
+        )
+        recurring_operations = recurring_operations[
+            recurring_operations["4_type"] == "Expense"
+        ]
+
+        if recurring_operations.empty:
+            msg = "No recurring expenses were found in transactions!"
+            ErrorBox(self, title="No recurring operations", msg=msg)
+            return
+
+        self.recurring_window = AddRecurring(recurring_operations)
+        self.recurring_window.show()
+
+        # Added operations are passed for update database
+        self.recurring_window.send_transaction.connect(self.update_transaction.emit)
+
     def export_data(self):
         """
         Method for exporting data to csv or excel to user choosen path.
         """
-        oper_to_export = self.user_upcomings
+        oper_to_export = self.upcomings_store.operations
 
         # Check if there are any selected operations
         if self.delete_btn.isVisible():
@@ -311,7 +393,7 @@ class UpcomingSection(QWidget):
                     oper_to_export = {}
 
                     for tr_num in selected_rows:
-                        temp_transaction = self.user_upcomings.get(str(tr_num))
+                        temp_transaction = self.upcomings_store.get(str(tr_num))
 
                         oper_to_export[str(tr_num)] = temp_transaction
         # Dialog to choose save path
@@ -325,7 +407,7 @@ class UpcomingSection(QWidget):
         )
 
         if save_path is not None and (
-            self.user_upcomings is not None and len(oper_to_export) > 0
+            oper_to_export is not None and len(oper_to_export) > 0
         ):
 
             # Getting choosen path and extension by user
@@ -335,7 +417,11 @@ class UpcomingSection(QWidget):
                 file_path += "." + extension
 
             # Data prep (to dataframe)
-            data_to_save = pd.DataFrame(self.user_upcomings).T.reset_index(drop=False)
+            data_to_save = (
+                self.upcomings_store.display(OPERATION_FIELDS)
+                .loc[list(oper_to_export.keys())]
+                .reset_index(drop=False)
+            )
             data_to_save.columns = ["Operation number"] + [
                 col.replace("\n", " ") for col in RECENT_OPERATIONS_HEADERS
             ]
@@ -389,7 +475,7 @@ class UpcomingSection(QWidget):
             # Create transation dicts
             selected_tr_dict = {}
             for tr_num in selected_rows:
-                temp_transaction = self.user_upcomings.get(str(tr_num))
+                temp_transaction = self.upcomings_store.get(str(tr_num))
 
                 selected_tr_dict[str(tr_num)] = temp_transaction
 
@@ -3,7 +3,14 @@
 from PySide6.QtCore import Qt, QPoint
 from PySide6.QtWidgets import QApplication
 
-from datetime import datetime
+import uuid
+import pandas as pd
+from datetime import datetime, date
+from dateutil.relativedelta import relativedelta
+from decimal import Decimal, ROUND_HALF_UP
+
+# Day ordinal of 01.01.1970 (used to convert ordinals to pandas dates)
+ORDINAL_EPOCH = date(1970, 1, 1).toordinal()
 
 
 def center_window(
@@ -103,3 +110,330 @@ def is_date(value, format):
         return False
 
     return True
+
+
+def is_amount(value):
+    """
+    Verification if value is amount which can be parsed to minor units
+
+    Args:
+        value (str): value
+
+    Returns:
+        bool: value is amount
+    """
+    try:
+        parse_amount(value)
+    except (ArithmeticError, ValueError):
+        return False
+
+    return True
+
+
+def new_operation_id():
+    """
+    Create permanent id for new transaction or upcoming operation.
+
+    Returns:
+        str: unique operation id
+    """
+    return uuid.uuid4().hex
+
+
+def parse_amount(value):
+    """
+    Parse amount entered by the user (e.g. "1 234,56") to integer number of minor units (cents).
+    Integer values are already parsed and returned as they are.
+
+    Args:
+        value (str | int): amount
+
+    Returns:
+        int: amount in minor units
+    """
+    if isinstance(value, int):
+        return value
+
+    amount = Decimal(value.replace(" ", "").replace(",", ".")) * 100
+    return int(amount.to_integral_value(rounding=ROUND_HALF_UP))
+
+
+def parse_date(value, format="%d.%m.%Y"):
+    """
+    Parse date entered by the user (e.g. "31.12.2024") to day ordinal.
+    Integer values are already parsed and returned as they are.
+
+    Args:
+        value (str | int): date
+        format (str, optional): date format. Defaults to "%d.%m.%Y".
+
+    Returns:
+        int: day ordinal
+    """
+    if isinstance(value, int):
+        return value
+
+    return datetime.strptime(value, format).toordinal()
+
+
+def format_amount(amount):
+    """
+    Format amount in minor units for display (e.g. 123456 -> "1234,56")
+
+    Args:
+        amount (int): amount in minor units
+
+    Returns:
+        str: formatted amount
+    """
+    sign = "-" if amount < 0 else ""
+    units, cents = divmod(abs(int(amount)), 100)
+
+    return "{0}{1},{2:02d}".format(sign, units, cents)
+
+
+def format_date(ordinal, format="%d.%m.%Y"):
+    """
+    Format day ordinal for display (e.g. 739251 -> "31.12.2024")
+
+    Args:
+        ordinal (int): day ordinal
+        format (str, optional): date format. Defaults to "%d.%m.%Y".
+
+    Returns:
+        str: formatted date
+    """
+    return date.fromordinal(int(ordinal)).strftime(format)
+
+
+def recurrence_dates(record, day_from, day_to):
+    """
+    Generate dates of operation occurrences in range (both ends included).
+    Operation without recurrence rule occurs only on its date.
+
+    Recurrence rule ("7_recurrence") repeats operation every N days, weeks or months from its date,
+    optionally until end date. Occurrences before "from" day of rule (already booked) are skipped.
+    Occurrences before range are skipped without generating them.
+
+    Args:
+        record (dict): operation values
+        day_from (int): first day ordinal
+        day_to (int): last day ordinal
+
+    Yields:
+        int: day ordinal of occurrence
+    """
+    start = record.get("2_date")
+    recurrence = record.get("7_recurrence")
+
+    if not recurrence:
+        if day_from <= start <= day_to:
+            yield start
+        return
+
+    if recurrence.get("until") is not None:
+        day_to = min(day_to, recurrence.get("until"))
+
+    # Booked occurrences are skipped, but occurrences are still counted from start
+    if recurrence.get("from") is not None:
+        day_from = max(day_from, recurrence.get("from"))
+
+    every = recurrence.get("every")
+
+    if recurrence.get("unit") == "months":
+        start_date = date.fromordinal(start)
+        from_date = date.fromordinal(max(day_from, start))
+
+        # First occurrence in month of range start (or before it)
+        months = (from_date.year - start_date.year) * 12 + (
+            from_date.month - start_date.month
+        )
+        step = months // every
+
+        while True:
+            # Every occurrence is counted from start, so day of month is not lost after short months
+            day = (start_date + relativedelta(months=step * every)).toordinal()
+            if day > day_to:
+                return
+            if day >= day_from:
+                yield day
+            step += 1
+    else:
+        interval = every * (7 if recurrence.get("unit") == "weeks" else 1)
+
+        # First occurrence in range
+        day = start
+        if day_from > start:
+            day += -(-(day_from - start) // interval) * interval
+
+        yield from range(day, day_to + 1, interval)
+
+
+def expand_operations(operations, day_from, day_to):
+    """
+    Get occurrences of operations in range. Recurring operation gets one entry per occurrence
+    with key "<operation id>:<day ordinal>".
+
+    Args:
+        operations (dict): operations
+        day_from (int): first day ordinal
+        day_to (int): last day ordinal
+
+    Returns:
+        dict: occurrences of operations
+    """
+    occurrences = {}
+    for key, record in (operations or {}).items():
+        if not record.get("7_recurrence"):
+            if day_from <= record.get("2_date") <= day_to:
+                occurrences[key] = record
+            continue
+
+        for day in recurrence_dates(record, day_from, day_to):
+            occurrences[f"{key}:{day}"] = dict(record, **{"2_date": day})
+
+    return occurrences
+
+
+def book_occurrence(record):
+    """
+    Mark first not booked occurrence of recurring operation as booked.
+    Start date of rule is kept (so day of month is not lost), rule gets day of next occurrence
+    from which occurrences are not booked.
+
+    Args:
+        record (dict): recurring operation values
+
+    Returns:
+        dict: operation values or None if booked occurrence was the last one
+    """
+    occurrences = recurrence_dates(record, record.get("2_date"), date.max.toordinal())
+    next(occurrences, None)
+
+    next_day = next(occurrences, None)
+    if next_day is None:
+        return None
+
+    recurrence = dict(record.get("7_recurrence"), **{"from": next_day})
+    return dict(record, **{"7_recurrence": recurrence})
+
+
+def format_recurrence(recurrence):
+    """
+    Format recurrence rule for display (e.g. "Every 2 weeks until 31.12.2025")
+
+    Args:
+        recurrence (dict): recurrence rule or None
+
+    Returns:
+        str: formatted rule or empty string if operation is not recurring
+    """
+    if not isinstance(recurrence, dict):
+        return ""
+
+    text = "Every {0} {1}".format(recurrence.get("every"), recurrence.get("unit"))
+    if recurrence.get("every") == 1:
+        text = "Every {0}".format(recurrence.get("unit")[:-1])
+
+    if recurrence.get("until") is not None:
+        text += " until {0}".format(format_date(recurrence.get("until")))
+
+    return text
+
+
+def parse_operation(operation):
+    """
+    Get operation with amount and date parsed to integers
+
+    Args:
+        operation (dict): operation values
+
+    Returns:
+        dict: operation with typed values
+    """
+    operation = dict(operation)
+    operation["2_date"] = parse_date(operation.get("2_date"))
+    operation["6_amount"] = parse_amount(operation.get("6_amount"))
+
+    return operation
+
+
+def operations_to_frame(operations, columns=None):
+    """
+    Create data frame with operations for calculations.
+    Dates are converted to datetime and amounts to units without parsing every value.
+
+    Args:
+        operations (dict): operations
+        columns (list, optional): columns to get. Defaults to None (all columns).
+
+    Returns:
+        pandas.DataFrame: operations
+    """
+    operations = operations or {}
+    if columns is None:
+        columns = list(next(iter(operations.values()), {}).keys())
+
+    # Frame is built column by column (faster than from dict of records)
+    records = operations.values()
+    frame = pd.DataFrame(
+        {column: [record.get(column) for record in records] for column in columns},
+        index=list(operations.keys()),
+        columns=columns,
+    )
+
+    # Empty frame with columns gets the same types for filtering
+    if "2_date" in frame.columns:
+        frame["2_date"] = pd.to_datetime(
+            frame["2_date"].astype("int64") - ORDINAL_EPOCH, unit="D"
+        )
+    if "6_amount" in frame.columns:
+        frame["6_amount"] = frame["6_amount"].astype("int64") / 100
+
+    return frame
+
+
+def format_operation(record, fields):
+    """
+    Get values of one operation formatted for display (table row)
+
+    Args:
+        record (dict): operation values
+        fields (list): operation fields to get
+
+    Returns:
+        list: formatted values
+    """
+    values = []
+    for field in fields:
+        value = record.get(field)
+        if field == "2_date":
+            value = format_date(value)
+        elif field == "6_amount":
+            value = format_amount(value)
+        elif field == "7_recurrence":
+            value = format_recurrence(value)
+        values.append(value)
+
+    return values
+
+
+def format_operations(operations):
+    """
+    Create data frame with operations formatted for display (tables and export)
+
+    Args:
+        operations (dict): operations
+
+    Returns:
+        pandas.DataFrame: operations with formatted date and amount
+    """
+    frame = pd.DataFrame.from_dict(operations or {}, orient="index")
+
+    if not frame.empty:
+        frame["2_date"] = frame["2_date"].map(format_date)
+        frame["6_amount"] = frame["6_amount"].map(format_amount)
+        if "7_recurrence" in frame.columns:
+            frame["7_recurrence"] = frame["7_recurrence"].map(format_recurrence)
+
+    return frame
@@ -67,16 +67,7 @@ class BarChart(QWidget):
             self.chart.setToolTip(self.tooltip)
 
         # Min and max val for y axis
-        min_val = self.data.unstack().min()
-        max_val = self.data[self.data > 0].sum(axis=1).max()
-        if len(self.data.columns) > 2:
-            max_val = self.data.unstack().max()
-        # elif len(self.data.index) == 2:
-        #     min_val *= min_val * 0.2
-        elif len(self.data.index) == 1:
-            max_val = int(math.ceil(self.data.unstack().max() / 1000)) * 1000
-            max_val = max_val + max_val * 0.2
-            min_val = 0
+        min_val, max_val = self.value_range()
 
         # Y-axis
         self.y_axis = QValueAxis()
@@ -185,3 +176,60 @@ class BarChart(QWidget):
         self.setLayout(layout)
 
         self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
+
+    def value_range(self):
+        """
+        Min and max value for y axis
+
+        Returns:
+            tuple: min and max value
+        """
+        min_val = self.data.unstack().min()
+        max_val = self.data[self.data > 0].sum(axis=1).max()
+        if len(self.data.columns) > 2:
+            max_val = self.data.unstack().max()
+        # elif len(self.data.index) == 2:
+        #     min_val *= min_val * 0.2
+        elif len(self.data.index) == 1:
+            max_val = int(math.ceil(self.data.unstack().max() / 1000)) * 1000
+            max_val = max_val + max_val * 0.2
+            min_val = 0
+
+        return min_val, max_val
+
+    def update_data(self, data):
+        """
+        Update values of bars and markers without creating new chart.
+        Possible only if data has the same index and columns as data shown in chart.
+
+        Args:
+            data (pandas.DataFrame): new chart data
+
+        Returns:
+            bool: True if chart was updated
+        """
+        if not (
+            data.index.equals(self.data.index)
+            and data.columns.equals(self.data.columns)
+        ):
+            return False
+
+        self.data = data
+
+        # Bars and markers are in the same order as they were added
+        marker_num = 0
+        for bar_set, col in zip(self.bar_series.barSets(), self.data.columns):
+            for index, value in enumerate(self.data[col]):
+                bar_set.replace(index, value - 250)
+
+                point = self.marker_series.at(marker_num)
+                self.marker_series.replace(
+                    marker_num, QPointF(point.x(), round(value, 0))
+                )
+                marker_num += 1
+
+        min_val, max_val = self.value_range()
+        self.y_axis.setRange(min_val, max_val)
+        self.y_axis.applyNiceNumbers()
+
+        return True
@@ -0,0 +1,315 @@
+import numpy as np
+import pandas as pd
+from PySide6.QtCore import QDate
+
+
+def format_number(number):
+    """
+    Format number with thousands separator
+
+    Args:
+        number (float): number
+
+    Returns:
+        str: formatted number
+    """
+    if number.is_integer():
+        return f"{int(number):,}".replace(",", " ")
+
+    return f"{number:,.2f}".replace(",", " ").replace(".", ",")
+
+
+class ColumnIndex:
+    """
+    Distinct values of table column (hashed once) and code of value in every row.
+
+    Searching, filtering by keywords and sorting are done on distinct values,
+    then mapped to rows with one numpy indexing by codes, so they do not loop over rows.
+    Codes array has spare capacity, so appending rows is amortized O(1).
+    Typed (number or date) and formatted values are converted once for every distinct value,
+    so drawing cell only indexes them by code of row.
+    """
+
+    def __init__(self, values):
+        """
+        Args:
+            values (list): texts of column
+        """
+        codes, uniques = pd.factorize(pd.Series(values, dtype=object))
+
+        self.values = list(uniques)  # distinct values in order of first occurrence
+        self.code_of = {value: code for code, value in enumerate(self.values)}
+
+        self.size = len(codes)
+        self.codes = codes.astype(np.int64)
+
+        self.lower_values = np.array([], dtype=bytes)  # lowercase values (utf-8) to search
+        self.last_search = ("", None)  # last searched text and distinct values found
+        self.ranks = None  # sort rank of every distinct value
+        self.typed_values = []  # number, date or text of every distinct value
+        self.formatted_values = []  # number with thousands separator or text
+
+    def rows(self):
+        """
+        Codes of rows
+        """
+        return self.codes[: self.size]
+
+    def code(self, value):
+        """
+        Get code of value (new value is added to distinct values)
+
+        Args:
+            value (str): text
+
+        Returns:
+            int: code
+        """
+        code = self.code_of.get(value)
+        if code is None:
+            code = len(self.values)
+            self.values.append(value)
+            self.code_of[value] = code
+            self.ranks = None
+
+        return code
+
+    def value(self, row):
+        return self.values[self.codes[row]]
+
+    def typed_value(self, row):
+        """
+        Get value of row converted to number or date (for display like numbers and dates)
+
+        Args:
+            row (int): row
+
+        Returns:
+            float | QDate | str: typed value
+        """
+        self.update_display_values()
+
+        return self.typed_values[self.codes[row]]
+
+    def formatted_value(self, row):
+        """
+        Get value of row with thousands separator if it is number
+
+        Args:
+            row (int): row
+
+        Returns:
+            str: formatted value
+        """
+        self.update_display_values()
+
+        return self.formatted_values[self.codes[row]]
+
+    def update_display_values(self):
+        """
+        Convert distinct values added since last update to typed and formatted values
+        """
+        if len(self.typed_values) == len(self.values):
+            return
+
+        values = pd.Series(self.values[len(self.typed_values) :], dtype=object)
+        numbers, dates = self.parse_values(values)
+
+        for value, number, day in zip(values, numbers, dates):
+            if not pd.isna(number):
+                self.typed_values.append(float(number))
+                self.formatted_values.append(format_number(float(number)))
+            elif not pd.isna(day):
+                self.typed_values.append(QDate(day.year, day.month, day.day))
+                self.formatted_values.append(value)
+            else:
+                self.typed_values.append(value)
+                self.formatted_values.append(value)
+
+    def insert(self, row, value):
+        """
+        Insert value of new row
+
+        Args:
+            row (int): row
+            value (str): text
+        """
+        code = self.code(value)
+
+        if row == self.size and self.size < len(self.codes):
+            self.codes[row] = code
+        elif row == self.size:
+            # Capacity is doubled when array is full
+            self.codes = np.concatenate(
+                (self.codes[: self.size], np.empty(max(self.size, 16), np.int64))
+            )
+            self.codes[row] = code
+        else:
+            self.codes = np.insert(self.codes[: self.size], row, code)
+
+        self.size += 1
+
+    def update(self, row, value):
+        self.codes[row] = self.code(value)
+
+    def remove(self, row):
+        self.codes = np.delete(self.codes[: self.size], row)
+        self.size -= 1
+
+    def update_lower_values(self):
+        """
+        Encode lowercase values added since last update
+        """
+        if len(self.lower_values) < len(self.values):
+            new_values = [
+                value.lower().encode() for value in self.values[len(self.lower_values) :]
+            ]
+            self.lower_values = np.concatenate(
+                (self.lower_values, np.array(new_values, dtype=bytes))
+            )
+
+    def search(self, text):
+        """
+        Get rows containing text (case insensitive)
+
+        Args:
+            text (str): searched text
+
+        Returns:
+            numpy.ndarray: bool mask of rows
+        """
+        self.update_lower_values()
+
+        text = text.lower()
+        pattern = text.encode()
+
+        # Longer text (e.g. next typed letter) is searched only in values found last time
+        last_text, last_found = self.last_search
+        if last_text != "" and last_text in text and len(last_found) == len(
+            self.lower_values
+        ):
+            candidates = np.flatnonzero(last_found)
+            found = np.zeros(len(self.lower_values), dtype=bool)
+            found[candidates] = (
+                np.strings.find(self.lower_values[candidates], pattern) >= 0
+            )
+        else:
+            found = np.strings.find(self.lower_values, pattern) >= 0
+
+        self.last_search = (text, found)
+
+        return found[self.rows()]
+
+    def isin(self, keywords, codes=None):
+        """
+        Get rows with value from keywords
+
+        Args:
+            keywords (list): values
+            codes (numpy.ndarray, optional): codes to check instead of rows. Defaults to None.
+
+        Returns:
+            numpy.ndarray: bool mask of rows (or codes)
+        """
+        allowed = np.zeros(len(self.values), dtype=bool)
+        for keyword in keywords:
+            code = self.code_of.get(keyword)
+            if not code is None:
+                allowed[code] = True
+
+        return allowed[self.rows() if codes is None else codes]
+
+    def value_counts(self, mask=None):
+        """
+        Get distinct values present in rows with their numbers of rows (in sort order of values)
+
+        Args:
+            mask (numpy.ndarray, optional): bool mask of rows to count. Defaults to None (all rows).
+
+        Returns:
+            tuple: codes of values (numpy.ndarray) and numbers of rows (numpy.ndarray)
+        """
+        codes = self.rows() if mask is None else self.rows()[mask]
+        counts = np.bincount(codes, minlength=len(self.values))
+
+        if self.ranks is None:
+            self.ranks = self.value_ranks()
+
+        present = np.flatnonzero(counts)
+        present = present[np.argsort(self.ranks[present], kind="stable")]
+
+        return present, counts[present]
+
+    def sort_order(self, descending=False):
+        """
+        Get order of rows sorted by value. Numbers are sorted before dates and dates before texts,
+        rows with equal values keep their order.
+
+        Args:
+            descending (bool, optional): descending order. Defaults to False.
+
+        Returns:
+            numpy.ndarray: rows in sorted order
+        """
+        if self.ranks is None:
+            self.ranks = self.value_ranks()
+
+        ranks = self.ranks[self.rows()]
+        if descending:
+            ranks = -ranks
+
+        return np.argsort(ranks, kind="stable")
+
+    def value_ranks(self):
+        """
+        Rank of every distinct value (equal numbers or dates written in other way have the same rank)
+
+        Returns:
+            numpy.ndarray: ranks
+        """
+        values = pd.Series(self.values, dtype=object)
+        if values.empty:
+            return np.array([], dtype=np.int64)
+
+        numbers, dates = self.parse_values(values)
+
+        kinds = np.where(numbers.notna(), 0, np.where(dates.notna(), 1, 2))
+        numbers = numbers.fillna(0).to_numpy()
+        dates = dates.to_numpy().astype("int64")
+        dates[kinds != 1] = 0
+
+        # Texts are compared only with texts
+        texts = np.zeros(len(values), dtype=np.int64)
+        texts[kinds == 2] = pd.factorize(values[kinds == 2], sort=True)[0]
+
+        keys = np.stack([kinds, numbers, dates, texts]).astype(float)
+        order = np.lexsort(keys[::-1])
+
+        # Rank grows only when sorted key changes
+        sorted_keys = keys[:, order]
+        changed = np.ones(len(order), dtype=bool)
+        changed[1:] = (sorted_keys[:, 1:] != sorted_keys[:, :-1]).any(axis=0)
+
+        ranks = np.empty(len(order), dtype=np.int64)
+        ranks[order] = np.cumsum(changed)
+
+        return ranks
+
+    def parse_values(self, values):
+        """
+        Parse values as numbers (e.g. "1 234,56") and values which are not numbers as dates
+
+        Args:
+            values (pandas.Series): texts
+
+        Returns:
+            tuple: numbers (pandas.Series, NaN if not number) and dates (pandas.Series, NaT if not date)
+        """
+        numbers = pd.to_numeric(
+            values.str.replace(" ", "").str.replace(",", "."), errors="coerce"
+        )
+        dates = pd.to_datetime(
+            values.where(numbers.isna()), format="%d.%m.%Y", errors="coerce"
+        )
+
+        return numbers, dates
@@ -0,0 +1,101 @@
+import numpy as np
+from PySide6.QtCore import *
+
+
+class FilterListModel(QAbstractListModel):
+    """
+    Checkable list of distinct values of column (with number of rows) for header filter menu.
+
+    List view asks only for visible entries, so column with many distinct values does not create
+    widget for every value. Search hides entries with numpy over lowercase values.
+    """
+
+    def __init__(self, values, counts, lower_values, checked):
+        """
+        Args:
+            values (list): distinct values
+            counts (numpy.ndarray): number of rows with every value
+            lower_values (numpy.ndarray): lowercase values (utf-8) to search
+            checked (numpy.ndarray): bool check state of every value
+        """
+        super().__init__()
+
+        self.values = values
+        self.counts = counts
+        self.lower_values = lower_values
+        self.checked = checked
+        self.rows = np.arange(len(values))  # visible entries
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+
+        return len(self.rows)
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.NoItemFlags
+
+        return Qt.ItemIsEnabled | Qt.ItemIsUserCheckable
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+
+        entry = self.rows[index.row()]
+
+        if role == Qt.ItemDataRole.DisplayRole:
+            return "{0} ({1})".format(self.values[entry], self.counts[entry])
+        if role == Qt.ItemDataRole.CheckStateRole:
+            return Qt.Checked if self.checked[entry] else Qt.Unchecked
+
+        return None
+
+    def setData(self, index, value, role=Qt.ItemDataRole.EditRole):
+        if not index.isValid() or role != Qt.ItemDataRole.CheckStateRole:
+            return False
+
+        self.checked[self.rows[index.row()]] = Qt.CheckState(value) == Qt.Checked
+        self.dataChanged.emit(index, index, [role])
+
+        return True
+
+    def set_all_checked(self, checked):
+        """
+        Set check state of all visible entries
+
+        Args:
+            checked (bool): check state
+        """
+        self.checked[self.rows] = checked
+
+        if len(self.rows) > 0:
+            self.dataChanged.emit(
+                self.index(0), self.index(len(self.rows) - 1), [Qt.CheckStateRole]
+            )
+
+    def search(self, text):
+        """
+        Show only entries containing text. Shown entries are checked, hidden ones are unchecked.
+
+        Args:
+            text (str): searched text
+        """
+        found = np.strings.find(self.lower_values, text.lower().encode()) >= 0
+
+        self.beginResetModel()
+        self.rows = np.flatnonzero(found)
+        self.checked = found
+        self.endResetModel()
+
+    def all_checked(self):
+        return bool(self.checked.all())
+
+    def checked_values(self):
+        """
+        Get checked values
+
+        Returns:
+            list: values
+        """
+        return [self.values[entry] for entry in np.flatnonzero(self.checked)]
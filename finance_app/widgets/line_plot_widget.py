@@ -0,0 +1,249 @@
+import numpy as np
+import pandas as pd
+from PySide6.QtCore import *
+from PySide6.QtGui import *
+from PySide6.QtWidgets import *
+from PySide6.QtCharts import (
+    QAreaSeries,
+    QChart,
+    QChartView,
+    QLineSeries,
+    QValueAxis,
+    QDateTimeAxis,
+)
+from finance_app.config import COLORS
+
+
+class LineChart(QWidget):
+    """
+    Line chart widget to display long daily series (e.g. account balance of every day).
+
+    Series is downsampled before drawing: only min and max value of every pixel bucket are drawn,
+    so number of drawn points depends on chart width, not on length of series, and dips are not lost.
+    Two columns can be drawn as shaded band between them (e.g. percentiles of prognosis).
+    """
+
+    def __init__(
+        self,
+        parent,
+        data,
+        title="Line chart",
+        legend=False,
+        x_label=None,
+        y_label=None,
+        colors=COLORS,
+        gridlines=True,
+        tootltip=None,
+        band=None,
+    ):
+        """
+        Args:
+            parent (QWidget): parent widget
+            data (pandas.DataFrame): series to draw (columns) indexed by dates
+            band (tuple, optional): lower and upper column drawn as shaded band. Defaults to None.
+        """
+        super().__init__()
+        self.data = data
+        self.title = title
+        self.legend = legend
+        self.x_label = x_label
+        self.y_label = y_label
+        self.colors = colors
+        self.gridlines = gridlines
+        self.tooltip = tootltip
+        self.band = band
+
+        # Dates as milliseconds since epoch (x values of QDateTimeAxis)
+        self.x_values = (
+            pd.to_datetime(self.data.index).to_numpy().astype("datetime64[ms]")
+        ).astype("int64").astype(float)
+
+        self.init_chart()
+
+    def init_chart(self):
+        """
+        Chart initialize
+        """
+        # Set up the chart
+        self.chart = QChart()
+        self.chart.setTitle(self.title)
+        self.chart.setTitleFont(QFont("Arial", 14))
+        self.chart.setContentsMargins(0, 0, 0, 0)
+        self.chart.legend().hide()
+
+        # Setting tooltip
+        if self.tooltip is not None:
+            self.chart.setToolTip(self.tooltip)
+
+        # Y-axis (range of all values, not only drawn ones)
+        min_val = min(self.data.min().min(), 0)
+        max_val = max(self.data.max().max(), 0)
+
+        self.y_axis = QValueAxis()
+        self.y_axis.setLabelFormat("%.0f")
+        self.y_axis.setRange(min_val, max_val)
+        self.y_axis.applyNiceNumbers()
+        self.y_axis.setGridLineVisible(self.gridlines)
+
+        if self.y_label is not None:
+            self.y_axis.setTitleText(self.y_label)
+            self.y_axis.setTitleFont(QFont("Arial", 11))
+
+        # X-axis
+        self.x_axis = QDateTimeAxis()
+        self.x_axis.setFormat("MM.yyyy")
+        self.x_axis.setGridLineVisible(self.gridlines)
+        if len(self.x_values) > 0:
+            self.x_axis.setRange(
+                QDateTime.fromMSecsSinceEpoch(int(self.x_values[0])),
+                QDateTime.fromMSecsSinceEpoch(int(self.x_values[-1])),
+            )
+
+        if self.x_label is not None:
+            self.x_axis.setTitleText(self.x_label)
+            self.x_axis.setTitleFont(QFont("Arial", 11))
+            self.x_axis.setTitleBrush(QBrush("#666666"))
+
+        self.chart.addAxis(self.x_axis, Qt.AlignmentFlag.AlignBottom)
+        self.chart.addAxis(self.y_axis, Qt.AlignmentFlag.AlignLeft)
+
+        # Band between lower and upper column (drawn under lines)
+        self.band_series = None
+        if self.band is not None:
+            lower_col, upper_col = self.band
+            color = QColor(self.colors.get(upper_col, "#b3dbff"))
+            color.setAlpha(90)
+
+            self.band_lower_series = QLineSeries()
+            self.band_upper_series = QLineSeries()
+            self.band_series = QAreaSeries(
+                self.band_upper_series, self.band_lower_series
+            )
+            self.band_series.setName(f"{lower_col} - {upper_col}")
+            self.band_series.setBrush(QBrush(color))
+            self.band_series.setPen(QPen(color.darker(120), 1))
+
+            self.chart.addSeries(self.band_series)
+            self.band_series.attachAxis(self.x_axis)
+            self.band_series.attachAxis(self.y_axis)
+
+        # Line of every column (without band columns)
+        self.line_series = {}
+        for col in self.data.columns:
+            if self.band is not None and col in self.band:
+                continue
+
+            series = QLineSeries()
+            series.setName(col)
+            series.setPen(QPen(QColor(self.colors.get(col, "#66b8ff")), 2))
+
+            self.chart.addSeries(series)
+            series.attachAxis(self.x_axis)
+            series.attachAxis(self.y_axis)
+
+            self.line_series[col] = series
+
+        # Zero line shows days with balance below zero
+        self.zero_series = None
+        if min_val < 0 and len(self.x_values) > 0:
+            self.zero_series = QLineSeries()
+            self.zero_series.setPen(QPen(QColor("#ff3333"), 1, Qt.PenStyle.DashLine))
+            self.zero_series.append(self.x_values[0], 0)
+            self.zero_series.append(self.x_values[-1], 0)
+
+            self.chart.addSeries(self.zero_series)
+            self.zero_series.attachAxis(self.x_axis)
+            self.zero_series.attachAxis(self.y_axis)
+
+        # Set up the legend
+        if self.legend:
+            self.chart.legend().show()
+            self.chart.legend().setFont(QFont("Arial", 12))
+            if self.zero_series is not None:
+                for marker in self.chart.legend().markers(self.zero_series):
+                    marker.setVisible(False)  # Hide zero line from legend
+
+        # Set up the chart view
+        self.chart_view = QChartView(self.chart)
+        self.chart_view.setRenderHint(QPainter.RenderHint.Antialiasing)
+
+        # Set up the layout
+        layout = QVBoxLayout()
+        layout.addWidget(self.chart_view)
+        layout.setSpacing(0)
+        layout.setContentsMargins(0, 0, 0, 0)
+        self.setLayout(layout)
+
+        self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
+
+        self.update_series()
+
+    def resizeEvent(self, event):
+        """
+        Downsample series again for new chart width
+        """
+        super().resizeEvent(event)
+        self.update_series()
+
+    def update_series(self):
+        """
+        Draw downsampled series (one min/max pair of points for every pixel of plot area)
+        """
+        buckets = max(int(self.chart.plotArea().width()), 100)
+
+        for col, series in self.line_series.items():
+            series.replace(self.series_points(col, buckets))
+
+        if self.band_series is not None:
+            lower_col, upper_col = self.band
+            self.band_lower_series.replace(self.series_points(lower_col, buckets))
+            self.band_upper_series.replace(self.series_points(upper_col, buckets))
+
+    def series_points(self, col, buckets):
+        """
+        Downsampled points of column
+
+        Args:
+            col (str): column name
+            buckets (int): number of buckets
+
+        Returns:
+            list: points to draw
+        """
+        indexes = self.downsample(self.data[col].to_numpy(), buckets)
+        values = self.data[col].to_numpy()[indexes]
+
+        return [
+            QPointF(x_value, y_value)
+            for x_value, y_value in zip(self.x_values[indexes], values)
+        ]
+
+    def downsample(self, values, buckets):
+        """
+        Indexes of min and max value of every bucket (in order of series)
+
+        Args:
+            values (numpy.ndarray): series values
+            buckets (int): number of buckets
+
+        Returns:
+            numpy.ndarray: indexes of values to draw
+        """
+        if len(values) <= 2 * buckets:
+            return np.arange(len(values))
+
+        # Values are split to buckets of equal size (last bucket is padded with last value)
+        size = -(-len(values) // buckets)
+        count = -(-len(values) // size)
+        padded = np.pad(values, (0, count * size - len(values)), mode="edge")
+        padded = padded.reshape(count, size)
+
+        starts = np.arange(count) * size
+        min_indexes = starts + padded.argmin(axis=1)
+        max_indexes = starts + padded.argmax(axis=1)
+
+        indexes = np.sort(np.stack([min_indexes, max_indexes], axis=1), axis=1)
+        indexes = np.minimum(indexes.ravel(), len(values) - 1)
+
+        # First and last day are always drawn
+        return np.unique(np.concatenate(([0], indexes, [len(values) - 1])))
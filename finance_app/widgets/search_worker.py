@@ -0,0 +1,66 @@
+import numpy as np
+from PySide6.QtCore import QObject, QRunnable, Signal, Slot
+
+
+class SearchWorkerSignals(QObject):
+    """
+    Signals of search worker (QRunnable is not QObject, so it can not emit signals itself)
+    """
+
+    finished = Signal(int, object)  # request id, bool mask of rows
+
+
+class SearchWorker(QRunnable):
+    """
+    Table search done in thread pool, so typing in search box is not blocked by large table.
+
+    Text is matched against lowercase distinct values of every column (prebuilt by ColumnIndex),
+    then mapped to rows by codes. Table applies result only if its data was not changed during search.
+    Request superseded by newer one is cancelled: it is not started or its result is not emitted.
+    """
+
+    def __init__(self, request_id, text, columns, row_count):
+        """
+        Args:
+            request_id (int): number of search request
+            text (str): searched text
+            columns (list): lowercase values (utf-8) and codes of rows of every column
+            row_count (int): number of rows
+        """
+        super().__init__()
+
+        self.request_id = request_id
+        self.text = text
+        self.columns = columns
+        self.row_count = row_count
+        self.cancelled = False
+
+        # Worker is kept by table until its result comes
+        self.setAutoDelete(False)
+
+        self.signals = SearchWorkerSignals()
+
+    def cancel(self):
+        """
+        Mark request as superseded
+        """
+        self.cancelled = True
+
+    @Slot()
+    def run(self):
+        """
+        Find rows containing text (case insensitive) and emit their mask
+        """
+        pattern = self.text.lower().encode()
+
+        mask = np.zeros(self.row_count, dtype=bool)
+        for lower_values, codes in self.columns:
+            # Superseded request stops before next column
+            if self.cancelled:
+                return
+
+            found = np.strings.find(lower_values, pattern) >= 0
+            mask |= found[codes]
+
+        if not self.cancelled:
+            self.signals.finished.emit(self.request_id, mask)
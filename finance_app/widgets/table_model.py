@@ -0,0 +1,364 @@
+import bisect
+from PySide6.QtCore import *
+from PySide6.QtGui import *
+
+from finance_app.widgets.column_index import ColumnIndex, format_number
+
+
+class TableModel(QAbstractTableModel):
+    """
+    Table model backed by columns of values (texts as they come from data frame).
+
+    Values are not copied to items: view asks model only for cells of visible rows,
+    and numbers and dates are converted once for every distinct value of column. Every column is kept as ColumnIndex,
+    so search, keyword filters and sorting (done by TableProxyModel) do not loop over rows.
+    Optional id column (first column) keeps operation ids and their check states.
+    Check states are kept as set of toggled ids and inverted flag, so checked rows are got in O(checked)
+    and all rows are checked or inverted in O(1).
+    """
+
+    def __init__(self, headers, font=QFont(), editable=True, id_column=False):
+        """
+        Args:
+            headers (list): header names (with id column header)
+            font (QFont, optional): font of cells. Defaults to QFont().
+            editable (bool, optional): cells can be edited. Defaults to True.
+            id_column (bool, optional): first column is id column. Defaults to False.
+        """
+        super().__init__()
+
+        self.headers = list(headers)
+        self.font = font
+        self.editable = editable
+        self.id_column = id_column
+
+        self.columns = [ColumnIndex([]) for _ in range(self.data_column_count())]
+        self.ids = []  # operation id of every row
+        self.toggled_ids = set()  # ids with check state other than default
+        self.selection_inverted = False  # default check state of rows
+        self.version = 0  # number of changes of values
+
+        # Row of every operation id when index was built, rows removed since then are
+        # kept sorted, so current row is found without rebuilding index after every removal
+        self.row_of_id = None
+        self.removed_rows = []
+
+        self.view_flags = Qt.ItemIsSelectable | Qt.ItemIsEnabled
+        self.edit_flags = Qt.ItemIsSelectable | Qt.ItemIsEditable | Qt.ItemIsEnabled
+        self.check_flags = Qt.ItemIsSelectable | Qt.ItemIsEnabled | Qt.ItemIsUserCheckable
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+
+        return len(self.ids)
+
+    def columnCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+
+        return len(self.headers)
+
+    def data_column_count(self):
+        """
+        Number of columns with values (without id column)
+        """
+        return len(self.headers) - 1 if self.id_column else len(self.headers)
+
+    def is_id_column(self, column):
+        return self.id_column and column == 0
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation != Qt.Orientation.Horizontal:
+            return None
+
+        match role:
+            case Qt.ItemDataRole.DisplayRole:
+                return self.headers[section] if section < len(self.headers) else None
+            case Qt.ItemDataRole.BackgroundRole:
+                return QColor("#e6e6e6")
+            case Qt.ItemDataRole.ForegroundRole:
+                return QColor("#000000")
+
+        return None
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.NoItemFlags
+
+        if self.is_id_column(index.column()):
+            return self.check_flags
+
+        return self.edit_flags if self.editable else self.view_flags
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+
+        row = index.row()
+        column = index.column()
+
+        if self.is_id_column(column):
+            if role == Qt.ItemDataRole.CheckStateRole:
+                return Qt.Checked if self.is_checked(row) else Qt.Unchecked
+            return None
+
+        if role in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole):
+            # Numbers and dates are displayed (and edited) as numbers and dates
+            return self.column_index(column).typed_value(row)
+        if role == Qt.ItemDataRole.UserRole + 1:
+            return self.column_index(column).formatted_value(row)
+        if role == Qt.ItemDataRole.TextAlignmentRole:
+            return Qt.AlignmentFlag.AlignCenter
+        if role == Qt.ItemDataRole.FontRole:
+            return self.font
+
+        return None
+
+    def setData(self, index, value, role=Qt.ItemDataRole.EditRole):
+        if not index.isValid():
+            return False
+
+        row = index.row()
+        column = index.column()
+
+        if self.is_id_column(column):
+            if role != Qt.ItemDataRole.CheckStateRole:
+                return False
+            self.set_checked(self.ids[row], Qt.CheckState(value) == Qt.Checked)
+        else:
+            if role != Qt.ItemDataRole.EditRole or not self.editable:
+                return False
+            self.columns[self.data_column(column)].update(row, self.value_text(value))
+            self.version += 1
+
+        self.dataChanged.emit(index, index, [role])
+        return True
+
+    def data_column(self, column):
+        """
+        Index of values column of table column
+        """
+        return column - 1 if self.id_column else column
+
+    def value(self, row, column):
+        """
+        Get value of cell as it was set in table (e.g. "31.12.2024" for date)
+
+        Args:
+            row (int): table row
+            column (int): table column
+
+        Returns:
+            str: cell value (operation id for id column)
+        """
+        if self.is_id_column(column):
+            return self.ids[row]
+
+        return self.columns[self.data_column(column)].value(row)
+
+    def column_index(self, column):
+        """
+        Get index of values of table column
+
+        Args:
+            column (int): table column
+
+        Returns:
+            ColumnIndex: column values
+        """
+        return self.columns[self.data_column(column)]
+
+    def value_text(self, value):
+        """
+        Convert value from editor to text kept in model
+
+        Args:
+            value: edited value (float, QDate or str)
+
+        Returns:
+            str: value text
+        """
+        if isinstance(value, QDate):
+            return value.toString("dd.MM.yyyy")
+
+        if isinstance(value, float):
+            return format_number(value)
+
+        return str(value)
+
+    def set_values(self, headers, columns, ids):
+        """
+        Replace all values in model
+
+        Args:
+            headers (list): header names (with id column header)
+            columns (list): lists of values of every column (without id column)
+            ids (list): operation id of every row
+        """
+        self.beginResetModel()
+
+        self.headers = list(headers)
+        self.columns = [ColumnIndex(column) for column in columns]
+        self.ids = list(ids)
+        self.toggled_ids = set()
+        self.selection_inverted = False
+        self.row_of_id = None
+        self.version += 1
+
+        self.endResetModel()
+
+    def insert_values(self, row, values, row_id):
+        """
+        Insert row with values
+
+        Args:
+            row (int): position of new row
+            values (list): values of row
+            row_id: operation id of row
+        """
+        self.beginInsertRows(QModelIndex(), row, row)
+
+        for column, value in zip(self.columns, values):
+            column.insert(row, str(value))
+        self.ids.insert(row, row_id)
+
+        # New row is not checked
+        self.set_checked(row_id, False)
+        self.version += 1
+
+        # Row after all rows is found without rebuilding index
+        if not self.row_of_id is None and row == len(self.ids) - 1:
+            self.row_of_id[row_id] = row + len(self.removed_rows)
+        else:
+            self.row_of_id = None
+
+        self.endInsertRows()
+
+    def update_values(self, row, values):
+        """
+        Replace values of row
+
+        Args:
+            row (int): table row
+            values (list): values of row
+        """
+        for column, value in zip(self.columns, values):
+            column.update(row, str(value))
+        self.version += 1
+
+        self.dataChanged.emit(
+            self.index(row, 0), self.index(row, self.columnCount() - 1)
+        )
+
+    def remove_values(self, row):
+        """
+        Remove row
+
+        Args:
+            row (int): table row
+        """
+        self.beginRemoveRows(QModelIndex(), row, row)
+
+        row_id = self.ids[row]
+        for column in self.columns:
+            column.remove(row)
+        del self.ids[row]
+        self.toggled_ids.discard(row_id)
+        self.version += 1
+
+        if not self.row_of_id is None:
+            bisect.insort(self.removed_rows, self.row_of_id.pop(row_id))
+
+        self.endRemoveRows()
+
+    def find_row(self, row_id):
+        """
+        Get row of operation
+
+        Args:
+            row_id: operation id
+
+        Returns:
+            int: row or -1 if operation is not in model
+        """
+        # Index is built again when many rows were removed
+        if self.row_of_id is None or len(self.removed_rows) > 1000:
+            self.row_of_id = {row_id: row for row, row_id in enumerate(self.ids)}
+            self.removed_rows = []
+
+        row = self.row_of_id.get(row_id)
+        if row is None:
+            return -1
+
+        return row - bisect.bisect_left(self.removed_rows, row)
+
+    def is_checked(self, row):
+        return (self.ids[row] in self.toggled_ids) != self.selection_inverted
+
+    def set_checked(self, row_id, checked):
+        """
+        Set check state of operation
+
+        Args:
+            row_id: operation id
+            checked (bool): check state
+        """
+        if checked != self.selection_inverted:
+            self.toggled_ids.add(row_id)
+        else:
+            self.toggled_ids.discard(row_id)
+
+    def checked_ids(self):
+        """
+        Get ids of checked operations in order of rows
+
+        Returns:
+            list: operation ids
+        """
+        if self.selection_inverted:
+            return [row_id for row_id in self.ids if not row_id in self.toggled_ids]
+
+        return sorted(self.toggled_ids, key=self.find_row)
+
+    def check_all(self, checked, row_ids=None):
+        """
+        Set check state of all operations
+
+        Args:
+            checked (bool): check state
+            row_ids (list, optional): ids of operations to change (e.g. only visible). Defaults to None (all).
+        """
+        if row_ids is None:
+            self.selection_inverted = checked
+            self.toggled_ids = set()
+        else:
+            for row_id in row_ids:
+                self.set_checked(row_id, checked)
+
+        self.check_states_changed()
+
+    def invert_checked(self, row_ids=None):
+        """
+        Invert check state of operations
+
+        Args:
+            row_ids (list, optional): ids of operations to change (e.g. only visible). Defaults to None (all).
+        """
+        if row_ids is None:
+            self.selection_inverted = not self.selection_inverted
+        else:
+            self.toggled_ids ^= set(row_ids)
+
+        self.check_states_changed()
+
+    def check_states_changed(self):
+        """
+        Notify view about check states of all rows (only visible ones are drawn again)
+        """
+        if self.id_column and len(self.ids) > 0:
+            self.dataChanged.emit(
+                self.index(0, 0),
+                self.index(len(self.ids) - 1, 0),
+                [Qt.ItemDataRole.CheckStateRole],
+            )
@@ -0,0 +1,271 @@
+import numpy as np
+from PySide6.QtCore import *
+
+
+class TableProxyModel(QAbstractProxyModel):
+    """
+    Filter and sort layer over TableModel.
+
+    Visible rows are kept as array of source rows, built from sort order of column and mask of rows
+    (both counted with numpy by ColumnIndex), so filtering and sorting never loop over rows in Python.
+    Source model is never reordered. Inserted rows are shown, updated rows keep their visibility.
+    """
+
+    def __init__(self):
+        super().__init__()
+
+        self.order = None  # source rows in sorted order (None - order of source model)
+        self.mask = None  # bool mask of visible source rows (None - all rows)
+        self.rows = None  # source row of every proxy row (None - same rows as source)
+        self.positions = None  # proxy row of every source row (-1 - hidden), built on demand
+
+        self.insert_position = 0  # proxy row of rows being inserted
+        self.removed_rows = None  # proxy rows being removed, "reset" if they are not continuous
+
+    def setSourceModel(self, model):
+        super().setSourceModel(model)
+
+        model.modelAboutToBeReset.connect(self.beginResetModel)
+        model.modelReset.connect(self.on_source_reset)
+        model.rowsAboutToBeInserted.connect(self.on_rows_about_to_be_inserted)
+        model.rowsInserted.connect(self.on_rows_inserted)
+        model.rowsAboutToBeRemoved.connect(self.on_rows_about_to_be_removed)
+        model.rowsRemoved.connect(self.on_rows_removed)
+        model.dataChanged.connect(self.on_data_changed)
+        model.headerDataChanged.connect(self.headerDataChanged)
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid() or self.sourceModel() is None:
+            return 0
+
+        if self.rows is None:
+            return self.sourceModel().rowCount()
+
+        return len(self.rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        if parent.isValid() or self.sourceModel() is None:
+            return 0
+
+        return self.sourceModel().columnCount()
+
+    def index(self, row, column, parent=QModelIndex()):
+        if parent.isValid() or not self.hasIndex(row, column, parent):
+            return QModelIndex()
+
+        return self.createIndex(row, column)
+
+    def parent(self, index=QModelIndex()):
+        return QModelIndex()
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        # Headers are not mapped by rows (they are shown even when no row is visible)
+        return self.sourceModel().headerData(section, orientation, role)
+
+    def mapToSource(self, proxy_index):
+        if not proxy_index.isValid():
+            return QModelIndex()
+
+        return self.sourceModel().index(
+            self.source_row(proxy_index.row()), proxy_index.column()
+        )
+
+    def mapFromSource(self, source_index):
+        if not source_index.isValid():
+            return QModelIndex()
+
+        row = self.proxy_row(source_index.row())
+        if row == -1:
+            return QModelIndex()
+
+        return self.index(row, source_index.column())
+
+    def source_row(self, row):
+        """
+        Get source row of proxy row
+
+        Args:
+            row (int): proxy row
+
+        Returns:
+            int: source row
+        """
+        if self.rows is None:
+            return row
+
+        return int(self.rows[row])
+
+    def proxy_row(self, source_row):
+        """
+        Get proxy row of source row
+
+        Args:
+            source_row (int): source row
+
+        Returns:
+            int: proxy row or -1 if row is hidden
+        """
+        if self.rows is None:
+            return source_row
+
+        if self.positions is None:
+            self.positions = np.full(self.sourceModel().rowCount(), -1, dtype=np.int64)
+            self.positions[self.rows] = np.arange(len(self.rows))
+
+        return int(self.positions[source_row])
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        """
+        Sort rows by column (called by view)
+
+        Args:
+            column (int): table column (-1 restores order of source model)
+            order (Qt.SortOrder, optional): sort order. Defaults to Qt.AscendingOrder.
+        """
+        source = self.sourceModel()
+        if column >= source.columnCount() or source.is_id_column(column):
+            return
+
+        if column < 0:
+            self.order = None
+        else:
+            self.order = source.column_index(column).sort_order(
+                order == Qt.DescendingOrder
+            )
+
+        self.update_rows()
+
+    def set_filter(self, mask):
+        """
+        Show only rows from mask
+
+        Args:
+            mask (numpy.ndarray): bool mask of source rows or None to show all rows
+        """
+        self.mask = mask
+        self.update_rows()
+
+    def update_rows(self):
+        """
+        Build visible rows from sort order and mask
+        """
+        self.layoutAboutToBeChanged.emit()
+
+        # Persistent indexes (e.g. current cell) follow their source rows
+        old_indexes = self.persistentIndexList()
+        source_indexes = [
+            (self.source_row(index.row()), index.column()) for index in old_indexes
+        ]
+
+        if self.order is None and self.mask is None:
+            self.rows = None
+        elif self.order is None:
+            self.rows = np.flatnonzero(self.mask)
+        elif self.mask is None:
+            self.rows = self.order
+        else:
+            self.rows = self.order[self.mask[self.order]]
+        self.positions = None
+
+        new_indexes = []
+        for source_row, column in source_indexes:
+            row = self.proxy_row(source_row)
+            new_indexes.append(
+                QModelIndex() if row == -1 else self.index(row, column)
+            )
+        self.changePersistentIndexList(old_indexes, new_indexes)
+
+        self.layoutChanged.emit()
+
+    @Slot()
+    def on_source_reset(self):
+        self.order = None
+        self.mask = None
+        self.rows = None
+        self.positions = None
+
+        self.endResetModel()
+
+    @Slot(QModelIndex, int, int)
+    def on_rows_about_to_be_inserted(self, parent, first, last):
+        # New rows are added at their place in source order or at the end of sorted rows
+        if self.rows is None:
+            self.insert_position = first
+        elif self.order is None:
+            self.insert_position = int(np.searchsorted(self.rows, first))
+        else:
+            self.insert_position = len(self.rows)
+
+        self.beginInsertRows(
+            QModelIndex(), self.insert_position, self.insert_position + last - first
+        )
+
+    @Slot(QModelIndex, int, int)
+    def on_rows_inserted(self, parent, first, last):
+        count = last - first + 1
+        new_rows = np.arange(first, last + 1)
+
+        if not self.rows is None:
+            self.rows = np.where(self.rows >= first, self.rows + count, self.rows)
+            self.rows = np.insert(self.rows, self.insert_position, new_rows)
+        if not self.order is None:
+            self.order = np.where(self.order >= first, self.order + count, self.order)
+            self.order = np.concatenate((self.order, new_rows))
+        if not self.mask is None:
+            self.mask = np.insert(self.mask, first, np.ones(count, dtype=bool))
+        self.positions = None
+
+        self.endInsertRows()
+
+    @Slot(QModelIndex, int, int)
+    def on_rows_about_to_be_removed(self, parent, first, last):
+        rows = [self.proxy_row(row) for row in range(first, last + 1)]
+        rows = [row for row in rows if row != -1]
+
+        if len(rows) == 0:
+            self.removed_rows = None
+        elif rows == list(range(rows[0], rows[0] + len(rows))):
+            self.removed_rows = rows
+            self.beginRemoveRows(QModelIndex(), rows[0], rows[-1])
+        else:
+            self.removed_rows = "reset"
+            self.beginResetModel()
+
+    @Slot(QModelIndex, int, int)
+    def on_rows_removed(self, parent, first, last):
+        count = last - first + 1
+
+        if not self.rows is None:
+            self.rows = self.rows[(self.rows < first) | (self.rows > last)]
+            self.rows = np.where(self.rows > last, self.rows - count, self.rows)
+        if not self.order is None:
+            self.order = self.order[(self.order < first) | (self.order > last)]
+            self.order = np.where(self.order > last, self.order - count, self.order)
+        if not self.mask is None:
+            self.mask = np.delete(self.mask, np.arange(first, last + 1))
+        self.positions = None
+
+        if self.removed_rows == "reset":
+            self.endResetModel()
+        elif not self.removed_rows is None:
+            self.endRemoveRows()
+        self.removed_rows = None
+
+    @Slot(QModelIndex, QModelIndex, list)
+    def on_data_changed(self, top_left, bottom_right, roles=[]):
+        if top_left.row() == bottom_right.row():
+            row = self.proxy_row(top_left.row())
+            if row == -1:
+                return
+            first, last = row, row
+        else:
+            # Changed rows can be anywhere in proxy
+            first, last = 0, self.rowCount() - 1
+            if last < 0:
+                return
+
+        self.dataChanged.emit(
+            self.index(first, top_left.column()),
+            self.index(last, bottom_right.column()),
+            roles,
+        )
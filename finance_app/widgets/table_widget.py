@@ -1,16 +1,33 @@
+import numpy as np
+import pandas as pd
 from PySide6.QtCore import *
 from PySide6.QtGui import *
 from PySide6.QtWidgets import *
-from finance_app.config import ASCENDING_ICON, DESCENDING_ICON, FILTER_ICON
+from finance_app.config import (
+    ASCENDING_ICON,
+    DESCENDING_ICON,
+    FILTER_ICON,
+    SEARCH_DELAY,
+)
 
-from finance_app.widgets import CheckBoxWidget, is_date, is_number
+from finance_app.widgets import CheckBoxWidget
+from finance_app.widgets.filter_list_model import FilterListModel
+from finance_app.widgets.search_worker import SearchWorker
+from finance_app.widgets.table_model import TableModel
+from finance_app.widgets.table_proxy_model import TableProxyModel
 
 
-class TableWidget(QTableWidget):
+class TableWidget(QTableView):
     """
-    Custom Table Widget with possibility to clear, add and get data from table.
+    Custom Table View with possibility to clear, add and get data from table.
+
+    Data is kept in TableModel, so only visible rows are drawn (no items or widgets are created for rows).
+    View shows TableProxyModel: search and header filters are masks of rows and rows are sorted
+    without reordering data. Rows in methods of table are rows of view.
     """
 
+    cellDoubleClicked = Signal(int, int)  # row, column
+
     def __init__(
         self,
         parent=None,
@@ -25,6 +42,7 @@ class TableWidget(QTableWidget):
         val_formatter="double",
         val_formatter_col_disable=None,
         id_column=False,
+        query_filter=None,
     ):
         super().__init__()
 
@@ -39,19 +57,35 @@ class TableWidget(QTableWidget):
         self.val_formatter = val_formatter
         self.val_formatter_col_disable = val_formatter_col_disable
         self.id_column = id_column
+        self.query_filter = query_filter  # optional method returning ids of operations matching keywords
 
         if self.id_column:
             self.col_num += 1
             self.header_names = [""] + self.header_names
 
-        self.id_checkboxes = []  # list of checkboxes in ID column
-
         self.col = 0
         self.filter_num = 0  # current filter num
-        self.keywords = dict([[i, []] for i in range(self.columnCount())])
+        self.search_mask = None  # rows matching search text
+        self.keyword_mask = None  # rows matching header filters
+
+        # Distinct values with numbers of rows for header filter menu
+        self.value_counts = {}
+        self.value_counts_version = None
+
+        # Search text is matched in background after typing stops
+        self.thread_pool = QThreadPool.globalInstance()
+        self.search_text = ""
+        self.search_request = None  # search in progress
+        self.last_search_id = 0
+
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(SEARCH_DELAY)
+        self.search_timer.timeout.connect(self.start_search)
+        self.keywords = dict([[i, []] for i in range(self.col_num)])
 
         self.rounded_style = """
-            QTableWidget {
+            QTableView {
                 border: 1px solid #999999;
                 border-radius: 5px;
                 background-color: #FFFFFF;
@@ -72,17 +106,13 @@ class TableWidget(QTableWidget):
                 border-width: 1px; 
                 border-radius: 1px; 
             }
-            QTableWidget::indicator{
+            QTableView::indicator{
                 width:15px;
                 height:15px;
                 margin: 5px 5px 5px 5px;
             }
         """
 
-        self.view_flags = Qt.ItemIsSelectable | Qt.ItemIsEnabled
-
-        self.edit_flags = Qt.ItemIsSelectable | Qt.ItemIsEditable | Qt.ItemIsEnabled
-
         self.init_table()
 
     def init_table(self):
@@ -90,10 +120,16 @@ class TableWidget(QTableWidget):
         Initialize table
         """
         # Set basic table variables
-        self.setRowCount(self.row_num)
-        self.setColumnCount(self.col_num)
+        self.table_model = TableModel(
+            self.header_names,
+            font=self.text_font,
+            editable=self.editable,
+            id_column=self.id_column,
+        )
+        self.proxy_model = TableProxyModel()
+        self.proxy_model.setSourceModel(self.table_model)
+        self.setModel(self.proxy_model)
         self.setFont(self.text_font)
-        self.setHorizontalHeaderLabels(self.header_names)
         self.horizontalHeader().setMinimumHeight(40)
 
         self.setContentsMargins(0, 0, 0, 0)
@@ -105,109 +141,88 @@ class TableWidget(QTableWidget):
 
         # Set table beahaviour
         self.verticalHeader().setVisible(False)
-        self.resizeRowsToContents()
         self.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
         self.verticalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
         self.setWordWrap(True)  # Zawijanie tekstu
-        self.setVerticalScrollMode(QTableWidget.ScrollPerPixel)
+        self.setVerticalScrollMode(QTableView.ScrollPerPixel)
         self.setVerticalScrollBarPolicy(Qt.ScrollBarAsNeeded)
         self.verticalHeader().setDefaultSectionSize(40)
 
         # Table setyle
         self.setStyleSheet(self.rounded_style)
 
-        # Set headerers
-        for header in range(self.horizontalHeader().count()):
-            header_item = self.horizontalHeaderItem(header)
-            header_item.setBackground(QColor("#e6e6e6"))
-            header_item.setForeground(QColor("#000000"))
-            self.setHorizontalHeaderItem(header, header_item)
+        # Add data if provided (or empty rows)
+        if self.data is not None:
+            self.set_data(self.header_names, self.data)
+        else:
+            self.table_model.set_values(
+                self.header_names,
+                [[""] * self.row_num for _ in range(self.table_model.data_column_count())],
+                range(self.row_num),
+            )
 
         if self.id_column:
-            for row in range(self.rowCount()):
-                check_box_widget = QWidget()
-                check_box_laout = QHBoxLayout(check_box_widget)
-                check_box = CheckBoxWidget(
-                    widget_text=row,
-                    is_text_hidden=True,
-                    hidden_propert_name="id_operation",
-                )
-                check_box_laout.addWidget(
-                    check_box, alignment=Qt.AlignmentFlag.AlignCenter
-                )
+            self.hideColumn(0)
+            self.horizontalHeader().setSectionsClickable(True)
+            self.horizontalHeader().sectionClicked.connect(self.on_id_header_click)
 
-                self.id_checkboxes.append(check_box)
+        self.setContentsMargins(0, 0, 0, 0)
 
-                self.setCellWidget(row, 0, check_box_widget)
+        self.doubleClicked.connect(self.on_double_click)
 
-            self.horizontalHeader().setSectionResizeMode(
-                0, QHeaderView.ResizeMode.ResizeToContents
-            )
+        if self.filtering:
+            self.horizontalHeader().sectionClicked.connect(self.on_header_click)
+            self.keywords = dict([[i, []] for i in range(self.columnCount())])
 
-            self.hideColumn(0)
+    def rowCount(self):
+        return self.proxy_model.rowCount()
 
-        # Add data if provided
-        if self.data is not None:
-            for row in self.data.index:
-                for column in range(len(self.data.columns)):
-                    value = self.data.iloc[row, column]
-                    item = QTableWidgetItem()
-                    item.setFlags(self.view_flags)
-                    if self.editable:
-                        item.setFlags(self.edit_flags)
-                    item.setFont(self.text_font)
-
-                    # Set value display role (for sorting)
-                    if is_number(value):  # number
-                        number = float(value.replace(",", ".").replace(" ", ""))
-
-                        # Value formatting
-                        if number.is_integer():
-                            formatted_number = f"{int(number):,}".replace(",", " ")
-                        else:
-                            formatted_number = f"{number:,.2f}".replace(
-                                ",", " "
-                            ).replace(".", ",")
-
-                        # Actual data
-                        item.setData(Qt.ItemDataRole.UserRole + 1, formatted_number)
-
-                        # Edit role data for sorting
-                        item.setData(
-                            Qt.ItemDataRole.EditRole,
-                            number,
-                        )
-
-                    elif is_date(value, "%d.%m.%Y"):  # date
-                        item.setData(Qt.ItemDataRole.UserRole + 1, value)
-
-                        value = value.split(".")
-                        value = QDate(int(value[2]), int(value[1]), int(value[0]))
-
-                        item.setData(
-                            Qt.ItemDataRole.EditRole,
-                            value,
-                        )
-
-                    else:
-                        item.setData(Qt.ItemDataRole.UserRole + 1, value)
-                        item.setData(
-                            Qt.ItemDataRole.EditRole,
-                            value,
-                        )
-
-                    item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-
-                    if self.id_column:
-                        self.setItem(row, column + 1, item)
-                    else:
-                        self.setItem(row, column, item)
+    def columnCount(self):
+        return self.table_model.columnCount()
 
-        self.setContentsMargins(0, 0, 0, 0)
+    def on_double_click(self, index):
+        """
+        Emit row and column of double clicked cell
+
+        Args:
+            index (QModelIndex): clicked cell
+        """
+        self.cellDoubleClicked.emit(index.row(), index.column())
+
+    def set_data(self, headers, data):
+        """
+        Set headers and data frame values in model
 
+        Args:
+            headers (list): header names (with id column header)
+            data (pandas.DataFrame): data to show, index contains operation ids
+        """
+        # Model reset shows hidden columns again
+        hidden_columns = [
+            column
+            for column in range(self.columnCount())
+            if self.isColumnHidden(column)
+        ]
+
+        self.table_model.set_values(
+            headers,
+            [data[column].astype(str).tolist() for column in data.columns],
+            data.index,
+        )
+
+        for column in hidden_columns:
+            if column < self.columnCount():
+                self.hideColumn(column)
+
+        # Lowercase texts are ready before first search
         if self.filtering:
-            self.horizontalHeader().sectionClicked.connect(self.on_header_click)
-            self.keywords = dict([[i, []] for i in range(self.columnCount())])
+            for column in self.table_model.columns:
+                column.update_lower_values()
+
+        if self.id_column:
+            self.horizontalHeader().setSectionResizeMode(
+                0, QHeaderView.ResizeMode.ResizeToContents
+            )
 
     def update_headers(self, headers):
         """
@@ -217,15 +232,10 @@ class TableWidget(QTableWidget):
             headers (list): headers to add to table
         """
         self.col_num = len(headers)
-        self.setColumnCount(len(headers))  # Col num
-        self.setHorizontalHeaderLabels(headers)  # Setting header names
-
-        # Formatting headers
-        for header in range(self.horizontalHeader().count()):
-            header_item = self.horizontalHeaderItem(header)
-            header_item.setBackground(QColor("#e6e6e6"))
-            header_item.setForeground(QColor("#000000"))
-            self.setHorizontalHeaderItem(header, header_item)
+        self.table_model.headers = list(headers)
+        self.table_model.headerDataChanged.emit(
+            Qt.Orientation.Horizontal, 0, len(headers) - 1
+        )
 
     def update_table(self, data):
         """
@@ -239,92 +249,16 @@ class TableWidget(QTableWidget):
             self.setSortingEnabled(False)
 
         # Update columns in table
-        if self.id_column:
-            columns = [""]
-            columns.extend(data.columns)
-            self.update_headers(columns)
-            columns = None
-        else:
-            self.update_headers(data.columns)
-
-        self.setRowCount(len(data.index))  # Set row num
-
-        self.id_checkboxes = []
-
-        for row in range(self.rowCount()):
-            # for column in range(len(data.columns)):
-            for column in range(self.columnCount()):
-
-                if self.id_column and column == 0:
-                    check_box_widget = QWidget()
-                    check_box_laout = QHBoxLayout(check_box_widget)
-                    check_box = CheckBoxWidget(
-                        widget_text=row,
-                        is_text_hidden=True,
-                        hidden_propert_name="id_operation",
-                    )
-                    check_box_laout.addWidget(
-                        check_box, alignment=Qt.AlignmentFlag.AlignCenter
-                    )
-
-                    self.id_checkboxes.append(check_box)
-
-                    self.setCellWidget(row, 0, check_box_widget)
-
-                else:
-                    item = QTableWidgetItem()
-                    value = data.iloc[row, column - (1 if self.id_column else 0)]
-
-                    item.setFlags(self.view_flags)
-                    if self.editable:
-                        item.setFlags(self.edit_flags)
-                    item.setFont(self.text_font)
-
-                    item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-
-                    # Set value display role (for sorting)
-                    if is_number(value):  # number
-                        number = float(value.replace(",", ".").replace(" ", ""))
-
-                        # Value formatting
-                        if number.is_integer():
-                            formatted_number = f"{int(number):,}".replace(",", " ")
-                        else:
-                            formatted_number = f"{number:,.2f}".replace(
-                                ",", " "
-                            ).replace(".", ",")
-
-                        # Actual data
-                        item.setData(Qt.ItemDataRole.UserRole + 1, formatted_number)
-
-                        # Edit role data for sorting
-                        item.setData(
-                            Qt.ItemDataRole.EditRole,
-                            number,
-                        )
-
-                    elif is_date(value, "%d.%m.%Y"):  # date
-                        # Actual data
-                        item.setData(Qt.ItemDataRole.UserRole + 1, value)
-
-                        value = value.split(".")
-                        value = QDate(int(value[2]), int(value[1]), int(value[0]))
-
-                        # Edit role data for sorting
-                        item.setData(
-                            Qt.ItemDataRole.EditRole,
-                            value,
-                        )
-
-                    else:  # Other values
-                        item.setData(Qt.ItemDataRole.UserRole + 1, value)
-                        item.setData(
-                            Qt.ItemDataRole.EditRole,
-                            value,
-                        )
-                    self.setItem(row, column, item)
+        columns = [""] if self.id_column else []
+        columns.extend(data.columns)
+        self.col_num = len(columns)
+
+        self.set_data(columns, data)
 
         self.data = data
+        self.cancel_search()
+        self.search_mask = None
+        self.keyword_mask = None
 
         # Enabling sorting
         if self.sorting:
@@ -335,9 +269,103 @@ class TableWidget(QTableWidget):
         Delete data from table
         """
         self.row_num = 0
-        self.setRowCount(self.row_num)
+        self.table_model.set_values(
+            self.table_model.headers,
+            [[] for _ in range(self.table_model.data_column_count())],
+            [],
+        )
 
         self.data = None
+        self.cancel_search()
+        self.search_mask = None
+        self.keyword_mask = None
+
+    def find_row(self, row_id):
+        """
+        Get current table row of operation
+
+        Args:
+            row_id: operation id
+
+        Returns:
+            int: table row or -1 if operation is not in table (or it is filtered out)
+        """
+        row = self.table_model.find_row(row_id)
+        if row == -1:
+            return -1
+
+        return self.proxy_model.proxy_row(row)
+
+    def insert_row(self, row, values, row_id):
+        """
+        Insert new row to table
+
+        Args:
+            row (int): position of new row
+            values (list): values to display
+            row_id: id of operation in row
+        """
+        sorting = self.isSortingEnabled()
+        if sorting:
+            self.setSortingEnabled(False)
+
+        # Row at position of view row (or after all rows)
+        if row < self.rowCount():
+            row = self.proxy_model.source_row(row)
+        else:
+            row = self.table_model.rowCount()
+
+        self.table_model.insert_values(row, values, row_id)
+
+        # Masks follow source rows (new row is shown, as in proxy model)
+        if not self.search_mask is None:
+            self.search_mask = np.insert(self.search_mask, row, True)
+        if not self.keyword_mask is None:
+            self.keyword_mask = np.insert(self.keyword_mask, row, True)
+
+        if sorting:
+            self.setSortingEnabled(True)
+
+    def update_row(self, row_id, values):
+        """
+        Update values in row of operation
+
+        Args:
+            row_id: operation id
+            values (list): values to display
+        """
+        # Filtered out row is updated too
+        row = self.table_model.find_row(row_id)
+        if row == -1:
+            return
+
+        sorting = self.isSortingEnabled()
+        if sorting:
+            self.setSortingEnabled(False)
+
+        self.table_model.update_values(row, values)
+
+        if sorting:
+            self.setSortingEnabled(True)
+
+    def remove_row(self, row_id):
+        """
+        Remove row of operation from table
+
+        Args:
+            row_id: operation id
+        """
+        row = self.table_model.find_row(row_id)
+        if row == -1:
+            return
+
+        self.table_model.remove_values(row)
+
+        # Masks follow source rows
+        if not self.search_mask is None:
+            self.search_mask = np.delete(self.search_mask, row)
+        if not self.keyword_mask is None:
+            self.keyword_mask = np.delete(self.keyword_mask, row)
 
     def show_column(self, col_num):
         if self.isColumnHidden(col_num):
@@ -345,15 +373,90 @@ class TableWidget(QTableWidget):
         else:
             self.hideColumn(col_num)
 
+    def get_row_id(self, row):
+        """
+        Get id of operation displayed in row
+
+        Args:
+            row (int): table row
+
+        Returns:
+            operation id
+        """
+        return self.table_model.ids[self.proxy_model.source_row(row)]
+
+    def get_value(self, row, column):
+        """
+        Get value of cell as it was set in table (e.g. "31.12.2024" for date)
+
+        Args:
+            row (int): table row
+            column (int): table column
+
+        Returns:
+            str: cell value
+        """
+        return self.table_model.value(self.proxy_model.source_row(row), column)
+
     def get_selected_rows(self):
-        selected_rows = []
+        return self.table_model.checked_ids()
+
+    def visible_ids(self):
+        """
+        Get ids of operations in rows not filtered out
 
-        for row in range(self.rowCount()):
-            row_widget = self.cellWidget(row, 0).findChild(QCheckBox)
-            if row_widget.isChecked():
-                selected_rows.append(row_widget.get_hidden_property())
+        Returns:
+            list: operation ids or None if no row is filtered out
+        """
+        if self.proxy_model.mask is None:
+            return None
+
+        ids = self.table_model.ids
+        return [ids[row] for row in self.proxy_model.rows]
 
-        return selected_rows
+    def select_all_rows(self, checked=True):
+        """
+        Check (or uncheck) all visible rows in id column
+
+        Args:
+            checked (bool, optional): check state. Defaults to True.
+        """
+        self.table_model.check_all(checked, self.visible_ids())
+
+    def invert_selected_rows(self):
+        """
+        Invert check state of all visible rows in id column
+        """
+        self.table_model.invert_checked(self.visible_ids())
+
+    def on_id_header_click(self, column):
+        """
+        Menu of id column header with selection of all rows
+
+        Args:
+            column (int): clicked column
+        """
+        if column != 0:
+            return
+
+        self.selection_menu = QMenu(self)
+        self.selection_menu.setStyleSheet(
+            """
+            QMenu{
+            border: 1px solid #b5c0c9;
+            border-radius:10px;}
+            """
+        )
+        self.selection_menu.addAction("Select all", self.select_all_rows)
+        self.selection_menu.addAction(
+            "Unselect all", lambda: self.select_all_rows(False)
+        )
+        self.selection_menu.addAction("Invert selection", self.invert_selected_rows)
+
+        headerPos = self.mapToGlobal(self.horizontalHeader().pos())
+        posY = headerPos.y() + self.horizontalHeader().height()
+        posX = headerPos.x() + self.horizontalHeader().sectionPosition(column)
+        self.selection_menu.exec(QPoint(posX, posY))
 
     def filter(self, filter_text):
         """
@@ -363,21 +466,119 @@ class TableWidget(QTableWidget):
         Args:
             filter_text (str): Text to search in table
         """
-        col_list = range(self.columnCount())
-        if self.id_column:
-            col_list = range(1, self.columnCount())
+        self.cancel_search()
+
+        self.search_mask = None
+        if filter_text != "":
+            first_column = 1 if self.id_column else 0
+            self.search_mask = np.zeros(self.table_model.rowCount(), dtype=bool)
+            for column in range(first_column, self.columnCount()):
+                self.search_mask |= self.table_model.column_index(column).search(
+                    filter_text
+                )
+
+        self.apply_filters()
 
-        for i in range(self.rowCount()):
-            for j in col_list:
-                item = self.item(i, j)
+    def search(self, filter_text):
+        """
+        Filter table by text when typing stops. Text is searched in thread pool,
+        only result of last typed text is shown.
+
+        Args:
+            filter_text (str): Text to search in table
+        """
+        # Cleared text shows all rows at once
+        if filter_text == "":
+            self.filter(filter_text)
+            return
+
+        self.cancel_search()
+
+        self.search_text = filter_text
+        self.search_timer.start()
+
+    @Slot()
+    def start_search(self):
+        """
+        Start search of last typed text in thread pool
+        """
+        self.cancel_search()
+
+        # Worker gets lowercase values and codes of rows of every column
+        first_column = 1 if self.id_column else 0
+        columns = []
+        for column in range(first_column, self.columnCount()):
+            column_index = self.table_model.column_index(column)
+            column_index.update_lower_values()
+            columns.append((column_index.lower_values, column_index.rows()))
+
+        self.last_search_id += 1
+        worker = SearchWorker(
+            self.last_search_id,
+            self.search_text,
+            columns,
+            self.table_model.rowCount(),
+        )
+        worker.signals.finished.connect(self.search_finished)
+
+        self.search_request = {
+            "id": self.last_search_id,
+            "worker": worker,
+            "version": self.table_model.version,
+        }
+        self.thread_pool.start(worker)
+
+    def cancel_search(self):
+        """
+        Cancel search waiting for typing to stop or in progress
+        """
+        self.search_timer.stop()
 
-                # Check if cell text matches filtered text
-                match = filter_text.lower() not in item.text().lower()
+        if self.search_request is None:
+            return
 
-                # Hide row
-                self.setRowHidden(i, match)
-                if not match:
-                    break
+        # Worker waiting in queue is removed, running worker will not emit result
+        worker = self.search_request.get("worker")
+        worker.cancel()
+        self.thread_pool.tryTake(worker)
+
+        self.search_request = None
+
+    @Slot(int, object)
+    def search_finished(self, request_id, mask):
+        """
+        Show rows found in background (results of superseded requests are skipped)
+
+        Args:
+            request_id (int): number of search request
+            mask (numpy.ndarray): bool mask of rows containing text
+        """
+        if self.search_request is None or self.search_request.get("id") != request_id:
+            return
+
+        version = self.search_request.get("version")
+        self.search_request = None
+
+        # Rows changed during search are searched again
+        if version != self.table_model.version:
+            self.start_search()
+            return
+
+        self.search_mask = mask
+        self.apply_filters()
+
+    def apply_filters(self):
+        """
+        Show rows matching both search text and header filters
+        """
+        if self.search_mask is None:
+            mask = self.keyword_mask
+        elif self.keyword_mask is None:
+            mask = self.search_mask
+        else:
+            mask = self.search_mask & self.keyword_mask
+
+        self.proxy_model.set_filter(mask)
 
     def on_header_click(self, column):
         """
@@ -386,11 +587,9 @@ class TableWidget(QTableWidget):
             - List with possible options for filtering
             - Ok and cancel buttons
         """
-        # Unique values for filter list
-        data_unique = []
-
-        # Check box list
-        self.check_boxes = []
+        # Id column has its own menu
+        if self.id_column and column == 0:
+            return
 
         # Column which method was invoked from
         self.col = column
@@ -477,7 +676,7 @@ class TableWidget(QTableWidget):
         sort_layout.addWidget(search_and_clear_widget, 0)
         sort_layout.addWidget(self.horizontal_line, 0)
 
-        # Layout with checkboxes for filtering
+        # Layout with list of values for filtering
         filter_widget = QWidget(self)
         check_box_layout = QVBoxLayout(filter_widget)
 
@@ -485,83 +684,35 @@ class TableWidget(QTableWidget):
         self.select_all_box = CheckBoxWidget(
             widget_text="Select all", checked=True, box_style="small"
         )
-        self.select_all_box.stateChanged.connect(self.select_all)
-
-        check_box_layout.addWidget(self.select_all_box, 0)
-
-        # Setting number of columns with filters applied
-        filtered_column_count = 0
-        for key in self.keywords.keys():
-            column_keywords = self.keywords.get(key)
-            if len(column_keywords) > 0 and key != column:
-                filtered_column_count += 1
-
-        # Row list to filter
-        row_list = range(self.rowCount())
-
-        # Add check boxes for options in choosen column
-        for row in row_list:  # iterate through all rows
-            filter_count = 0
-
-            # Check if item in column (not in current menu col) and row is in keywords
-            if self.filter_num > 0:
-                for col_num in list(self.keywords.keys())[1:]:
-                    item = self.item(row, col_num)  # get item
-
-                    if (
-                        item.text() in self.keywords.get(col_num)
-                        and len(self.keywords.get(col_num)) > 0
-                        and col_num != column
-                    ):
-                        filter_count += 1
-
-            item = self.item(row, column)  # get item
-
-            # Create checkbox if it is not in unique list
-            if item.text() not in data_unique and filter_count == filtered_column_count:
-                data_unique.append(item.text())
-
-                # Checkbox widget
-                check_box = CheckBoxWidget(
-                    widget_text=item.text(), checked=True, box_style="small"
-                )
-
-                # Block state change signal in widget select_all_box
-                blocker = QSignalBlocker(self.select_all_box)
-                blocker.reblock()
-
-                # Uncheck box if item text is not in in keywords
-                if (item.text() not in self.keywords.get(column)) and (
-                    len(self.keywords.get(column)) > 0
-                ):
-
-                    check_box.setChecked(False)
-                    self.select_all_box.setChecked(False)
-
-                # Unblock state change signal in widget select_all_box
-                blocker.unblock()
-                del blocker
 
-                self.check_boxes.append(check_box)
-                check_box_layout.addWidget(check_box, 0)
+        # Distinct values of column (only rows matching filters of other columns)
+        self.filter_list_model = self.get_filter_list_model(column)
+        self.select_all_box.setChecked(self.filter_list_model.all_checked())
+        self.select_all_box.stateChanged.connect(self.select_all)
 
-        # Spacer for button layout
-        spacer = QSpacerItem(2, 2, QSizePolicy.Expanding, QSizePolicy.Expanding)
-        check_box_layout.addItem(spacer)
+        # List view draws only visible values and lays out long list in batches
+        self.filter_list = QListView()
+        self.filter_list.setUniformItemSizes(True)
+        self.filter_list.setLayoutMode(QListView.Batched)
+        self.filter_list.setBatchSize(500)
+        self.filter_list.setModel(self.filter_list_model)
+        self.filter_list.setVerticalScrollBarPolicy(Qt.ScrollBarAlwaysOn)
+        self.filter_list.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.filter_list.setMinimumHeight(150)
+        self.filter_list.setMaximumHeight(245)
 
-        # Create scroll area
-        scroll_area = QScrollArea()
+        check_box_layout.addWidget(self.select_all_box, 0)
+        check_box_layout.addWidget(self.filter_list, 0)
 
-        # Set Vertical and Horizontal scroll bar visibility
-        scroll_area.setVerticalScrollBarPolicy(Qt.ScrollBarAlwaysOn)
-        scroll_area.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
-        scroll_area.setWidgetResizable(True)  # set scroll area as resizable
-        scroll_area.setWidget(filter_widget)  # set widget for scroll area
-        scroll_area.setMaximumHeight(245)
-        scroll_area.setStyleSheet(
+        self.filter_list.setStyleSheet(
             """
-            QScrollArea{
+            QListView{
                 border: 0px;
+                font-size: 10pt;
+            }
+            QListView::indicator{
+                width: 15px;
+                height: 15px;
             }
 
             /* SCROLLBAR STYLE*/
@@ -667,7 +818,7 @@ class TableWidget(QTableWidget):
         sort_action.setCheckable(True)
 
         filter_action = QWidgetAction(self)
-        filter_action.setDefaultWidget(scroll_area)
+        filter_action.setDefaultWidget(filter_widget)
         filter_action.setCheckable(True)
 
         btn_action = QWidgetAction(self)
@@ -684,6 +835,60 @@ class TableWidget(QTableWidget):
         posX = headerPos.x() + self.horizontalHeader().sectionPosition(column)
         self.filter_menu.exec(QPoint(posX, posY))
 
+    def get_filter_list_model(self, column):
+        """
+        Create list of distinct values of column with numbers of rows.
+        Values are counted once per data version and filters of other columns.
+
+        Args:
+            column (int): table column
+
+        Returns:
+            FilterListModel: values of column
+        """
+        column_index = self.table_model.column_index(column)
+
+        # Counted values are valid until data is changed
+        if self.value_counts_version != self.table_model.version:
+            self.value_counts = {}
+            self.value_counts_version = self.table_model.version
+
+        other_keywords = tuple(
+            (other_column, tuple(column_keywords))
+            for other_column, column_keywords in self.keywords.items()
+            if other_column != column and len(column_keywords) > 0
+        )
+        key = (column, other_keywords)
+
+        if not key in self.value_counts:
+            # Only rows matching filters of other columns
+            mask = None
+            for other_column, column_keywords in other_keywords:
+                column_mask = self.table_model.column_index(other_column).isin(
+                    column_keywords
+                )
+                mask = column_mask if mask is None else mask & column_mask
+
+            self.value_counts[key] = column_index.value_counts(mask)
+
+        codes, counts = self.value_counts[key]
+
+        # Values are checked if column is not filtered or they are in keywords
+        column_keywords = self.keywords.get(column, [])
+        if len(column_keywords) == 0:
+            checked = np.ones(len(codes), dtype=bool)
+        else:
+            checked = column_index.isin(column_keywords, codes)
+
+        column_index.update_lower_values()
+
+        return FilterListModel(
+            [column_index.values[code] for code in codes],
+            counts,
+            column_index.lower_values[codes],
+            checked,
+        )
+
     def select_all(self, state):
         """
         Select all chechboxes in menu with "Selectl all" box
@@ -691,8 +896,7 @@ class TableWidget(QTableWidget):
         Args:
             state (check state): state of select all checkbox
         """
-        for checkbox in self.check_boxes:
-            checkbox.setChecked(Qt.Checked == Qt.CheckState(state))
+        self.filter_list_model.set_all_checked(Qt.Checked == Qt.CheckState(state))
 
     def filter_data(self):
         """
@@ -704,63 +908,47 @@ class TableWidget(QTableWidget):
 
 
         """
-        # Checked keywords from menu
-        col_keywords = []
-
         # Setting filtration list with choosen value from menu
-        checked_checkboxes = 0
-        for element in self.check_boxes:
-            if element.isChecked():
-                col_keywords.append(element.text())
-                checked_checkboxes += 1
-
-        self.keywords[self.col] = col_keywords
-
-        # Setting number of columns with filters applied
-        filtered_column_count = 0
-
-        for column in self.keywords.keys():
-            column_keywords = self.keywords.get(column)
-            if len(column_keywords) > 0:
-                filtered_column_count += 1
-
-        # List of rows to check
-        row_list = range(self.rowCount())
-
-        # List of columns to check
-        col_list = range(self.columnCount())
-        if self.id_column:
-            col_list = range(1, self.columnCount())
+        self.keywords[self.col] = self.filter_list_model.checked_values()
 
         self.filter_num += 1
 
-        for i in row_list:
-            # Number of filtered columns in row
-            show_row = 0
-            for j in col_list:
-                item = self.item(i, j)
-
-                # Check if item text is in filtration list for column
-                if item.text() in self.keywords.get(j):
-                    show_row += 1
-
-            # Show row if number of filteres meets number of filtered columns in whole table
-            if show_row == filtered_column_count:
-                self.showRow(i)
-            else:
-                self.hideRow(i)
-
         # Clear keywords for column if all checkboxes are checked
-        if checked_checkboxes == len(self.check_boxes):
+        if self.filter_list_model.all_checked():
             self.keywords[self.col] = []
             self.filter_num -= 1
 
+        keywords = {
+            column: column_keywords
+            for column, column_keywords in self.keywords.items()
+            if len(column_keywords) > 0
+        }
+
+        if len(keywords) == 0:
+            self.keyword_mask = None
+        elif self.query_filter is not None:
+            # Ids of operations matching keywords are found by query (e.g. indexed database query)
+            visible_ids = self.query_filter(keywords)
+            self.keyword_mask = pd.Index(self.table_model.ids).isin(visible_ids)
+        else:
+            # Row is shown if its values are in keywords of every filtered column
+            self.keyword_mask = np.ones(self.table_model.rowCount(), dtype=bool)
+            for column, column_keywords in keywords.items():
+                self.keyword_mask &= self.table_model.column_index(column).isin(
+                    column_keywords
+                )
+
+        self.apply_filters()
+
     def clear_filters(self):
         """
         Clear all current filteres and set all show all rows
         """
-        for i in range(self.rowCount()):
-            self.setRowHidden(i, False)
+        self.keywords = dict([[i, []] for i in range(self.columnCount())])
+        self.filter_num = 0
+
+        self.keyword_mask = None
+        self.apply_filters()
 
     def search_menu(self, filter_text):
         """
@@ -769,21 +957,18 @@ class TableWidget(QTableWidget):
         Args:
             filter_text (string): filtration text
         """
-        for checkbox in self.check_boxes:
-            if filter_text.lower() in checkbox.text().lower():
-                checkbox.show()
-                checkbox.setChecked(True)
-                if self.select_all_box.isChecked():
-                    self.select_all_box.setChecked(False)
-            else:
-                checkbox.hide()
-                checkbox.setChecked(False)
+        self.filter_list_model.search(filter_text)
+
+        # Shown values are checked
+        blocker = QSignalBlocker(self.select_all_box)
+        self.select_all_box.setChecked(self.filter_list_model.rowCount() > 0)
+        blocker.unblock()
 
     def menu_close(self):
         """
         Close menu event.
         Table is filtered and menu is closed.
         """
-        if len(self.check_boxes) > 1:
+        if len(self.filter_list_model.values) > 1:
             self.filter_data()
         self.filter_menu.close()
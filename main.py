@@ -20,7 +20,14 @@ from finance_app import (
     AppSettings,
     AddTransaction,
     ErrorBox,
+    TransactionJournal,
+    SqliteStorage,
+    TransactionStore,
     center_window,
+    new_operation_id,
+    parse_operation,
+    format_date,
+    book_occurrence,
 )
 from finance_app.config import *
 
@@ -39,11 +46,19 @@ class MainWindow(QMainWindow):
         self.settings_check = False
         self.user_categories = None
         self.user_categories_path = None
-        self.user_transactions = None
         self.user_transactions_path = None
-        self.user_upcomings = None
         self.user_upcomings_path = None
 
+        # Operations shared by all sections
+        self.transactions_store = None
+        self.upcomings_store = None
+
+        # User data storage (JSON journals or SQLite database tables)
+        self.database = None
+        self.categories_storage = None
+        self.transactions_storage = None
+        self.upcomings_storage = None
+
         self.check_user_settings()
 
     def init_window(self):
@@ -144,9 +159,9 @@ class MainWindow(QMainWindow):
         # Creating app sections
         self.main_section = MainSection(
             user_settings=self.user_settings,
-            user_transactions=self.user_transactions,
+            transactions_store=self.transactions_store,
             user_transactions_path=self.user_transactions_path,
-            user_upcomings=self.user_upcomings,
+            upcomings_store=self.upcomings_store,
             user_upcomings_path=self.user_upcomings_path,
         )
         self.categories_section = CategoriesSection(
@@ -158,26 +173,28 @@ class MainWindow(QMainWindow):
         self.history_section = HistorySection(
             current_acc_balance=self.user_settings.get("CURRENT_ACCOUNT_BALANCE"),
             currency=self.user_settings.get("CURRENCY"),
-            user_transactions=self.user_transactions,
+            transactions_store=self.transactions_store,
             user_transactions_path=self.user_transactions_path,
             user_categories=self.user_categories,
+            database=self.database,
         )
         self.history_section.update_transaction.connect(self.get_transaction)
 
         self.upcoming_section = UpcomingSection(
             current_acc_balance=self.user_settings.get("CURRENT_ACCOUNT_BALANCE"),
             currency=self.user_settings.get("CURRENCY"),
-            user_upcomings=self.user_upcomings,
+            upcomings_store=self.upcomings_store,
             user_upcomings_path=self.user_upcomings_path,
             user_categories=self.user_categories,
+            transactions_store=self.transactions_store,
         )
         self.upcoming_section.update_transaction.connect(self.get_transaction)
 
         self.analysis_section = AnalysisSection(
             user_settings=self.user_settings,
-            user_transactions=self.user_transactions,
+            transactions_store=self.transactions_store,
             user_transactions_path=self.user_transactions_path,
-            user_upcomings=self.user_upcomings,
+            upcomings_store=self.upcomings_store,
             user_upcomings_path=self.user_upcomings_path,
             user_categories=self.user_categories,
         )
@@ -293,7 +310,7 @@ class MainWindow(QMainWindow):
 
                 self.init_window()
 
-                if not self.user_transactions is None:
+                if not self.transactions_store.operations is None:
                     self.update_acc_bal()
         else:
             self.sign_in()
@@ -303,24 +320,73 @@ class MainWindow(QMainWindow):
         Loading user data stored in user choosen folder
         """
         user_folder = self.user_settings.get("USER_FOLDER")
+        database_path = os.path.join(user_folder, USER_DATABASE)
 
-        # User categories
         self.user_categories_path = os.path.join(user_folder, USER_CATEGORIES)
-        if os.path.exists(self.user_categories_path):
-            with open(self.user_categories_path, "r") as file:
-                self.user_categories = json.load(file)
-
-        # User transactions
         self.user_transactions_path = os.path.join(user_folder, USER_TRANSACTIONS)
-        if os.path.exists(self.user_transactions_path):
-            with open(self.user_transactions_path, "r") as file:
-                self.user_transactions = json.load(file)
-
-        # User upcoming operations
         self.user_upcomings_path = os.path.join(user_folder, USER_UPCOMING_OPER)
-        if os.path.exists(self.user_upcomings_path):
-            with open(self.user_upcomings_path, "r") as file:
-                self.user_upcomings = json.load(file)
+
+        match self.user_settings.get("STORAGE_BACKEND", "JSON"):
+            case "SQLite":
+                # Database with one-shot migration from JSON files
+                self.database = SqliteStorage(database_path)
+                if not self.database.is_migrated():
+                    self.database.migrate(user_folder)
+
+                self.categories_storage = self.database.table("categories")
+                self.transactions_storage = self.database.table("transactions")
+                self.upcomings_storage = self.database.table("upcomings")
+            case _:
+                # Move data back to JSON files if user switched from database
+                if os.path.exists(database_path):
+                    database = SqliteStorage(database_path)
+                    database.export(user_folder)
+                    database.close()
+                    os.remove(database_path)
+
+                # Snapshot files with journals replayed
+                self.categories_storage = TransactionJournal(self.user_categories_path)
+                self.transactions_storage = TransactionJournal(
+                    self.user_transactions_path
+                )
+                self.upcomings_storage = TransactionJournal(self.user_upcomings_path)
+
+        # User data
+        self.user_categories = self.categories_storage.load()
+        self.transactions_store = TransactionStore(
+            self.migrate_operations(
+                self.transactions_storage.load(), self.transactions_storage
+            )
+        )
+        self.upcomings_store = TransactionStore(
+            self.migrate_operations(self.upcomings_storage.load(), self.upcomings_storage)
+        )
+
+    def migrate_operations(self, operations, storage):
+        """
+        One-shot migration of operations saved with text dates and amounts (e.g. "31.12.2024", "1 234,56")
+        to day ordinals and amounts in minor units. Migrated data is rewritten to storage.
+
+        Args:
+            operations (dict): loaded operations
+            storage (TransactionJournal | SqliteTable): operations storage
+
+        Returns:
+            dict: operations with typed values
+        """
+        if operations is None or all(
+            isinstance(operation.get("2_date"), int)
+            and isinstance(operation.get("6_amount"), int)
+            for operation in operations.values()
+        ):
+            return operations
+
+        operations = {
+            key: parse_operation(operation) for key, operation in operations.items()
+        }
+        storage.rewrite(operations)
+
+        return operations
 
     def sign_in(self):
         """
@@ -379,7 +445,7 @@ class MainWindow(QMainWindow):
     def get_transaction(self, transaction, type):
         """
         Method used for transaction data manipulation and database updating.
-        During update all needed databases, tables and charts are updated with new information.
+        Stores emit change signals, so sections patch only table rows and plots of changed operations.
 
         Args:
             transaction (dict): information abaout transaction provided by the user
@@ -394,221 +460,120 @@ class MainWindow(QMainWindow):
         oper_type = type.split("-")[0]
         match oper_type:
             case "Upcoming":
-                if self.user_upcomings is None:
-                    self.user_upcomings = {"0": transaction}
-                else:
-                    self.user_upcomings.update(
-                        {str(len(self.user_upcomings.keys())): transaction}
-                    )
+                key = new_operation_id()
+                self.upcomings_store.insert(key, transaction)
 
-                # Update file
-                with open(self.user_upcomings_path, "w") as file:
-                    json.dump(self.user_upcomings, file)
-
-                # Update information in sections
-                self.main_section.update_operations(self.user_upcomings, type)
-                self.analysis_section.update_operations(self.user_upcomings, type)
-                self.upcoming_section.update_upcoming_oper(self.user_upcomings)
+                # Update journal
+                self.upcomings_storage.insert(key, transaction)
+                self.upcomings_storage.checkpoint(self.upcomings_store.operations)
             case "Delete":
                 match type.split("-")[1]:
                     case "Upcoming":
                         # Delete upcoming transaction
-                        for key in transaction.keys():
-                            self.user_upcomings.pop(key)
-                        # self.user_upcomings.pop(list(transaction.keys())[0])
-
-                        # Update upcomings dict keys
-                        new_key = 0
-
-                        temp_list = list(self.user_upcomings.items())
-                        self.user_upcomings.clear()
-                        for key, value in temp_list:
-                            self.user_upcomings[str(new_key)] = value
-                            new_key += 1
-
-                        # Update file
-                        with open(self.user_upcomings_path, "w") as file:
-                            json.dump(self.user_upcomings, file)
-
-                        # Update information in sections
-                        self.main_section.update_operations(
-                            self.user_upcomings, "Upcoming"
-                        )
-                        self.analysis_section.update_operations(
-                            self.user_upcomings, "Upcoming"
-                        )
+                        self.upcomings_store.delete(transaction.keys())
 
-                        self.upcoming_section.update_upcoming_oper(self.user_upcomings)
+                        # Update journal
+                        self.upcomings_storage.delete(transaction.keys())
+                        self.upcomings_storage.checkpoint(self.upcomings_store.operations)
 
                     case _:
                         # Delete transaction from expense/income
-                        for key in transaction.keys():
-                            self.user_transactions.pop(key)
-
-                        # Update expense/income dict keys
-                        new_key = 0
-
-                        temp_list = list(self.user_transactions.items())
-                        self.user_transactions.clear()
-                        for key, value in temp_list:
-                            self.user_transactions[str(new_key)] = value
-                            new_key += 1
+                        self.transactions_store.delete(transaction.keys())
 
-                        # Save file
-                        with open(self.user_transactions_path, "w") as file:
-                            json.dump(self.user_transactions, file)
-
-                        self.main_section.update_operations(
-                            self.user_transactions, "Transaction"
-                        )
-                        self.analysis_section.update_operations(
-                            self.user_transactions, "Transaction"
+                        # Update journal
+                        self.transactions_storage.delete(transaction.keys())
+                        self.transactions_storage.checkpoint(
+                            self.transactions_store.operations
                         )
-                        self.history_section.update_operations(self.user_transactions)
+
+                        # Update account balance labels
                         self.update_acc_bal()
 
             case "Update":
                 match type.split("-")[1]:
                     case "Upcoming":
-                        self.user_upcomings.update(transaction)
-
-                        # Update file
-                        with open(self.user_upcomings_path, "w") as file:
-                            json.dump(self.user_upcomings, file)
+                        for key, value in transaction.items():
+                            self.upcomings_store.update(key, value)
 
-                        # Update information in sections
-                        self.main_section.update_operations(self.user_upcomings, type)
-                        self.analysis_section.update_operations(
-                            self.user_upcomings, type
-                        )
-                        self.upcoming_section.update_upcoming_oper(self.user_upcomings)
+                            # Update journal
+                            self.upcomings_storage.update(key, value)
+                        self.upcomings_storage.checkpoint(self.upcomings_store.operations)
 
                     case "Transaction":
-                        self.user_transactions.update(transaction)
-
-                        # Update file
-                        with open(self.user_transactions_path, "w") as file:
-                            json.dump(self.user_transactions, file)
+                        for key, value in transaction.items():
+                            self.transactions_store.update(key, value)
 
-                        # Update information in sections
-                        self.main_section.update_operations(
-                            self.user_transactions, type
+                            # Update journal
+                            self.transactions_storage.update(key, value)
+                        self.transactions_storage.checkpoint(
+                            self.transactions_store.operations
                         )
-                        self.analysis_section.update_operations(
-                            self.user_transactions, type
-                        )
-                        self.history_section.update_operations(self.user_transactions)
+
+                        # Update account balance labels
                         self.update_acc_bal()
                     case "UpcomingtoTransaction":
-                        # Delete upcoming transaction
-                        self.user_upcomings.pop(list(transaction.keys())[0])
-
-                        # Add transaction to the end of expense/income list
-                        self.user_transactions.update(
-                            {
-                                str(
-                                    len(self.user_transactions.keys())
-                                ): transaction.get(list(transaction.keys())[0])
-                            }
+                        key = list(transaction.keys())[0]
+                        upcoming = self.upcomings_store.get(key)
+
+                        if upcoming.get("7_recurrence"):
+                            # Booked occurrence gets new id, rule skips it
+                            transaction_key = new_operation_id()
+                            upcoming = book_occurrence(upcoming)
+
+                            # Rule is deleted when its end date has passed
+                            if upcoming is None:
+                                self.upcomings_store.delete([key])
+                                self.upcomings_storage.delete([key])
+                            else:
+                                self.upcomings_store.update(key, upcoming)
+                                self.upcomings_storage.update(key, upcoming)
+                        else:
+                            # Move upcoming to the end of expense/income list (it keeps its id)
+                            transaction_key = key
+                            self.upcomings_store.delete([key])
+                            self.upcomings_storage.delete([key])
+                        self.upcomings_storage.checkpoint(self.upcomings_store.operations)
+
+                        self.transactions_store.insert(
+                            transaction_key, transaction.get(key)
                         )
-
-                        # Update upcomings dict keys
-                        new_key = 0
-
-                        temp_list = list(self.user_upcomings.items())
-                        self.user_upcomings.clear()
-                        for key, value in temp_list:
-                            self.user_upcomings[str(new_key)] = value
-                            new_key += 1
-
-                        # Update files
-                        with open(self.user_upcomings_path, "w") as file:
-                            json.dump(self.user_upcomings, file)
-
-                        with open(self.user_transactions_path, "w") as file:
-                            json.dump(self.user_transactions, file)
-
-                        # Update information in sections
-                        self.main_section.update_operations(
-                            self.user_upcomings, "Upcoming"
-                        )
-                        self.main_section.update_operations(
-                            self.user_transactions, "Transaction"
+                        self.transactions_storage.insert(
+                            transaction_key, transaction.get(key)
                         )
-                        self.analysis_section.update_operations(
-                            self.user_upcomings, "Upcoming"
+                        self.transactions_storage.checkpoint(
+                            self.transactions_store.operations
                         )
-                        self.analysis_section.update_operations(
-                            self.user_transactions, "Transaction"
-                        )
-                        self.upcoming_section.update_upcoming_oper(self.user_upcomings)
-                        self.history_section.update_operations(self.user_transactions)
+
+                        # Update account balance labels
                         self.update_acc_bal()
 
                     case "TransactiontoUpcoming":
-                        # Delete transaction from expense/income
-                        self.user_transactions.pop(list(transaction.keys())[0])
-
-                        # Add transaction to the end of upcoming list
-                        self.user_upcomings.update(
-                            {
-                                str(len(self.user_upcomings.keys())): transaction.get(
-                                    list(transaction.keys())[0]
-                                )
-                            }
-                        )
-
-                        # Update expense/income dict keys
-                        new_key = 0
-
-                        temp_list = list(self.user_transactions.items())
-                        self.user_transactions.clear()
-                        for key, value in temp_list:
-                            self.user_transactions[str(new_key)] = value
-                            new_key += 1
-
-                        # Update files
-                        with open(self.user_upcomings_path, "w") as file:
-                            json.dump(self.user_upcomings, file)
-
-                        with open(self.user_transactions_path, "w") as file:
-                            json.dump(self.user_transactions, file)
-
-                        # Update information in sections
-                        self.main_section.update_operations(
-                            self.user_upcomings, "Upcoming"
-                        )
-                        self.main_section.update_operations(
-                            self.user_transactions, "Transaction"
+                        # Move transaction to the end of upcoming list (it keeps its id)
+                        key = list(transaction.keys())[0]
+                        self.transactions_store.delete([key])
+                        self.upcomings_store.insert(key, transaction.get(key))
+
+                        # Update journals
+                        self.transactions_storage.delete([key])
+                        self.transactions_storage.checkpoint(
+                            self.transactions_store.operations
                         )
 
-                        self.analysis_section.update_operations(
-                            self.user_upcomings, "Upcoming"
-                        )
-                        self.analysis_section.update_operations(
-                            self.user_transactions, "Transaction"
-                        )
+                        self.upcomings_storage.insert(key, transaction.get(key))
+                        self.upcomings_storage.checkpoint(self.upcomings_store.operations)
 
-                        self.upcoming_section.update_upcoming_oper(self.user_upcomings)
-                        self.history_section.update_operations(self.user_transactions)
+                        # Update account balance labels
                         self.update_acc_bal()
 
             case _:
-                if self.user_transactions is None:
-                    self.user_transactions = {"0": transaction}
-                else:
-                    self.user_transactions.update(
-                        {str(len(self.user_transactions.keys())): transaction}
-                    )
+                key = new_operation_id()
+                self.transactions_store.insert(key, transaction)
 
-                # Update files
-                with open(self.user_transactions_path, "w") as file:
-                    json.dump(self.user_transactions, file)
+                # Update journal
+                self.transactions_storage.insert(key, transaction)
+                self.transactions_storage.checkpoint(self.transactions_store.operations)
 
-                # Update information in sections
-                self.main_section.update_operations(self.user_transactions, type)
-                self.analysis_section.update_operations(self.user_transactions, type)
-                self.history_section.update_operations(self.user_transactions)
+                # Update account balance labels
                 self.update_acc_bal()
 
         # Update analysis if auto run is set to True
@@ -642,47 +607,31 @@ class MainWindow(QMainWindow):
                 self.analysis_section.update_categories(self.user_categories)
                 self.categories_section.update_categories(self.user_categories)
 
-                # Update categories file
-                with open(self.user_categories_path, "w") as file:
-                    json.dump(self.user_categories, file)
+                # Update categories storage
+                self.categories_storage.update(number, category)
+                self.categories_storage.checkpoint(self.user_categories)
 
                 # Update categories names (if changed) in transaction/upcomings
                 if new_cat_name != old_cat_name:
-                    # Update transactions
-                    if not self.user_transactions is None:
-                        for key, value in self.user_transactions.items():
-                            if value.get("5_category") == old_cat_name:
-                                value["5_category"] = new_cat_name
-                                self.user_transactions[key] = value
-
-                        with open(self.user_transactions_path, "w") as file:
-                            json.dump(self.user_transactions, file)
-
-                        self.main_section.update_operations(
-                            self.user_transactions, "Transaction"
-                        )
-                        self.analysis_section.update_operations(
-                            self.user_transactions, "Transaction"
-                        )
-                        self.history_section.update_operations(self.user_transactions)
-
-                    if not self.user_upcomings is None:
-                        # Update upcomings
-                        for key, value in self.user_upcomings.items():
+                    # Update transactions and upcomings
+                    for store, storage in [
+                        (self.transactions_store, self.transactions_storage),
+                        (self.upcomings_store, self.upcomings_storage),
+                    ]:
+                        if store.operations is None:
+                            continue
+
+                        # Renamed operations are saved in one write
+                        renamed = {}
+                        for key, value in list(store.operations.items()):
                             if value.get("5_category") == old_cat_name:
-                                value["5_category"] = new_cat_name
-                                self.user_upcomings[key] = value
+                                value = dict(value, **{"5_category": new_cat_name})
+                                store.update(key, value)
+                                renamed[key] = value
 
-                        with open(self.user_upcomings_path, "w") as file:
-                            json.dump(self.user_upcomings, file)
-
-                        self.main_section.update_operations(
-                            self.user_upcomings, "Upcoming"
-                        )
-                        self.analysis_section.update_operations(
-                            self.user_transactions, "Transaction"
-                        )
-                        self.upcoming_section.update_upcoming_oper(self.user_upcomings)
+                        if len(renamed) > 0:
+                            storage.update_many(renamed)
+                            storage.checkpoint(store.operations)
 
             case "Delete":
                 # Delete categories
@@ -705,19 +654,19 @@ class MainWindow(QMainWindow):
                 self.analysis_section.update_categories(self.user_categories)
                 self.categories_section.update_categories(self.user_categories)
 
-                # Update categories file
-                with open(self.user_categories_path, "w") as file:
-                    json.dump(self.user_categories, file)
+                # Update categories storage
+                self.categories_storage.delete(number, renumber=True)
+                self.categories_storage.checkpoint(self.user_categories)
             case _:  # New category
                 if self.user_categories is None:
-                    self.user_categories = {"0": category}
-                else:
-                    self.user_categories.update(
-                        {str(len(self.user_categories.keys())): category}
-                    )
+                    self.user_categories = {}
+
+                key = str(len(self.user_categories.keys()))
+                self.user_categories[key] = category
 
-                with open(self.user_categories_path, "w") as file:
-                    json.dump(self.user_categories, file)
+                # Update categories storage
+                self.categories_storage.insert(key, category)
+                self.categories_storage.checkpoint(self.user_categories)
 
                 # Update information in sections
                 self.history_section.user_categories = self.user_categories
@@ -733,34 +682,14 @@ class MainWindow(QMainWindow):
         last_transaction = datetime.today().strftime("%d-%m-%Y")
         curr_acc_bal = self.user_settings.get("CURRENT_ACCOUNT_BALANCE")
 
-        if not self.user_transactions is None and len(self.user_transactions) > 0:
-            # Data prep
-            temp_transactions = pd.DataFrame(self.user_transactions).T.reset_index(
-                drop=True
-            )
-            temp_transactions["6_amount"] = temp_transactions["6_amount"].apply(
-                lambda x: float(x.replace(" ", "").replace(",", "."))
-            )
+        if not self.transactions_store.is_empty():
+            # Date of the latest transaction
+            last_transaction = format_date(self.transactions_store.last_date())
 
-            # Last transaction date
-            last_transaction = temp_transactions["2_date"].iloc[-1]
-
-            # Calculate current account balance
-            transaction_summary = temp_transactions.groupby(["4_type"])[
-                "6_amount"
-            ].sum()
-            income = (
-                0
-                if "Income" not in transaction_summary.index.values
-                else transaction_summary.loc["Income"]
-            )
-            expense = (
-                0
-                if "Expense" not in transaction_summary.index.values
-                else transaction_summary.loc["Expense"]
-            )
+            # Running balance kept by store
             curr_acc_bal = round(
-                self.user_settings.get("CURRENT_ACCOUNT_BALANCE") + (income - expense),
+                self.user_settings.get("CURRENT_ACCOUNT_BALANCE")
+                + self.transactions_store.balance_change / 100,
                 2,
             )
 
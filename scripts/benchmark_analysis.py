@@ -0,0 +1,348 @@
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+import numpy as np
+import pandas as pd
+from datetime import date, datetime
+from dateutil.relativedelta import relativedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from finance_app.config import SAMPLE_CATEGORIES
+from finance_app.modules.analysis_calculation import Analysis
+from finance_app.modules.transaction_store import TransactionStore
+from finance_app.utils import operations_to_frame
+
+# Columns used by analysis
+COLUMNS = ["1_name", "2_date", "4_type", "5_category", "6_amount"]
+
+# Analysis range used in benchmark
+DATE_FROM = datetime(2020, 1, 1)
+DATE_TO = datetime(2024, 12, 31)
+MAIN_CATEGORY = "Home"
+
+
+def create_operations(size, seed=1):
+    """
+    Create random transactions dict in store format
+
+    Args:
+        size (int): number of transactions
+        seed (int, optional): random seed. Defaults to 1.
+
+    Returns:
+        dict: transactions
+    """
+    random = np.random.default_rng(seed)
+    categories = [category.get("Name") for category in SAMPLE_CATEGORIES.values()]
+
+    first_day = date(2020, 1, 1).toordinal()
+    days = random.integers(first_day, first_day + 5 * 365, size)
+    category_ids = random.integers(0, len(categories), size)
+    amounts = random.integers(100, 500000, size)
+    incomes = random.random(size) < 0.1
+
+    return {
+        str(key): {
+            "1_name": f"Operation {key % 50}",
+            "2_date": int(days[key]),
+            "3_vendor": f"Vendor {key % 20}",
+            "4_type": "Income" if incomes[key] else "Expense",
+            "5_category": categories[category_ids[key]],
+            "6_amount": int(amounts[key]),
+        }
+        for key in range(size)
+    }
+
+
+def legacy_categorical(transactions, date_from, date_to, category):
+    """
+    Categorical analysis as it was made before (row-wise on all transactions)
+    """
+    transactions = transactions.copy()
+    transactions = transactions[
+        (transactions["2_date"] >= date_from) & (transactions["2_date"] <= date_to)
+    ]
+
+    transactions["Year-month"] = transactions["2_date"].apply(
+        lambda x: x.strftime("%Y-%m")
+    )
+    transactions = transactions[
+        (transactions["4_type"] == "Expense")
+        & (transactions["5_category"].str.contains(category))
+    ].drop("4_type", axis=1)
+
+    transactions = (
+        transactions.groupby(["Year-month", "5_category"])["6_amount"]
+        .sum()
+        .reset_index(drop=False)
+    )
+
+    transactions["5_category"] = transactions["5_category"].apply(
+        lambda x: x.split(" - ")[-1]
+    )
+
+    result_table = pd.pivot_table(
+        transactions,
+        values="6_amount",
+        index="Year-month",
+        columns="5_category",
+        aggfunc="sum",
+        fill_value=0,
+    ).reset_index(drop=False)
+    result_table["Summary"] = result_table.iloc[:, 1:].sum(axis=1)
+
+    return result_table.round(2)
+
+
+def legacy_aggregate(transactions, date_from, date_to):
+    """
+    Aggregate analysis as it was made before (row-wise on all transactions)
+    """
+    transactions = transactions.copy()
+    transactions = transactions[
+        (transactions["2_date"] >= date_from) & (transactions["2_date"] <= date_to)
+    ]
+
+    transactions["Year-month"] = transactions["2_date"].apply(
+        lambda x: x.strftime("%Y-%m")
+    )
+
+    transactions = (
+        transactions.groupby(["Year-month", "4_type"])["6_amount"]
+        .sum()
+        .reset_index(drop=False)
+    )
+
+    expense = transactions[transactions["4_type"] == "Expense"].drop("4_type", axis=1)
+    expense.columns = ["Year-month", "Expense"]
+    income = transactions[transactions["4_type"] == "Income"].drop("4_type", axis=1)
+    income.columns = ["Year-month", "Income"]
+
+    result_table = transactions["Year-month"].drop_duplicates()
+    result_table = pd.merge(left=result_table, right=income, how="left", on="Year-month")
+    result_table = pd.merge(
+        left=result_table, right=expense, how="left", on="Year-month"
+    ).fillna(0)
+
+    result_table["Difference"] = result_table["Income"] - result_table["Expense"]
+
+    result_table["Savings %"] = (
+        1 - result_table["Expense"] / result_table["Income"]
+    ) * 100
+    result_table["Savings %"] = np.where(
+        result_table["Savings %"] < 0, 0, result_table["Savings %"]
+    )
+
+    return result_table.round(2)
+
+
+def legacy_table(result_table):
+    """
+    Table formatting as it was made before (every cell separately)
+    """
+    data_to_table = result_table.copy()
+    for col in data_to_table.columns:
+        data_to_table[col] = data_to_table[col].apply(
+            lambda x: str(x).replace(".", ",")
+        )
+    return data_to_table
+
+
+def measure(function, repeat):
+    """
+    Best time of function calls
+
+    Args:
+        function (callable): measured function
+        repeat (int): number of calls
+
+    Returns:
+        tuple: best time in miliseconds and function result
+    """
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            result = function()
+        elapsed = (time.perf_counter() - start) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+
+    return best, result
+
+
+def analysis(store, analysis_type, transactions=None):
+    """
+    Analysis made the way AnalysisSection makes it now
+    """
+    main_categories = {
+        category.get("Name"): category.get("1_Main Category")
+        for category in SAMPLE_CATEGORIES.values()
+    }
+
+    monthly_summary = None
+    if analysis_type != "Prognosis":
+        monthly_summary = store.monthly_summary.frame(
+            DATE_FROM.strftime("%Y-%m"), DATE_TO.strftime("%Y-%m")
+        )
+    elif transactions is None:
+        last_date = datetime.fromordinal(store.last_date())
+        transactions = store.frame_between(
+            last_date + relativedelta(day=1), last_date + relativedelta(day=31), COLUMNS
+        ).reset_index(drop=True)
+
+    return Analysis(
+        analysis_type=analysis_type,
+        date_from=DATE_FROM,
+        date_to=DATE_TO + relativedelta(years=2),
+        transactions=transactions,
+        category=MAIN_CATEGORY,
+        main_categories=main_categories,
+        account_balance=1000.0,
+        average_revenue=6000.0,
+        average_spendings=3000.0,
+        monthly_summary=monthly_summary,
+    )
+
+
+def benchmark(size, repeat):
+    """
+    Compare previous and current analysis for number of transactions
+
+    Args:
+        size (int): number of transactions
+        repeat (int): number of calls of every measured function
+
+    Returns:
+        list: result rows (analysis, previous time, current time)
+    """
+    operations = create_operations(size)
+
+    start = time.perf_counter()
+    store = TransactionStore(operations)
+    load_time = (time.perf_counter() - start) * 1000
+
+    transactions = operations_to_frame(store.operations, COLUMNS).reset_index(
+        drop=True
+    )
+
+    rows = [["Store load (once)", None, load_time]]
+
+    # Categorical
+    legacy_time, legacy_result = measure(
+        lambda: legacy_categorical(transactions, DATE_FROM, DATE_TO, MAIN_CATEGORY),
+        repeat,
+    )
+    current_time, current_result = measure(
+        lambda: analysis(store, "Categorical").result_table, repeat
+    )
+    pd.testing.assert_frame_equal(
+        legacy_result, current_result, check_dtype=False, check_names=False
+    )
+    rows.append(["Categorical", legacy_time, current_time])
+
+    # Categorical for every main category: previously calculated for every category,
+    # now pivot of all categories is calculated once and sliced
+    main_categories = list(
+        dict.fromkeys(
+            category.get("1_Main Category") for category in SAMPLE_CATEGORIES.values()
+        )
+    )
+    legacy_time, legacy_results = measure(
+        lambda: [
+            legacy_categorical(transactions, DATE_FROM, DATE_TO, main_category)
+            for main_category in main_categories
+        ],
+        repeat,
+    )
+
+    def sliced_categorical():
+        categorical = analysis(store, "Categorical")
+        results = []
+        for main_category in main_categories:
+            categorical.set_category(main_category)
+            results.append(categorical.result_table)
+        return results
+
+    current_time, current_results = measure(sliced_categorical, repeat)
+    for legacy_result, current_result in zip(legacy_results, current_results):
+        pd.testing.assert_frame_equal(
+            legacy_result, current_result, check_dtype=False, check_names=False
+        )
+    rows.append(["Categorical (every category)", legacy_time, current_time])
+
+    # Aggregate
+    legacy_time, legacy_result = measure(
+        lambda: legacy_aggregate(transactions, DATE_FROM, DATE_TO), repeat
+    )
+    current_time, current_result = measure(
+        lambda: analysis(store, "Aggregate").result_table, repeat
+    )
+    pd.testing.assert_frame_equal(legacy_result, current_result, check_dtype=False)
+    rows.append(["Aggregate", legacy_time, current_time])
+
+    # Prognosis after change in store: previously frame with all transactions was built,
+    # now only transactions from month of the latest transaction are converted
+    legacy_time, legacy_result = measure(
+        lambda: analysis(
+            store,
+            "Prognosis",
+            operations_to_frame(store.operations, COLUMNS).reset_index(drop=True),
+        ).result_table,
+        repeat,
+    )
+    current_time, current_result = measure(
+        lambda: analysis(store, "Prognosis").result_table, repeat
+    )
+    pd.testing.assert_frame_equal(legacy_result, current_result)
+    rows.append(["Prognosis (after change)", legacy_time, current_time])
+
+    # Table formatting
+    with contextlib.redirect_stdout(io.StringIO()):
+        aggregate = analysis(store, "Aggregate")
+    legacy_time, legacy_result = measure(
+        lambda: legacy_table(aggregate.result_table), repeat
+    )
+    current_time, current_result = measure(aggregate.get_data_to_table, repeat)
+    pd.testing.assert_frame_equal(legacy_result, current_result)
+    rows.append(["Table formatting", legacy_time, current_time])
+
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark of analysis calculations for growing number of transactions"
+    )
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=[10_000, 100_000, 1_000_000],
+        help="numbers of transactions",
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=3, help="calls of every measured function"
+    )
+    args = parser.parse_args()
+
+    for size in args.sizes:
+        print(f"\n{size:,} transactions".replace(",", " "))
+        print(f"{'':34}{'previous [ms]':>15}{'current [ms]':>15}{'speedup':>10}")
+
+        for name, legacy_time, current_time in benchmark(size, args.repeat):
+            if legacy_time is None:
+                print(f"{name:34}{'':>15}{current_time:>15.1f}")
+                continue
+
+            print(
+                f"{name:34}{legacy_time:>15.1f}{current_time:>15.1f}"
+                + f"{legacy_time / current_time:>9.0f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,13 @@
+import pytest
+
+from finance_app.utils import is_amount, parse_amount
+
+
+@pytest.mark.parametrize("value", ["", ",", "abc", "nan", "inf", "1e999999999"])
+def test_not_valid_amount(value):
+    assert not is_amount(value)
+
+
+def test_valid_amount():
+    assert is_amount("1 234,56")
+    assert parse_amount("1 234,56") == 123456
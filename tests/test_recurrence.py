@@ -0,0 +1,48 @@
+from datetime import date
+
+from finance_app.utils import book_occurrence, parse_date, recurrence_dates
+
+
+def monthly_rule(start, until=None):
+    return {
+        "1_name": "Rent",
+        "2_date": parse_date(start),
+        "3_vendor": "Landlord",
+        "4_type": "Upcoming",
+        "5_category": "Home - Rent",
+        "6_amount": 100000,
+        "7_recurrence": {"every": 1, "unit": "months", "until": until},
+    }
+
+
+def dates(record, count=4):
+    occurrences = recurrence_dates(record, record.get("2_date"), date.max.toordinal())
+    return [date.fromordinal(next(occurrences)).isoformat() for _ in range(count)]
+
+
+def test_monthly_rule_keeps_day_of_month():
+    assert dates(monthly_rule("31.01.2025")) == [
+        "2025-01-31",
+        "2025-02-28",
+        "2025-03-31",
+        "2025-04-30",
+    ]
+
+
+def test_booking_keeps_day_of_month_after_short_month():
+    record = book_occurrence(monthly_rule("31.01.2025"))
+    assert dates(record, 3) == ["2025-02-28", "2025-03-31", "2025-04-30"]
+
+    record = book_occurrence(record)
+    assert record.get("2_date") == parse_date("31.01.2025")
+    assert dates(record, 3) == ["2025-03-31", "2025-04-30", "2025-05-31"]
+
+
+def test_booking_last_occurrence_ends_rule():
+    # Occurrences on 31.01 and 28.02 only
+    record = monthly_rule("31.01.2025", until=parse_date("15.03.2025"))
+
+    record = book_occurrence(record)
+    assert dates(record, 1) == ["2025-02-28"]
+
+    assert book_occurrence(record) is None
@@ -0,0 +1,56 @@
+import numpy as np
+import pandas as pd
+
+from finance_app.modules.monthly_summary import MonthlySummary
+from finance_app.modules.spending_forecast import SpendingForecast
+
+
+def monthly_summary(months=24):
+    """
+    Summary with seasonal spendings of three categories
+    """
+    summary = MonthlySummary()
+    random = np.random.default_rng(0)
+
+    for number, month in enumerate(pd.period_range("2022-01", periods=months)):
+        for category, base in [("Food", 100), ("Home", 200), ("Fun", 50)]:
+            amount = base + 40 * np.sin(number * np.pi / 6) + random.integers(0, 20)
+            summary.add(
+                {
+                    "2_date": month.to_timestamp().toordinal(),
+                    "4_type": "Expense",
+                    "5_category": category,
+                    "6_amount": int(amount * 100),
+                },
+                1,
+            )
+
+    return summary.frame()
+
+
+def test_incremental_update_equals_full_fit():
+    summary = monthly_summary()
+    last_month = pd.Period("2023-12", "M")
+
+    full = SpendingForecast()
+    full.update(summary, last_month)
+
+    # Models updated month by month from short history
+    incremental = SpendingForecast()
+    for month in pd.period_range("2022-06", last_month):
+        incremental.update(summary, month)
+
+    assert np.allclose(incremental.forecast(6), full.forecast(6))
+
+
+def test_update_after_full_season_equals_full_fit():
+    summary = monthly_summary()
+
+    full = SpendingForecast()
+    full.update(summary, pd.Period("2023-12", "M"))
+
+    incremental = SpendingForecast()
+    incremental.update(summary, pd.Period("2022-06", "M"))
+    incremental.update(summary, pd.Period("2023-12", "M"))
+
+    assert np.allclose(incremental.forecast(3), full.forecast(3))
@@ -0,0 +1,98 @@
+import os
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import pandas as pd
+import pytest
+from PySide6.QtCore import QDate, Qt
+from PySide6.QtWidgets import QApplication
+
+from finance_app.widgets.column_index import ColumnIndex
+from finance_app.widgets.table_widget import TableWidget
+
+
+@pytest.fixture(scope="module")
+def app():
+    return QApplication.instance() or QApplication([])
+
+
+@pytest.fixture
+def table(app):
+    data = pd.DataFrame(
+        {
+            "Name": ["rent", "food", "rent food"],
+            "Category": ["Home", "Food", "Home"],
+        },
+        index=["a", "b", "c"],
+    )
+    table = TableWidget(
+        row_num=0,
+        col_num=2,
+        header_names=list(data.columns),
+        filtering=True,
+        id_column=True,
+        editable=False,
+    )
+    table.update_table(data)
+    return table
+
+
+def visible_names(table):
+    return [table.get_value(row, 1) for row in range(table.rowCount())]
+
+
+def filter_column(table, column, values):
+    """
+    Check only values in header filter menu of column and apply filter
+    """
+    table.col = column
+    table.filter_list_model = table.get_filter_list_model(column)
+    model = table.filter_list_model
+    for row in range(model.rowCount()):
+        checked = model.values[model.rows[row]] in values
+        model.setData(
+            model.index(row), Qt.Checked if checked else Qt.Unchecked, Qt.CheckStateRole
+        )
+    table.filter_data()
+
+
+def test_search_insert_then_header_filter(table):
+    table.filter("rent")
+    table.insert_row(table.rowCount(), ["rent new", "Home"], "d")
+
+    filter_column(table, 2, ["Home"])
+
+    assert visible_names(table) == ["rent", "rent food", "rent new"]
+
+
+def test_search_remove_then_header_filter(table):
+    table.filter("rent")
+    table.remove_row("a")
+
+    filter_column(table, 2, ["Home", "Food"])
+    table.apply_filters()
+
+    assert visible_names(table) == ["rent food"]
+
+
+def test_header_filter_remove_then_search(table):
+    filter_column(table, 2, ["Home"])
+    table.remove_row("b")
+
+    table.filter("food")
+
+    assert visible_names(table) == ["rent food"]
+
+
+def test_display_values_are_converted_once_per_distinct_value(app):
+    column = ColumnIndex(["1 234,5", "31.12.2024", "rent", "1 234,5"])
+
+    assert column.typed_value(0) == 1234.5
+    assert column.typed_value(1) == QDate(2024, 12, 31)
+    assert column.typed_value(2) == "rent"
+    assert column.formatted_value(0) == "1 234,50"
+    assert len(column.typed_values) == 3
+
+    # Values added later are converted on next access
+    column.insert(4, "1000")
+    assert column.formatted_value(4) == "1 000"
@@ -0,0 +1,96 @@
+import json
+import os
+
+import pytest
+
+from finance_app.modules.transaction_journal import TransactionJournal
+
+
+def operation(name, amount=100):
+    return {"1_name": name, "6_amount": amount}
+
+
+@pytest.fixture
+def journal(tmp_path):
+    return TransactionJournal(str(tmp_path / "transactions.json"))
+
+
+def write_snapshot(journal, data):
+    with open(journal.path, "w") as file:
+        json.dump(data, file)
+
+
+def test_replay_of_changes(journal):
+    write_snapshot(journal, {"a": operation("rent")})
+
+    journal.insert("b", operation("food"))
+    journal.update("a", operation("rent", 200))
+    journal.update_many({"a": operation("home"), "b": operation("shop")})
+    journal.insert("c", operation("fun"))
+    journal.delete(["b"])
+
+    assert journal.load() == {"a": operation("home"), "c": operation("fun")}
+
+
+def test_replay_without_snapshot(journal):
+    journal.update_many({"a": operation("rent")})
+    journal.delete(["b"])
+
+    assert journal.load() == {"a": operation("rent")}
+
+
+def test_cut_last_line_is_skipped(journal):
+    journal.insert("a", operation("rent"))
+    with open(journal.journal_path, "a") as file:
+        file.write(json.dumps({"op": "insert", "key": "b", "record": {}})[:20])
+
+    assert journal.load() == {"a": operation("rent")}
+
+
+def test_interrupted_compaction_is_recovered(journal):
+    write_snapshot(journal, {"a": operation("rent")})
+    journal.insert("b", operation("food"))
+
+    # Journal is sealed and moved aside, but new snapshot was not written
+    journal.append({"op": "seal", "snapshot": journal.snapshot_stamp()})
+    os.replace(journal.journal_path, journal.old_journal_path)
+    journal.insert("c", operation("fun"))
+
+    expected = {"a": operation("rent"), "b": operation("food"), "c": operation("fun")}
+    assert journal.load() == expected
+
+    # Compaction was finished on load
+    assert not os.path.exists(journal.old_journal_path)
+    assert not os.path.exists(journal.journal_path)
+    assert journal.load() == expected
+
+
+def test_sealed_journal_is_not_replayed_after_snapshot_was_replaced(journal):
+    write_snapshot(journal, {"a": operation("rent")})
+    journal.insert("b", operation("food"))
+    journal.append({"op": "seal", "snapshot": journal.snapshot_stamp()})
+    os.replace(journal.journal_path, journal.old_journal_path)
+
+    # Snapshot was written, but sealed journal was not removed
+    journal.write_snapshot({"a": operation("rent"), "b": operation("food", 300)})
+
+    assert journal.load() == {"a": operation("rent"), "b": operation("food", 300)}
+    assert not os.path.exists(journal.old_journal_path)
+
+
+def test_legacy_delete_renumbers_keys(journal):
+    write_snapshot(
+        journal, {"0": operation("rent"), "1": operation("food"), "2": operation("fun")}
+    )
+
+    # Records without renumber flag were written before stable ids
+    journal.append({"op": "delete", "keys": ["1"]})
+
+    assert journal.load() == {"0": operation("rent"), "1": operation("fun")}
+
+
+def test_delete_keeps_stable_keys(journal):
+    write_snapshot(journal, {"a": operation("rent"), "b": operation("food")})
+    journal.delete(["a"])
+
+    assert journal.load() == {"b": operation("food")}